@@ -0,0 +1,102 @@
+"""Save latency and throughput of JsonStore under each durability mode.
+
+    python benchmarks/bench_durability.py [--saves 200] [--days 365] [--sync]
+
+Each mode gets a fresh temp directory holding a health_data.json with
+*--days* days of records; every save appends one record and rewrites the
+file.  "save p50/p99" is what the caller (the UI thread) waits for;
+"total" runs until the data is on disk, including the final
+``flush()`` / ``sync()``.  ``--sync`` disables write-behind so each save
+pays for its own write.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from config_manager import DURABILITY_MODES, SCHEMA_VERSION, JsonStore  # noqa: E402
+
+
+def _seed(days: int) -> dict:
+    start = date.today() - timedelta(days=days)
+    return {
+        str(start + timedelta(days=i)): [
+            {"time": "08:00:00", "weight": 70.0, "bp_high": 120.0, "bp_low": 80.0, "heart_rate": 65.0}
+        ]
+        for i in range(days)
+    }
+
+
+def run(mode: str, saves: int, days: int, write_behind: bool, interval_ms: int) -> dict:
+    fsyncs = 0
+    real_fsync = os.fsync
+
+    def counting_fsync(fd):
+        nonlocal fsyncs
+        fsyncs += 1
+        real_fsync(fd)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JsonStore(
+            os.path.join(tmp, "health_data.json"), dict,
+            write_behind=write_behind, schema_version=SCHEMA_VERSION,
+            durability=mode, group_commit_ms=interval_ms,
+        )
+        doc = _seed(days)
+        store.save(doc)
+        store.flush()
+        store.sync()
+
+        today = str(date.today())
+        latencies = []
+        os.fsync = counting_fsync
+        try:
+            start = time.perf_counter()
+            for i in range(saves):
+                doc.setdefault(today, []).append({"time": f"{i:08d}", "weight": 70.0})
+                t0 = time.perf_counter()
+                store.save(doc)
+                latencies.append(time.perf_counter() - t0)
+            store.flush()
+            store.sync()
+            total = time.perf_counter() - start
+        finally:
+            os.fsync = real_fsync
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "total_s": total,
+        "saves_per_s": saves / total,
+        "fsyncs": fsyncs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saves", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--group-commit-ms", type=int, default=200)
+    parser.add_argument("--sync", action="store_true", help="disable write-behind")
+    args = parser.parse_args()
+
+    print(f"{args.saves} saves, {args.days} days, write-behind={'off' if args.sync else 'on'}")
+    print(f"{'mode':<13}{'save p50':>10}{'save p99':>10}{'total':>9}{'saves/s':>10}{'fsyncs':>8}")
+    for mode in DURABILITY_MODES:
+        r = run(mode, args.saves, args.days, not args.sync, args.group_commit_ms)
+        print(
+            f"{r['mode']:<13}{r['p50_ms']:>8.3f}ms{r['p99_ms']:>8.3f}ms"
+            f"{r['total_s']:>8.2f}s{r['saves_per_s']:>10.0f}{r['fsyncs']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
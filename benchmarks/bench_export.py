@@ -0,0 +1,85 @@
+"""Throughput of the incremental Obsidian export over five years of data.
+
+    python benchmarks/bench_export.py [--years 5] [--answers-per-day 4]
+
+Synthetic journal answers and health records are generated for every day
+of the period.  The script reports a cold export (every note written),
+a warm re-run (watermark only, nothing changes), a full run after one day
+was edited, and the single-day run used after a save, each as wall time
+and days per second.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import obsidian_export  # noqa: E402
+from config_manager import JsonStore  # noqa: E402
+from obsidian_export import VaultExporter  # noqa: E402
+
+_HANZI = "的一是了我不人在他有这个上们来到时大地为子中你说生国年着就那和要她出也得里后自以会家可下而过天去能对小多然于心学"
+
+
+def _dataset(years, per_day, seed=7):
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=365 * years)
+    journal, health = {}, {}
+    for i in range(365 * years):
+        day = str(start + timedelta(days=i))
+        journal[day] = {"created_at": "09:00:00", "answers": [
+            {
+                "question_id": f"d{rng.randrange(40)}",
+                "question_zh": "今天最重要的一件事是什么？",
+                "question_en": "What is the one thing that matters most today?",
+                "answered_at": f"{9 + k:02d}:{rng.randrange(60):02d}:00",
+                "answer": "".join(rng.choice(_HANZI) for _ in range(rng.randint(20, 200))),
+            }
+            for k in range(per_day)
+        ]}
+        health[day] = [{
+            "time": "08:00:00", "weight": round(rng.uniform(68, 72), 1),
+            "bp_high": rng.randint(110, 130), "bp_low": rng.randint(70, 85), "heart_rate": rng.randint(55, 80),
+        }]
+    return journal, health
+
+
+def _timed(label, fn, n_days):
+    t0 = time.perf_counter()
+    stats = fn()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<14} {elapsed * 1000:>9.1f}ms {n_days / elapsed:>10.0f} days/s   {stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--answers-per-day", type=int, default=4)
+    args = parser.parse_args()
+
+    journal, health = _dataset(args.years, args.answers_per_day)
+    obsidian_export.view_journal_data = lambda: journal
+    obsidian_export.view_health_data = lambda: health
+    n_days = len(journal)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = JsonStore(os.path.join(tmp, "state.json"), lambda: {"target": None, "days": {}},
+                          codec="json-compact")
+        exporter = VaultExporter(os.path.join(tmp, "vault"), state_store=state)
+        _timed("cold", exporter.export, n_days)
+        _timed("warm", exporter.export, n_days)
+        last = max(journal)
+        journal[last]["answers"][0]["answer"] += "（修改）"
+        _timed("one edited", exporter.export, n_days)
+        journal[last]["answers"][0]["answer"] += "（再改）"
+        _timed("one day only", lambda: exporter.export([last]), 1)
+        state.flush()
+
+
+if __name__ == "__main__":
+    main()
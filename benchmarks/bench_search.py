@@ -0,0 +1,91 @@
+"""Query latency of the journal search index from 1k to 100k answers.
+
+    python benchmarks/bench_search.py [--sizes 1000 10000 100000] [--queries 200]
+
+Answers are synthetic mixed Chinese/English sentences drawn from a
+Zipf-like vocabulary that grows with the corpus (as real journals do).
+For each size the script reports p50/p99 latency of indexed queries
+(two-term, single-term, and a two-term query limited to the last 30
+days) next to a naive substring scan over every answer.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from journal_search import SearchIndex  # noqa: E402
+
+_HANZI = "的一是了我不人在他有这个上们来到时大地为子中你说生国年着就那和要她出也得里后自以会家可下而过天去能对小多然于心学么之都好看起发当没成只如事把还用第样道想作种开美总从无情己面最女但现前些所同日手又行意动方期它头经长儿回位分爱老因很给名法间斯知世什两次使身者被高已亲其进此话常与活正感"
+_WORDS = ["focus", "tired", "python", "meeting", "walk", "sleep", "goal", "energy", "family", "deadline"]
+
+
+def _corpus(n, seed=7):
+    rng = random.Random(seed)
+    vocab_size = max(200, int(40 * n ** 0.5))  # Heaps' law: vocabulary grows sub-linearly
+    vocab = ["".join(rng.choice(_HANZI) for _ in range(2)) for _ in range(vocab_size)] + _WORDS
+    cum_weights, total = [], 0.0
+    for rank in range(len(vocab)):
+        total += 1 / (rank + 1)
+        cum_weights.append(total)
+    start = date.today() - timedelta(days=n // 5)
+    answers = []
+    for i in range(n):
+        words = rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(8, 30))
+        day = str(start + timedelta(days=i // 5))
+        answers.append((day, {
+            "question_id": f"d{i % 12}",
+            "answered_at": f"{i % 24:02d}:00:{i % 60:02d}",
+            "answer": "".join(words),
+        }))
+    return answers, vocab
+
+
+def _timed(fn, queries):
+    times = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return statistics.median(times) * 1000, times[int(len(times) * 0.99) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'answers':>8} {'build':>8} {'2-term p50/p99':>18} {'1-term p50/p99':>18} "
+          f"{'30-day p50/p99':>18} {'scan p50':>10}")
+    for n in args.sizes:
+        corpus, vocab = _corpus(n)
+        answers = [entry["answer"] for _, entry in corpus]
+        index = SearchIndex()
+        t0 = time.perf_counter()
+        for day, entry in corpus:
+            index.add(day, entry)
+        build = time.perf_counter() - t0
+
+        rng = random.Random(1)
+        mid = vocab[len(vocab) // 20: len(vocab) // 2]  # mid-frequency words, as people search
+        pairs = [f"{rng.choice(mid)} {rng.choice(mid)}" for _ in range(args.queries)]
+        singles = [rng.choice(mid) for _ in range(args.queries)]
+        since = str(date.today() - timedelta(days=30))
+
+        two = _timed(index.search, pairs)
+        one = _timed(index.search, singles)
+        recent = _timed(lambda q: index.search(q, date_from=since), pairs)
+        scan = _timed(lambda q: [a for a in answers if q in a], singles[:20])
+        cells = [f"{p50:.3f}/{p99:.3f}ms" for p50, p99 in (two, one, recent)]
+        print(f"{n:>8} {build:>7.1f}s {cells[0]:>18} {cells[1]:>18} {cells[2]:>18} {scan[0]:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Replay speed of the Monitor state machine on the simulated clock.
+
+    python benchmarks/bench_simulation.py [--days 1 7 30] [--repeat 5]
+
+Each run simulates office days (arrive 09:00, lunch away, leave 18:00,
+weekends locked) with reminders answered in a rest/rest/snooze cycle, and
+reports the best wall time, the number of Monitor wake-ups (simulated
+waits) and transitions, and simulated days per second.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from simulation import Simulation, office_events  # noqa: E402
+
+CONFIG = {
+    "pomodoro": {
+        "default": {"work_duration": 25, "rest_duration": 5},
+        "morning_routine": {"enabled": True, "start_time": "05:00", "end_time": "10:00",
+                            "work_duration": 10, "rest_duration": 5},
+    },
+}
+
+
+def _run(days):
+    first_day = date(2026, 10, 12)  # a Monday
+    start = datetime.combine(first_day, datetime.min.time())
+    sim = Simulation(CONFIG, start, office_events(first_day, days),
+                     responses=("rest", "rest", "snooze"), locked=True)
+    waits = [0]
+    wait = sim.clock.wait
+
+    def counting_wait(cond, timeout=None):
+        waits[0] += 1
+        return wait(cond, timeout)
+
+    sim.clock.wait = counting_wait
+    began = time.perf_counter()
+    trace = sim.run(start + timedelta(days=days))
+    return time.perf_counter() - began, waits[0], len(trace)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 7, 30])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'days':>5} {'best ms':>9} {'wake-ups':>9} {'transitions':>12} {'days/s':>9}")
+    for days in args.days:
+        results = [_run(days) for _ in range(args.repeat)]
+        best = min(r[0] for r in results)
+        _, waits, transitions = results[0]
+        print(f"{days:>5} {best * 1000:>9.1f} {waits:>9} {transitions:>12} {days / best:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
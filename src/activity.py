@@ -0,0 +1,393 @@
+"""User-activity sources for the Monitor: is the session locked, how long idle.
+
+Every source answers :meth:`ActivitySource.is_locked` and
+:meth:`ActivitySource.idle_seconds`.  Polling sources are sampled by the
+Monitor on its probe deadlines; push sources (``push = True``) also call
+their subscribers with ``"lock"`` / ``"unlock"`` / ``"idle"`` /
+``"active"`` as soon as the state changes, so the Monitor can sleep until
+the next event instead of sampling.
+
+Backends (``config["activity"]["backend"]``, see :func:`create_source`):
+
+- ``win32``: ``GetLastInputInfo`` idle time and a foreground-window lock
+  heuristic (polling; the original behaviour)
+- ``linux``: X11 screensaver idle time when ``$DISPLAY`` is set, else logind
+  ``IdleHint``; lock state from logind ``LockedHint`` (polling)
+- ``logind``: logind session property changes streamed from
+  ``gdbus monitor`` (push)
+- ``none``: never locked, never idle
+- ``auto``: ``win32`` on Windows; on Linux ``linux`` when an X display is
+  set (X11 idle time works on every desktop, whereas many never update
+  logind's ``IdleHint``), otherwise ``logind`` when ``gdbus`` is
+  available, else ``linux``
+
+An unknown backend name is logged and treated as ``auto``, so a typo in
+``config.json`` cannot stop the app from starting.
+
+:class:`PushActivity` is the base for event-driven sources and
+:class:`ScriptedActivity` a virtual-clock fake for simulations and tests.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from clock import SYSTEM_CLOCK
+
+BACKENDS = ("auto", "win32", "linux", "logind", "none")
+EVENTS = ("lock", "unlock", "idle", "active")
+
+
+class ActivitySource:
+    """Never locked, never idle (the ``none`` backend and the base class)."""
+
+    push = False
+
+    def __init__(self):
+        self._listeners = []
+
+    def is_locked(self) -> bool:
+        return False
+
+    def idle_seconds(self) -> float:
+        return 0.0
+
+    def subscribe(self, callback) -> None:
+        """Call *callback(event)* on state changes (push sources only)."""
+        self._listeners.append(callback)
+
+    def close(self) -> None:
+        pass
+
+    def _notify(self, event):
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception:
+                logging.error(f"Activity listener failed on {event!r}", exc_info=True)
+
+
+# ============================================================
+# Windows
+# ============================================================
+
+class LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", ctypes.c_uint),
+        ("dwTime", ctypes.c_uint),
+    ]
+
+
+def get_idle_duration():
+    """Returns the time in seconds since the last user input (mouse/keyboard)."""
+    lastInputInfo = LASTINPUTINFO()
+    lastInputInfo.cbSize = ctypes.sizeof(lastInputInfo)
+    if ctypes.windll.user32.GetLastInputInfo(ctypes.byref(lastInputInfo)):
+        millis = ctypes.windll.kernel32.GetTickCount() - lastInputInfo.dwTime
+        return max(0, millis / 1000.0)
+    return 0
+
+
+class Win32Activity(ActivitySource):
+    """Lock / idle probes via user32."""
+
+    def is_locked(self):
+        """Checks if the workstation is locked (simplified heuristic)."""
+        try:
+            user32 = ctypes.windll.user32
+            hwnd = user32.GetForegroundWindow()
+            return hwnd == 0
+        except Exception:
+            return False
+
+    def idle_seconds(self):
+        return get_idle_duration()
+
+
+# ============================================================
+# Linux
+# ============================================================
+
+class _XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [
+        ("window", ctypes.c_ulong),
+        ("state", ctypes.c_int),
+        ("kind", ctypes.c_int),
+        ("til_or_since", ctypes.c_ulong),
+        ("idle", ctypes.c_ulong),
+        ("eventMask", ctypes.c_ulong),
+    ]
+
+
+class _X11Idle:
+    """Idle milliseconds from the MIT-SCREEN-SAVER extension (libXss)."""
+
+    def __init__(self):
+        xlib_path, xss_path = ctypes.util.find_library("X11"), ctypes.util.find_library("Xss")
+        if not (os.environ.get("DISPLAY") and xlib_path and xss_path):
+            raise OSError("X11 screensaver extension unavailable")
+        xlib, xss = ctypes.CDLL(xlib_path), ctypes.CDLL(xss_path)
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(_XScreenSaverInfo)
+        xss.XScreenSaverQueryInfo.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XScreenSaverInfo)]
+        self._display = xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("Cannot open X display")
+        self._root = xlib.XDefaultRootWindow(self._display)
+        self._info = xss.XScreenSaverAllocInfo()
+        self._query = xss.XScreenSaverQueryInfo
+
+    def seconds(self):
+        if not self._query(self._display, self._root, self._info):
+            raise OSError("XScreenSaverQueryInfo failed")
+        return self._info.contents.idle / 1000.0
+
+
+def _session_id():
+    return os.environ.get("XDG_SESSION_ID") or "auto"
+
+
+def _logind_properties(session):
+    """``LockedHint`` / ``IdleHint`` / ``IdleSinceHintMonotonic`` of *session* via ``loginctl``."""
+    out = subprocess.run(
+        ["loginctl", "show-session", session, "-p", "LockedHint", "-p", "IdleHint", "-p", "IdleSinceHintMonotonic"],
+        capture_output=True, text=True, timeout=2, check=True,
+    ).stdout
+    return dict(line.split("=", 1) for line in out.splitlines() if "=" in line)
+
+
+def _idle_since_monotonic(usec):
+    """Seconds since a logind ``CLOCK_MONOTONIC`` microsecond stamp."""
+    return max(0.0, time.clock_gettime(time.CLOCK_MONOTONIC) - int(usec) / 1e6)
+
+
+class LinuxActivity(ActivitySource):
+    """X11 idle time (or logind ``IdleHint``) and logind ``LockedHint``, polled."""
+
+    def __init__(self, session=None):
+        super().__init__()
+        self.session = session or _session_id()
+        try:
+            self._x11 = _X11Idle()
+        except OSError as e:
+            logging.info(f"X11 idle detection unavailable ({e}); using logind IdleHint.")
+            self._x11 = None
+        self._props = {}
+        self._props_at = float("-inf")
+        self._warned = False
+
+    def _properties(self):
+        # is_locked() 与 idle_seconds() 在同一次探测中相继调用，共用一次 loginctl
+        now = time.monotonic()
+        if now - self._props_at >= 1.0:
+            try:
+                self._props = _logind_properties(self.session)
+            except (OSError, subprocess.SubprocessError) as e:
+                if not self._warned:
+                    logging.warning(f"logind session state unavailable: {e}")
+                    self._warned = True
+                self._props = {}
+            self._props_at = now
+        return self._props
+
+    def is_locked(self):
+        return self._properties().get("LockedHint") == "yes"
+
+    def idle_seconds(self):
+        if self._x11 is not None:
+            try:
+                return self._x11.seconds()
+            except OSError:
+                self._x11 = None
+        props = self._properties()
+        if props.get("IdleHint") == "yes" and props.get("IdleSinceHintMonotonic", "0") != "0":
+            return _idle_since_monotonic(props["IdleSinceHintMonotonic"])
+        return 0.0
+
+
+# ============================================================
+# Push sources
+# ============================================================
+
+class PushActivity(ActivitySource):
+    """State maintained from events passed to :meth:`emit`; subscribers are notified of each one.
+
+    ``emit("idle", idle_for=s)`` marks the user idle since *s* seconds ago
+    (backends usually report idleness only after their own delay).
+    """
+
+    push = True
+
+    def __init__(self, clock=None):
+        super().__init__()
+        self._clock = clock or SYSTEM_CLOCK
+        self._lock = threading.Lock()
+        self._locked = False
+        self._idle_since = None
+
+    def is_locked(self):
+        return self._locked
+
+    def idle_seconds(self):
+        idle_since = self._idle_since
+        return 0.0 if idle_since is None else max(0.0, self._clock.monotonic() - idle_since)
+
+    def emit(self, event, idle_for=0.0):
+        if event not in EVENTS:
+            raise ValueError(f"Unknown activity event {event!r}; expected one of {EVENTS}")
+        with self._lock:
+            if event in ("lock", "unlock"):
+                self._locked = event == "lock"
+            elif event == "idle":
+                if self._idle_since is None:
+                    self._idle_since = self._clock.monotonic() - idle_for
+            else:
+                self._idle_since = None
+        self._notify(event)
+
+
+_HINT_RE = re.compile(r"'(LockedHint|IdleHint)': <(true|false)>")
+_IDLE_SINCE_RE = re.compile(r"'IdleSinceHintMonotonic': <uint64 (\d+)>")
+
+
+def _bus_path_escape(text):
+    """sd-bus object path label escaping (``2`` -> ``_32``)."""
+    return "".join(
+        c if c.isascii() and (c.isalpha() or (c.isdigit() and i > 0)) else f"_{ord(c):02x}"
+        for i, c in enumerate(text)
+    ) or "_"
+
+
+class LogindEvents(PushActivity):
+    """Push source following the logind session's ``LockedHint`` / ``IdleHint``
+    through ``gdbus monitor`` on the system bus (one reader thread)."""
+
+    def __init__(self, session=None, gdbus="gdbus"):
+        super().__init__()
+        self.session = session or _session_id()
+        props = _logind_properties(self.session)
+        session_id = subprocess.run(
+            ["loginctl", "show-session", self.session, "-p", "Id", "--value"],
+            capture_output=True, text=True, timeout=2, check=True,
+        ).stdout.strip()
+        self._locked = props.get("LockedHint") == "yes"
+        if props.get("IdleHint") == "yes":
+            self._idle_since = time.monotonic() - _idle_since_monotonic(props.get("IdleSinceHintMonotonic", 0))
+        self._proc = subprocess.Popen(
+            [gdbus, "monitor", "--system", "--dest", "org.freedesktop.login1",
+             "--object-path", "/org/freedesktop/login1/session/" + _bus_path_escape(session_id)],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        self._reader = threading.Thread(target=self._read, name="activity-logind", daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        for line in self._proc.stdout:
+            if "PropertiesChanged" not in line:
+                continue
+            for name, value in _HINT_RE.findall(line):
+                if name == "LockedHint":
+                    self.emit("lock" if value == "true" else "unlock")
+                elif value == "true":
+                    match = _IDLE_SINCE_RE.search(line)
+                    self.emit("idle", _idle_since_monotonic(match.group(1)) if match else 0.0)
+                else:
+                    self.emit("active")
+        if self._proc.poll() not in (None, 0, -15):
+            logging.warning("gdbus monitor exited; logind activity events stopped.")
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.terminate()
+
+
+class ScriptedActivity(PushActivity):
+    """Fake source on a (simulated) clock, driven by scripted calls.
+
+    ``away()`` stops input (idle time starts growing, no event: input just
+    ceases), ``back()`` / ``lock()`` / ``unlock()`` change state.  With
+    ``push=False`` it behaves as a polling source and notifies nobody.
+    """
+
+    def __init__(self, clock, push=False):
+        super().__init__(clock)
+        self.push = push
+
+    @property
+    def locked(self):
+        return self._locked
+
+    @locked.setter
+    def locked(self, value):
+        self._locked = bool(value)
+
+    def away(self):
+        if self._idle_since is None:
+            self._idle_since = self._clock.monotonic()
+
+    def back(self):
+        self._update("active")
+
+    def lock(self):
+        self._update("lock")
+
+    def unlock(self):
+        self._update("unlock")
+
+    def _update(self, event):
+        if self.push:
+            self.emit(event)
+        elif event == "active":
+            self._idle_since = None
+        else:
+            self._locked = event == "lock"
+
+
+def _auto_candidates() -> list:
+    if sys.platform == "win32":
+        candidates = ["win32"]
+    elif sys.platform.startswith("linux"):
+        # X11 空闲时间在任何桌面都可用；logind 的 IdleHint 很多桌面从不设置
+        if os.environ.get("DISPLAY"):
+            candidates = ["linux"]
+        else:
+            candidates = (["logind"] if shutil.which("gdbus") else []) + ["linux"]
+    else:
+        candidates = []
+    return candidates + ["none"]
+
+
+def create_source(backend="auto") -> ActivitySource:
+    """The activity source for *backend* (one of :data:`BACKENDS`).
+
+    ``auto`` falls back down its list when a backend fails to start; an
+    unknown name is logged and treated as ``auto``.
+    """
+    if backend not in BACKENDS:
+        logging.warning(f"Unknown activity backend {backend!r}; expected one of {BACKENDS}. Using 'auto'.")
+        backend = "auto"
+    if backend == "auto":
+        candidates = _auto_candidates()
+    else:
+        candidates = [backend]
+    factories = {"win32": Win32Activity, "linux": LinuxActivity, "logind": LogindEvents, "none": ActivitySource}
+    for i, name in enumerate(candidates):
+        try:
+            source = factories[name]()
+        except (OSError, subprocess.SubprocessError) as e:
+            if i == len(candidates) - 1:
+                raise
+            logging.warning(f"Activity backend {name!r} unavailable ({e}); trying {candidates[i + 1]!r}.")
+            continue
+        logging.info(f"Activity backend: {name}")
+        return source
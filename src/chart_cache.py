@@ -0,0 +1,215 @@
+"""Pre-rendered trend charts as PNG files, cached on disk.
+
+Charts are drawn with Pillow on a single background thread and stored as
+``<name>-<key>.png`` in :data:`CHART_CACHE_DIR`, where *key* hashes the
+series together with every render parameter, so unchanged data never
+re-renders.  The cache is bounded by total bytes and evicts the least
+recently used file first; a hit refreshes the file's mtime, which is
+what orders the index when it is rebuilt on the next start.
+
+:func:`latest_chart` returns the most recent render for a name whatever
+its data, so a window can show it immediately while the fresh render for
+the current data is produced by :func:`render_chart_async`.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+from components import _lttb
+from config_manager import BASE_DIR
+
+CHART_CACHE_DIR = os.path.join(BASE_DIR, "chart_cache")
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+RENDER_VERSION = 1
+_SUPERSAMPLE = 2
+
+
+def chart_key(points, params: dict) -> str:
+    """Hash of *points* (``(x, y)`` pairs) and render *params*."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([RENDER_VERSION, params], sort_keys=True).encode("utf-8"))
+    digest.update(array("d", (v for point in points for v in point)).tobytes())
+    return digest.hexdigest()[:24]
+
+
+def render_png(points, width=356, height=48, color="#06b6d4", bg="#172033", line_width=2, top=6) -> bytes:
+    """Draw *points* as an anti-aliased trend line and return PNG bytes.
+
+    *top* is the blank margin above the line (room for a caption drawn over
+    the image); the other margins are fixed.
+    """
+    scale = _SUPERSAMPLE
+    image = Image.new("RGB", (width * scale, height * scale), bg)
+    shown = _lttb(sorted(points), max(3, width // 2))
+    if shown:
+        pad = 6 * scale
+        x0, x1 = shown[0][0], shown[-1][0]
+        ys = [p[1] for p in shown]
+        y0, y1 = min(ys), max(ys)
+        inner_w = image.width - 2 * pad
+        top = top * scale
+        inner_h = image.height - top - pad
+        coords = [
+            (
+                pad + (x - x0) / (x1 - x0) * inner_w if x1 > x0 else image.width - pad,
+                top + (y1 - y) / (y1 - y0) * inner_h if y1 > y0 else top + inner_h / 2,
+            )
+            for x, y in shown
+        ]
+        draw = ImageDraw.Draw(image)
+        if len(coords) > 1:
+            draw.line(coords, fill=color, width=line_width * scale, joint="curve")
+        lx, ly = coords[-1]
+        r = 3 * scale
+        draw.ellipse((lx - r, ly - r, lx + r, ly + r), fill=color)
+    image = image.resize((width, height), Image.LANCZOS)
+    buf = BytesIO()
+    image.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+class ChartCache:
+    """PNG files under *directory*, LRU-evicted above *max_bytes* in total."""
+
+    def __init__(self, directory: str = CHART_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._files = None  # OrderedDict filename -> size, oldest first
+        self._total = 0
+        self._lock = threading.Lock()
+        self._renderer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-render")
+
+    def _index(self) -> OrderedDict:
+        if self._files is None:
+            entries = []
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if entry.name.endswith(".png"):
+                            st = entry.stat()
+                            entries.append((st.st_mtime_ns, entry.name, st.st_size))
+            except FileNotFoundError:
+                pass
+            entries.sort()
+            self._files = OrderedDict((name, size) for _, name, size in entries)
+            self._total = sum(self._files.values())
+        return self._files
+
+    def lookup(self, name: str, key: str):
+        """Path of the render for (*name*, *key*), or ``None``."""
+        filename = f"{name}-{key}.png"
+        with self._lock:
+            files = self._index()
+            if filename not in files:
+                return None
+            files.move_to_end(filename)
+        path = os.path.join(self.directory, filename)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(filename)
+            return None
+        return path
+
+    def latest(self, name: str):
+        """Path of the most recently used render for *name*, or ``None``."""
+        prefix = name + "-"
+        with self._lock:
+            for filename in reversed(self._index()):
+                if filename.startswith(prefix):
+                    return os.path.join(self.directory, filename)
+        return None
+
+    def store(self, name: str, key: str, data: bytes) -> str:
+        """Write *data* atomically and evict least recently used files."""
+        filename = f"{name}-{key}.png"
+        path = os.path.join(self.directory, filename)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            files = self._index()
+            self._forget(filename)
+            files[filename] = len(data)
+            self._total += len(data)
+            while self._total > self.max_bytes and len(files) > 1:
+                oldest = next(iter(files))
+                self._forget(oldest)
+                try:
+                    os.remove(os.path.join(self.directory, oldest))
+                except FileNotFoundError:
+                    pass
+        return path
+
+    def _forget(self, filename):
+        size = self._files.pop(filename, None)
+        if size is not None:
+            self._total -= size
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._index()
+            return self._total
+
+    def render_async(self, name: str, points, callback=None, **params) -> Future:
+        """Future resolving to the PNG path for *points*; *callback(path)*
+        runs on the render thread (or immediately on a cache hit)."""
+        points = list(points)
+        key = chart_key(points, params)
+        path = self.lookup(name, key)
+        if path is not None:
+            future = Future()
+            future.set_result(path)
+            if callback is not None:
+                callback(path)
+            return future
+
+        def job():
+            try:
+                result = self.store(name, key, render_png(points, **params))
+            except Exception:
+                logging.error(f"Failed to render chart {name}", exc_info=True)
+                raise
+            if callback is not None:
+                callback(result)
+            return result
+
+        return self._renderer.submit(job)
+
+    def flush(self, timeout=None) -> None:
+        """Wait until queued renders are done."""
+        self._renderer.submit(lambda: None).result(timeout)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ChartCache:
+    """The process-wide chart cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ChartCache()
+        return _cache
+
+
+def latest_chart(name: str):
+    return get_cache().latest(name)
+
+
+def render_chart_async(name: str, points, callback=None, **params) -> Future:
+    return get_cache().render_async(name, points, callback, **params)
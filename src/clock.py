@@ -0,0 +1,110 @@
+"""Clock abstraction shared by the Monitor state machine and the reminder window.
+
+:data:`SYSTEM_CLOCK` reads the real clocks and blocks on real condition
+variables.  :class:`SimulatedClock` keeps virtual time and a timer heap:
+waiting on it fires the scripted callbacks due before the timeout instead
+of sleeping, so a whole day of the state machine runs in milliseconds
+(see ``simulation.py``).
+"""
+
+import heapq
+import itertools
+from datetime import datetime, timedelta
+import time
+
+
+class Clock:
+    """Real time: ``time.monotonic()`` for deadlines, ``time.time()`` / ``datetime.now()`` for the wall."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def time(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def wait(self, cond, timeout=None) -> bool:
+        """``cond.wait(timeout)``; the caller holds *cond*."""
+        return cond.wait(timeout)
+
+    def wait_event(self, event, timeout=None) -> bool:
+        return event.wait(timeout)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class SimulatedClock(Clock):
+    """Virtual clock starting at *start* (monotonic 0.0).
+
+    Callbacks registered with :meth:`call_at` / :meth:`call_later` stand in
+    for other threads (user clicks, input, suspend).  :meth:`wait` releases
+    the condition, fires at most one callback due before the timeout (a
+    spurious wake-up, which every condition loop tolerates) or advances to
+    the timeout, then re-acquires it.
+    """
+
+    def __init__(self, start: datetime):
+        self._start = start
+        self._mono = 0.0
+        self._wall_offset = 0.0
+        self._timers = []
+        self._seq = itertools.count()
+
+    def monotonic(self) -> float:
+        return self._mono
+
+    def time(self) -> float:
+        return self._start.timestamp() + self._mono + self._wall_offset
+
+    def now(self) -> datetime:
+        return self._start + timedelta(seconds=self._mono + self._wall_offset)
+
+    def call_at(self, when: float, callback) -> None:
+        """Run *callback()* at monotonic time *when*."""
+        heapq.heappush(self._timers, (when, next(self._seq), callback))
+
+    def call_later(self, delay: float, callback) -> None:
+        self.call_at(self._mono + max(0.0, delay), callback)
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward without firing callbacks (a suspend on Windows,
+        where the monotonic clock keeps counting)."""
+        self._mono += seconds
+
+    def jump_wall(self, seconds: float) -> None:
+        """Move only the wall clock (a suspend where the monotonic clock
+        stops, or a manual clock change)."""
+        self._wall_offset += seconds
+
+    def pending(self) -> int:
+        return len(self._timers)
+
+    def wait(self, cond, timeout=None) -> bool:
+        cond.release()
+        try:
+            return self._fire_next(None if timeout is None else self._mono + timeout)
+        finally:
+            cond.acquire()
+
+    def wait_event(self, event, timeout=None) -> bool:
+        deadline = None if timeout is None else self._mono + timeout
+        while not event.is_set():
+            if not self._fire_next(deadline):
+                break
+        return event.is_set()
+
+    def _fire_next(self, until) -> bool:
+        """Fire the earliest callback due by *until* and return ``True``;
+        otherwise advance to *until* and return ``False``."""
+        if self._timers and (until is None or self._timers[0][0] <= until):
+            when, _, callback = heapq.heappop(self._timers)
+            self._mono = max(self._mono, when)
+            callback()
+            return True
+        if until is None:
+            raise RuntimeError("Simulated wait without timeout and no scheduled callbacks")
+        self._mono = max(self._mono, until)
+        return False
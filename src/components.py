@@ -43,6 +43,12 @@ def _accent_bar(parent, color=_C.AMBER, height=2, **pack_kw):
     return bar
 
 
+def _post_to_gui(task):
+    """子线程把 *task* 交给主线程执行：Tk 只能在主线程调用，统一经 main.gui_queue 调度。"""
+    import main as _main
+    _main.gui_queue.put(task)
+
+
 class _CircleTimer:
     """环形倒计时进度条组件（基于 Canvas Arc）。"""
 
@@ -104,3 +110,175 @@ class _CircleTimer:
 
     def destroy(self):
         self.canvas.destroy()
+
+
+def _lttb(points, threshold):
+    """Largest-Triangle-Three-Buckets 降采样。
+
+    *points* 为按 x 排序的 ``(x, y)`` 序列；返回至多 *threshold* 个点，
+    首尾点保留，中间每个桶取与前一选中点、下一桶均值点构成三角形面积最大的点。
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # 下一个桶的平均点（最后一个桶即末点）
+        start = int((i + 1) * every) + 1
+        end = min(int((i + 2) * every) + 1, n)
+        if start >= end:
+            start, end = n - 1, n
+        avg_x = avg_y = 0.0
+        for x, y in points[start:end]:
+            avg_x += x
+            avg_y += y
+        avg_x /= end - start
+        avg_y /= end - start
+
+        ax, ay = points[a]
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+class _TrendChart:
+    """指标趋势图（基于 Canvas 折线）。
+
+    序列按画布像素宽度做 LTTB 降采样，整条曲线只占一个 line 图元；
+    新增记录时通过 ``append`` 更新已有图元坐标，不重建组件。
+    也可用 ``show_image`` 显示预渲染的 PNG（见 chart_cache），数据变化后自动切回折线。
+    """
+
+    def __init__(self, parent, width=356, height=56, color=_C.CYAN, bg=_C.BG_SURFACE, unit=""):
+        self.width = width
+        self.height = height
+        self.color = color
+        self.bg = bg
+        self.unit = unit
+        self.points = []
+        self._shown = []
+        self._range = None
+        self._pad = 6
+        self.top = 18  # 给右上角文字留位置
+        self._photo = None
+        self.revision = 0  # 每次数据变化 +1，用于丢弃过期的预渲染图
+
+        self.canvas = tk.Canvas(
+            parent, width=width, height=height,
+            bg=bg, highlightthickness=0,
+        )
+        # 预渲染图（默认隐藏，位于最底层）
+        self.image_id = self.canvas.create_image(0, 0, anchor=tk.NW, state=tk.HIDDEN)
+        # 底部基线
+        self.canvas.create_line(
+            0, height - 1, width, height - 1, fill=_C.BORDER,
+        )
+        # 趋势折线（占位坐标，首次 set_points 时写入）
+        self.line = self.canvas.create_line(
+            0, 0, 0, 0, fill=color, width=2, state=tk.HIDDEN,
+        )
+        # 最新一点
+        self.dot = self.canvas.create_oval(
+            0, 0, 0, 0, fill=color, outline="", state=tk.HIDDEN,
+        )
+        # 右上角：最新值与区间
+        self.label_id = self.canvas.create_text(
+            width - 2, 2, anchor=tk.NE, text="暂无记录",
+            fill=_C.FG_MUTED, font=_F.TINY,
+        )
+
+    @property
+    def threshold(self):
+        """降采样目标点数：约每两个像素一个点。"""
+        return max(3, (self.width - 2 * self._pad) // 2)
+
+    def set_points(self, points):
+        """整体替换序列（``(x, y)``，x 为时间戳秒）。"""
+        self.points = sorted(points)
+        ys = [p[1] for p in self.points]
+        self._range = (min(ys), max(ys)) if ys else None
+        self._shown = _lttb(self.points, self.threshold)
+        self.revision += 1
+        self._render()
+
+    def show_image(self, path, revision=None):
+        """用 PNG 替换折线显示；*revision* 与当前数据不符时忽略。"""
+        if revision is not None and revision != self.revision:
+            return
+        try:
+            photo = tk.PhotoImage(file=path, master=self.canvas)
+        except tk.TclError:
+            return
+        self._photo = photo  # 保持引用，避免被回收
+        self.canvas.itemconfig(self.image_id, image=photo, state=tk.NORMAL)
+        self.canvas.itemconfig(self.line, state=tk.HIDDEN)
+        self.canvas.itemconfig(self.dot, state=tk.HIDDEN)
+
+    def append(self, x, y):
+        """追加一条记录并增量重绘。"""
+        if self.points and x < self.points[-1][0]:
+            self.set_points(self.points + [(x, y)])
+            return
+        self.points.append((x, y))
+        self.revision += 1
+        lo, hi = self._range or (y, y)
+        self._range = (min(lo, y), max(hi, y))
+        if len(self._shown) < self.threshold:
+            self._shown.append((x, y))
+        else:
+            self._shown = _lttb(self.points, self.threshold)
+        self._render()
+
+    def _render(self):
+        shown = self._shown
+        if not shown:
+            self.canvas.itemconfig(self.image_id, state=tk.HIDDEN)
+            self.canvas.itemconfig(self.line, state=tk.HIDDEN)
+            self.canvas.itemconfig(self.dot, state=tk.HIDDEN)
+            self.canvas.itemconfig(self.label_id, text="暂无记录")
+            return
+
+        x0, x1 = shown[0][0], shown[-1][0]
+        ys = [p[1] for p in shown]
+        y0, y1 = min(ys), max(ys)
+        pad, top = self._pad, self.top
+        span_x = (x1 - x0) or 1.0
+        span_y = (y1 - y0) or 1.0
+        inner_w = self.width - 2 * pad
+        inner_h = self.height - top - pad
+
+        coords = []
+        for x, y in shown:
+            coords.append(pad + (x - x0) / span_x * inner_w if x1 > x0 else self.width - pad)
+            coords.append(top + (y1 - y) / span_y * inner_h if y1 > y0 else top + inner_h / 2)
+        if len(shown) == 1:
+            coords = [pad, coords[1]] + coords
+        self.canvas.coords(self.line, *coords)
+        lx, ly = coords[-2], coords[-1]
+        self.canvas.coords(self.dot, lx - 3, ly - 3, lx + 3, ly + 3)
+        self.canvas.itemconfig(self.image_id, state=tk.HIDDEN)
+        self.canvas.itemconfig(self.line, state=tk.NORMAL)
+        self.canvas.itemconfig(self.dot, state=tk.NORMAL)
+
+        last = self.points[-1][1]
+        lo, hi = self._range
+        self.canvas.itemconfig(
+            self.label_id,
+            text=f"{last:g}{self.unit}   ({lo:g} – {hi:g})",
+        )
+
+    def pack(self, **kw):
+        self.canvas.pack(**kw)
+
+    def destroy(self):
+        self.canvas.destroy()
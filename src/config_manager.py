@@ -1,16 +1,23 @@
 """Configuration and data persistence manager for Work Health.
 
-Atomic JSON file I/O with schema migration for health data.
+Atomic JSON file I/O with schema migration for health data, backed by a
+stat-validated in-memory cache and a per-store write-behind thread.
 All public function signatures are stable — callers in window.py, ui_right.py,
 monitor.py, main.py, and questions.py depend on them.
 """
 
+import gzip
 import json
 import logging
+import lzma
 import os
 import shutil
+import sqlite3
+import struct
 import threading
-from datetime import date
+import time
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime
 
 # Path constants
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -18,63 +25,810 @@ CONFIG_FILE = os.path.join(BASE_DIR, "config.json")
 HEALTH_DATA_FILE = os.path.join(BASE_DIR, "health_data.json")
 JOURNAL_DATA_FILE = os.path.join(BASE_DIR, "journal_data.json")
 LIFE_GAME_FILE = os.path.join(os.path.dirname(BASE_DIR), "life_game.json")
+SQLITE_DB_FILE = os.path.join(BASE_DIR, "work_health.db")
+HEALTH_SHARD_DIR = os.path.join(BASE_DIR, "health")
+JOURNAL_SHARD_DIR = os.path.join(BASE_DIR, "journal")
+LATEST_ANSWERS_FILE = os.path.join(BASE_DIR, "latest_answers.json")
 
-SCHEMA_VERSION = 1
-"""Current schema version written into health_data and journal_data on save."""
+SCHEMA_VERSION = 2
+"""Current schema version of the ``{"version", "data"}`` envelope used by
+health_data and journal_data.  Version 1 mixed a ``"version"`` key into the
+date namespace."""
+
+DEFAULT_CODECS = {"config": "json-pretty", "life_game": "json-pretty", "health": "json-compact", "journal": "json-compact"}
+"""Codec per dataset unless ``config["storage"]["codecs"]`` says otherwise.
+
+The files keep their ``.json`` names, so every default is a JSON codec;
+``binary`` is opt-in per dataset.
+"""
 
 _io_lock = threading.Lock()
-"""Module-level lock serialising all file I/O."""
+"""Module-level lock serialising all file reads and writes."""
+
+
+class _FrozenDict(Mapping):
+    """Read-only, lazily wrapped view over a cached ``dict``."""
+
+    __slots__ = ("_d",)
+
+    def __init__(self, d: dict):
+        self._d = d
+
+    def __getitem__(self, key):
+        return _freeze(self._d[key])
+
+    def __contains__(self, key):
+        return key in self._d
+
+    def __iter__(self):
+        return iter(self._d)
+
+    def __len__(self):
+        return len(self._d)
+
+    def __eq__(self, other):
+        if isinstance(other, _FrozenDict):
+            other = other._d
+        return self._d == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"_FrozenDict({self._d!r})"
+
+
+class _FrozenList(Sequence):
+    """Read-only, lazily wrapped view over a cached ``list``."""
+
+    __slots__ = ("_l",)
+
+    def __init__(self, items: list):
+        self._l = items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _FrozenList(self._l[index])
+        return _freeze(self._l[index])
+
+    def __len__(self):
+        return len(self._l)
+
+    def __eq__(self, other):
+        if isinstance(other, _FrozenList):
+            other = other._l
+        return self._l == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"_FrozenList({self._l!r})"
+
+
+def _freeze(obj):
+    """Wrap *obj* in a read-only view if it is a JSON container."""
+    if isinstance(obj, dict):
+        return _FrozenDict(obj)
+    if isinstance(obj, list):
+        return _FrozenList(obj)
+    return obj
+
+
+def thaw(obj):
+    """Plain JSON types (private copies) from a possibly frozen cached view."""
+    if isinstance(obj, Mapping):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, Sequence) and not isinstance(obj, str):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+def _copy_json(obj):
+    """Deep copy for JSON-shaped data (much cheaper than ``copy.deepcopy``)."""
+    if isinstance(obj, dict):
+        return {k: _copy_json(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_json(v) for v in obj]
+    return obj
+
+
+def _stat_key(path: str):
+    """``(st_mtime_ns, st_size)`` of *path*, or ``None`` if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Codec:
+    """Serialises a whole document to bytes and back.
+
+    Subclasses with a non-empty :attr:`magic` are recognised by that
+    header on load; anything else is parsed as JSON.
+    """
+
+    name = ""
+    magic = b""
+
+    def dumps(self, obj) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes):
+        raise NotImplementedError
+
+
+class PrettyJsonCodec(Codec):
+    """Indented UTF-8 JSON, for files people edit by hand."""
+
+    name = "json-pretty"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, indent=4, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+class CompactJsonCodec(PrettyJsonCodec):
+    """JSON without whitespace; same reader as :class:`PrettyJsonCodec`."""
+
+    name = "json-compact"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class BinaryRecordCodec(Codec):
+    """Length-prefixed record file for date-keyed datasets.
+
+    Layout: :attr:`magic`, a ``u32`` length plus compact-JSON *head*, then
+    one record per top-level key: ``u16`` key length, UTF-8 key, ``u32``
+    value length, compact-JSON value (all big-endian).  For a
+    ``{"version", "data"}`` envelope the head holds the version and the
+    records are the entries of ``data``; otherwise the head is ``{}``.
+    Each value is encoded on its own, so no single huge string is built,
+    and a reader can skip records by length without parsing them.
+    """
+
+    name = "binary"
+    magic = b"WHREC\x01"
+
+    _KEY = struct.Struct(">H")
+    _VALUE = struct.Struct(">I")
+
+    def dumps(self, obj) -> bytes:
+        if isinstance(obj, dict) and set(obj) == {"version", "data"} and isinstance(obj["data"], dict):
+            head, records = {"version": obj["version"]}, obj["data"]
+        elif isinstance(obj, dict):
+            head, records = {}, obj
+        else:
+            raise TypeError(f"{self.name} codec needs a dict document, got {type(obj).__name__}")
+        parts = [self.magic, self._encode_value(head)]
+        for key, value in records.items():
+            raw_key = key.encode("utf-8")
+            parts.append(self._KEY.pack(len(raw_key)))
+            parts.append(raw_key)
+            parts.append(self._encode_value(value))
+        return b"".join(parts)
+
+    def loads(self, data: bytes):
+        view = memoryview(data)
+        try:
+            pos = len(self.magic)
+            head, pos = self._decode_value(view, pos)
+            records = {}
+            while pos < len(view):
+                (key_len,) = self._KEY.unpack_from(view, pos)
+                pos += self._KEY.size
+                key = bytes(view[pos:pos + key_len]).decode("utf-8")
+                pos += key_len
+                records[key], pos = self._decode_value(view, pos)
+        except struct.error as exc:
+            raise ValueError(f"Truncated {self.name} record file") from exc
+        if "version" in head:
+            return {"version": head["version"], "data": records}
+        return records
+
+    # Shared encoder/decoder: json.dumps/loads build a new one per call
+    # when given options, which dominates for small records.
+    _encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    _decoder = json.JSONDecoder()
+
+    def _encode_value(self, value) -> bytes:
+        raw = self._encoder.encode(value).encode("utf-8")
+        return self._VALUE.pack(len(raw)) + raw
+
+    def _decode_value(self, view, pos):
+        (length,) = self._VALUE.unpack_from(view, pos)
+        pos += self._VALUE.size
+        if pos + length > len(view):
+            raise ValueError(f"Truncated {self.name} record file")
+        return self._decoder.decode(str(view[pos:pos + length], "utf-8")), pos + length
+
+
+CODECS = {codec.name: codec for codec in (PrettyJsonCodec(), CompactJsonCodec(), BinaryRecordCodec())}
+"""Registered codecs by name."""
+
+
+def get_codec(codec=None) -> Codec:
+    """Resolve a codec name (or instance); ``None`` means pretty JSON."""
+    if isinstance(codec, Codec):
+        return codec
+    try:
+        return CODECS[codec or PrettyJsonCodec.name]
+    except KeyError:
+        raise ValueError(f"Unknown codec {codec!r}; expected one of {sorted(CODECS)}") from None
+
+
+def decode_document(data: bytes):
+    """Parse *data* with the codec named by its magic header (JSON otherwise)."""
+    for codec in CODECS.values():
+        if codec.magic and data.startswith(codec.magic):
+            return codec.loads(data)
+    return json.loads(data)
+
+
+class BackupPolicy:
+    """Retention policy for backup generations.
+
+    Keeps at most *max_count* generations and drops those older than
+    *max_age_days*, but never prunes below *min_keep*.
+    """
+
+    def __init__(self, max_count: int = 10, max_age_days: float = 30, min_keep: int = 1):
+        self.max_count = max_count
+        self.max_age_days = max_age_days
+        self.min_keep = min_keep
+
+
+DEFAULT_BACKUP_POLICY = BackupPolicy()
+
+
+class BackupSet:
+    """Timestamped generations of one file in ``<dir>/backups/``.
+
+    :meth:`rotate` hardlinks the current file to
+    ``backups/<stem>.<YYYYmmdd-HHMMSS-ffffff><ext>`` (falling back to a
+    rename where links are unsupported), so no bytes are copied: the
+    caller's subsequent ``os.replace`` gives the primary path a new inode
+    while the generation keeps the old one.
+    """
+
+    _STAMP = "%Y%m%d-%H%M%S-%f"
+
+    def __init__(self, filepath: str, policy: BackupPolicy):
+        self.filepath = filepath
+        self.policy = policy
+        self.directory = os.path.join(os.path.dirname(filepath), "backups")
+        self.stem, self.ext = os.path.splitext(os.path.basename(filepath))
+
+    def generations(self) -> list:
+        """``[(path, datetime), ...]`` newest first."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        prefix = self.stem + "."
+        found = []
+        for name in names:
+            if not (name.startswith(prefix) and name.endswith(self.ext)):
+                continue
+            stamp = name[len(prefix):len(name) - len(self.ext)]
+            try:
+                created = datetime.strptime(stamp[:22], self._STAMP)
+            except ValueError:
+                continue
+            found.append((os.path.join(self.directory, name), created))
+        found.sort(key=lambda item: item[0], reverse=True)
+        return found
+
+    def candidates(self) -> list:
+        """Paths to try when the primary is unreadable, newest first."""
+        paths = [path for path, _ in self.generations()]
+        legacy_bak = self.filepath + ".bak"
+        if os.path.exists(legacy_bak):
+            paths.append(legacy_bak)
+        return paths
+
+    def rotate(self):
+        """Move the current file into a new generation; returns its path or ``None``."""
+        if not os.path.exists(self.filepath):
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        now = datetime.now()
+        target = os.path.join(self.directory, f"{self.stem}.{now.strftime(self._STAMP)}{self.ext}")
+        suffix = 1
+        while os.path.exists(target):
+            target = os.path.join(
+                self.directory, f"{self.stem}.{now.strftime(self._STAMP)}-{suffix}{self.ext}"
+            )
+            suffix += 1
+        try:
+            os.link(self.filepath, target)
+        except OSError:
+            os.replace(self.filepath, target)
+        self.prune(now)
+        return target
+
+    def prune(self, now=None):
+        """Apply the retention policy."""
+        now = now or datetime.now()
+        policy = self.policy
+        for index, (path, created) in enumerate(self.generations()):
+            if index < policy.min_keep:
+                continue
+            too_many = index >= policy.max_count
+            too_old = (now - created).total_seconds() > policy.max_age_days * 86400
+            if too_many or too_old:
+                try:
+                    os.remove(path)
+                except OSError:
+                    logging.warning("Could not prune backup %s", path, exc_info=True)
+
+
+DURABILITY_MODES = ("none", "on-close", "every-write", "group-commit")
+"""When written files are ``fsync``-ed:
+
+* ``none``: never; the OS decides when data reaches the disk.
+* ``on-close``: once, when the app quits (``flush_all(sync=True)``).
+* ``every-write``: the tmp file before ``os.replace`` and the directory
+  after it, on every write.
+* ``group-commit``: files written within *group_commit_ms* share one
+  ``fsync`` pass on the persistence thread, bounding the loss window.
+"""
+
+_durability = ("group-commit", 200)
+"""Module default ``(mode, group_commit_ms)`` for stores created without one."""
+
+
+def set_durability(mode: str, group_commit_ms: int = 200) -> None:
+    """Set the durability policy used by stores that do not pin their own."""
+    global _durability
+    if mode not in DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode {mode!r}; expected one of {DURABILITY_MODES}")
+    _durability = (mode, group_commit_ms)
+
+
+def _fsync_file(path: str) -> None:
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist directory entries (renames) in *path*.  A no-op on Windows,
+    where directories cannot be opened and NTFS journals renames itself."""
+    if os.name == "nt":
+        return
+    fd = os.open(path or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _log_persistence_error(filepath: str, exc: BaseException) -> None:
+    logging.error("Background write failed for %s: %s", filepath, exc, exc_info=exc)
+
+
+_error_handler = _log_persistence_error
+"""Callback ``(filepath, exc)`` invoked when a background write fails."""
+
+
+def set_persistence_error_handler(handler) -> None:
+    """Route background write failures to *handler(filepath, exc)*.
+
+    Pass ``None`` to restore the default (log only).
+    """
+    global _error_handler
+    _error_handler = handler or _log_persistence_error
+
+
+def _report_persistence_error(filepath: str, exc: BaseException) -> None:
+    try:
+        _error_handler(filepath, exc)
+    except Exception:
+        logging.error("Persistence error handler failed", exc_info=True)
 
 
 class JsonStore:
     """Encapsulates JSON file I/O with atomic writes and automatic backup.
 
-    Every ``load()`` and ``save()`` acquires the module-level ``_io_lock``.
+    The parsed document is cached in memory and only re-parsed when the
+    file's ``(st_mtime_ns, st_size)`` changes on disk; ``save()`` writes
+    through to the cache.  ``load()`` hands out a private deep copy that the
+    caller may mutate, ``view()`` a zero-copy read-only view.  ``hits`` /
+    ``misses`` count cache validations, and ``generation`` increases every
+    time the cached content changes.
+
+    With *write_behind* (the default) ``save()`` only updates the cache and
+    queues the write for the store's own persistence thread, which
+    coalesces back-to-back saves into one write.  :meth:`flush` is the
+    barrier for callers that need the data on disk.  Failures are reported
+    to the handler set by :func:`set_persistence_error_handler`; until the
+    next successful write the cache stays authoritative.
+
+    Every rewrite first moves the previous file into a timestamped backup
+    generation (see :class:`BackupSet`); if the primary is missing or
+    corrupt, the newest readable generation is used instead of the default.
+
+    With *schema_version* the file holds ``{"version": N, "data": ...}``
+    and callers only ever see ``data``.  A file already at *schema_version*
+    is used as parsed; older files go through *migrate* once and are
+    rewritten in the current envelope.
+
+    *codec* (a :data:`CODECS` name or :class:`Codec`) selects the on-disk
+    format written; reads detect the format by its header, so switching
+    codecs converts the file on the next save.
+
+    *durability* is one of :data:`DURABILITY_MODES`; ``None`` follows the
+    module default (:func:`set_durability`).  Under ``group-commit`` the
+    persistence thread fsyncs everything written in the last
+    *group_commit_ms* in one pass, and :meth:`flush` does not return before
+    that pass ran.  :meth:`sync` forces it for any mode.
+
+    Cache state is guarded by a per-store lock; the module-level
+    ``_io_lock`` is held around the actual file reads and writes.
     """
 
-    def __init__(self, filepath: str, default_factory=None):
+    def __init__(self, filepath: str, default_factory=None, write_behind: bool = True,
+                 schema_version: int = None, migrate=None, backup_policy=None,
+                 durability: str = None, group_commit_ms: int = None, codec=None):
         """*filepath*: absolute path. *default_factory*: zero-arg callable for default value."""
         self.filepath = filepath
         self.default_factory = default_factory
+        self.write_behind = write_behind
+        self.schema_version = schema_version
+        self.migrate = migrate
+        self.codec = get_codec(codec)
+        self.backups = BackupSet(filepath, backup_policy or DEFAULT_BACKUP_POLICY)
+        if durability is not None and durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode {durability!r}")
+        self.durability = durability
+        self.group_commit_ms = group_commit_ms
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._cache = None
+        self._cache_key = None
+        self._needs_upgrade = False
+        self._cond = threading.Condition(threading.RLock())
+        self._pending: list = []
+        self._in_flight = False
+        self._unsynced = False
+        self._writer = None
+        self._dirty: set = set()
+        self._sync_deadline = None
 
     def load(self):
-        """Load parsed JSON, or the default on missing/corrupt file."""
-        with _io_lock:
-            if not os.path.exists(self.filepath):
-                return self._default()
-            try:
-                with open(self.filepath, "r", encoding="utf-8") as fh:
-                    return json.load(fh)
-            except json.JSONDecodeError:
-                logging.error("JSON decode error loading %s", self.filepath, exc_info=True)
-                return self._default()
-            except (OSError, PermissionError):
-                logging.error("OS error loading %s", self.filepath, exc_info=True)
-                return self._default()
+        """Load parsed JSON, or the default on missing/corrupt file.
+
+        Returns a private copy; mutating it does not affect the cache.
+        """
+        with self._cond:
+            return _copy_json(self._cached())
+
+    def view(self):
+        """Return a read-only view of the cached document."""
+        with self._cond:
+            return _freeze(self._cached())
+
+    def version(self) -> int:
+        """:attr:`generation` after revalidating the cache against the file."""
+        with self._cond:
+            self._cached()
+            return self.generation
 
     def save(self, data):
-        """Persist *data* atomically via :meth:`_atomic_write`."""
-        self._atomic_write(data)
+        """Update the cache with *data* and persist it (see *write_behind*)."""
+        with self._cond:
+            self._set_cache(_copy_json(data), self._cache_key)
+            self._submit(("snapshot", self._cache))
+
+    def put(self, key, value) -> None:
+        """Set one top-level *key* of a dict document and persist it.
+
+        Copy-on-write like :meth:`JournalLogStore._append`: only the top
+        level is copied and the other values are shared with the previous
+        cache (nothing mutates them in place), so the in-memory cost is
+        O(keys + *value*) rather than a copy of the whole document.
+        """
+        with self._cond:
+            cache = dict(self._cached())
+            cache[key] = _copy_json(value)
+            self._set_cache(cache, self._cache_key)
+            self._submit(("snapshot", cache))
+
+    def flush(self, timeout=None) -> bool:
+        """Block until all queued writes reached disk.
 
-    def _atomic_write(self, data):
-        """Write to ``<filepath>.tmp``, backup old file to ``.bak``, then
-        ``os.replace()`` the tmp file into place.  Holds ``_io_lock``."""
+        Under ``group-commit`` this includes the pending ``fsync`` pass.
+        Returns ``False`` if *timeout* seconds elapsed first.
+        """
+        with self._cond:
+            done = self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+        if done and self._dirty and self._policy()[0] == "group-commit":
+            self.sync()
+        return done
+
+    def sync(self) -> None:
+        """``fsync`` every file written since the last sync, and its directory."""
+        with self._cond:
+            self._sync_deadline = None
         with _io_lock:
-            tmp_path = self.filepath + ".tmp"
-            bak_path = self.filepath + ".bak"
+            paths, self._dirty = self._dirty, set()
+            for path in paths:
+                try:
+                    _fsync_file(path)
+                except FileNotFoundError:
+                    continue
+            for directory in {os.path.dirname(path) for path in paths}:
+                _fsync_dir(directory)
+
+    def _policy(self):
+        """Effective ``(mode, group_commit_ms)``."""
+        mode, interval = _durability
+        return (self.durability or mode, self.group_commit_ms or interval)
+
+    def _written(self, path: str, data_synced: bool = False) -> None:
+        """Apply the durability policy to a completed write of *path*.  Caller holds ``_io_lock``."""
+        mode = self._policy()[0]
+        if mode == "every-write":
+            if not data_synced:
+                _fsync_file(path)
+            _fsync_dir(os.path.dirname(path))
+        elif mode != "none":
+            self._dirty.add(path)
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters for this store's in-memory cache."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "generation": self.generation,
+        }
+
+    def _cached(self):
+        """Return the cached document, re-parsing if the file changed.  Caller holds ``_cond``."""
+        if self._cache is not None and (self._pending or self._in_flight or self._unsynced):
+            self.hits += 1
+            return self._cache
+        key = self._stat_key()
+        if self._cache is not None and key == self._cache_key:
+            self.hits += 1
+        else:
+            self.misses += 1
+            with _io_lock:
+                data = self._parse()
+            self._set_cache(data, key)
+            if self._needs_upgrade:
+                self._needs_upgrade = False
+                self._rewrite()
+        return self._cache
+
+    def _rewrite(self):
+        """Queue a full rewrite of the cached document.  Caller holds ``_cond``."""
+        self._submit(("snapshot", _copy_json(self._cache)))
+
+    def _set_cache(self, data, key):
+        self._cache = data
+        self._cache_key = key
+        self.generation += 1
+
+    def _submit(self, op):
+        """Queue *op* for the persistence thread (or run it now).  Caller holds ``_cond``."""
+        if op[0] == "snapshot":
+            self._pending = [op]
+        elif self._pending and self._pending[-1][0] == op[0] == "append":
+            self._pending[-1] = ("append", self._pending[-1][1] + op[1])
+        else:
+            self._pending.append(op)
+        if not self.write_behind:
+            self._drain()
+            return
+        self._ensure_writer()
+        self._cond.notify_all()
+
+    def _ensure_writer(self):
+        """Start the persistence thread if needed.  Caller holds ``_cond``."""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name=f"store-writer:{os.path.basename(self.filepath)}",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def _sync_overdue(self) -> bool:
+        return self._sync_deadline is not None and time.monotonic() >= self._sync_deadline
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                timeout = None
+                if self._sync_deadline is not None:
+                    timeout = max(0.0, self._sync_deadline - time.monotonic())
+                self._cond.wait_for(lambda: self._pending or self._sync_overdue(), timeout)
+                sync_due, has_ops = self._sync_overdue(), bool(self._pending)
+            if sync_due:
+                try:
+                    self.sync()
+                except OSError as exc:
+                    _report_persistence_error(self.filepath, exc)
+            if has_ops:
+                self._drain()
+
+    def _drain(self):
+        """Execute every queued op, then revalidate the cache key."""
+        with self._cond:
+            ops, self._pending = self._pending, []
+            self._in_flight = True
+        error = None
+        key = None
+        try:
+            with _io_lock:
+                for op in ops:
+                    self._execute(op)
+                key = self._stat_key()
+        except Exception as exc:  # reported below; the writer must stay alive
+            error = exc
+        with self._cond:
+            self._in_flight = False
+            self._unsynced = error is not None
+            if error is None and not self._pending:
+                self._cache_key = key
+            if self._dirty and self._sync_deadline is None and self._policy()[0] == "group-commit":
+                self._sync_deadline = time.monotonic() + self._policy()[1] / 1000
+                self._ensure_writer()
+            self._after_drain(ops, error)
+            self._cond.notify_all()
+        if error is not None:
+            _report_persistence_error(self.filepath, error)
+
+    def _execute(self, op):
+        """Apply one queued op to disk.  Caller holds ``_io_lock``; raises on failure."""
+        self._write_file(op[1])
+
+    def _after_drain(self, ops, error):
+        """Hook run under ``_cond`` once a batch of ops has been executed."""
+
+    def _stat_key(self):
+        """Validation key for the cache; subclasses add their extra files."""
+        return _stat_key(self.filepath)
+
+    def fingerprint(self):
+        """JSON-able value that changes whenever the file on disk changes
+        (``None`` while it does not exist)."""
+        key = _stat_key(self.filepath)
+        return list(key) if key else None
+
+    def _parse(self):
+        """Produce the document to cache; subclasses may merge extra files."""
+        return self._read_body()
+
+    def _read_body(self):
+        """Parse :attr:`filepath` and unwrap the schema envelope.
+
+        Documents older than :attr:`schema_version` are migrated and flagged
+        for a one-time rewrite.  Caller holds ``_io_lock``.
+        """
+        if self.schema_version is None:
+            return self._read()
+        try:
+            raw = self._read_raw()
+        except (OSError, ValueError) as exc:
+            raw = self._read_failed(exc)
+            if raw is None:
+                return self._default()
+        if not isinstance(raw, dict):
+            return raw
+        if set(raw) == {"version", "data"}:
+            version, body = raw["version"], raw["data"]
+            if version == self.schema_version:
+                return body
+            if isinstance(version, int) and version > self.schema_version:
+                logging.warning(
+                    "%s has schema v%s, newer than supported v%s; not migrating",
+                    self.filepath, version, self.schema_version,
+                )
+                return body
+        else:
+            body = dict(raw)
+            version = body.pop("version", 0)
+        if self.migrate is not None:
+            body = self.migrate(body)
+        logging.info("Upgrading %s from schema v%s to v%s", self.filepath, version, self.schema_version)
+        self._needs_upgrade = True
+        return body
+
+    def _read(self):
+        """Parse :attr:`filepath` as-is; caller holds ``_io_lock``."""
+        try:
+            return self._read_raw()
+        except (OSError, ValueError) as exc:
+            raw = self._read_failed(exc)
+            return self._default() if raw is None else raw
+
+    def _read_raw(self, path=None):
+        with open(path or self.filepath, "rb") as fh:
+            return decode_document(fh.read())
+
+    def _read_failed(self, exc):
+        """Fall back to the newest parseable backup generation.
+
+        Returns the raw parsed backup, or ``None`` if there is none (the
+        caller then uses the default).  A missing primary with no backups is
+        the normal first-run case and is not logged.
+        """
+        if isinstance(exc, json.JSONDecodeError):
+            logging.error("JSON decode error loading %s", self.filepath, exc_info=exc)
+        elif not isinstance(exc, FileNotFoundError):
+            logging.error("OS error loading %s", self.filepath, exc_info=exc)
+        for path in self.backups.candidates():
             try:
-                with open(tmp_path, "w", encoding="utf-8") as fh:
-                    json.dump(data, fh, indent=4, ensure_ascii=False)
-                if os.path.exists(self.filepath):
-                    shutil.copy2(self.filepath, bak_path)
+                raw = self._read_raw(path)
+            except (OSError, ValueError):
+                logging.warning("Backup %s is unreadable too; trying older", path)
+                continue
+            logging.warning("Recovered %s from backup %s", self.filepath, path)
+            return raw
+        return None
+
+    def restore(self, backup_path: str) -> None:
+        """Roll this store back to the generation at *backup_path*.
+
+        The current file is rotated into a new generation first, so a
+        restore can itself be undone.  Raises ``ValueError`` / ``OSError``
+        if *backup_path* is not a readable JSON document.
+        """
+        self._read_raw(backup_path)
+        self.flush()
+        with self._cond:
+            with _io_lock:
+                self._before_restore()
+                tmp_path = self.filepath + ".tmp"
+                shutil.copyfile(backup_path, tmp_path)
+                self.backups.rotate()
                 os.replace(tmp_path, self.filepath)
-            except (OSError, PermissionError):
-                logging.error("Atomic write error for %s", self.filepath, exc_info=True)
-                if os.path.exists(tmp_path):
-                    try:
-                        os.remove(tmp_path)
-                    except OSError:
-                        pass
+                self._written(self.filepath)
+            self._cache = None
+            self._unsynced = False
+        logging.info("Restored %s from %s", self.filepath, backup_path)
+
+    def _before_restore(self):
+        """Hook run under ``_io_lock`` before the primary file is replaced."""
+
+    def _write_file(self, data):
+        """Write to ``<filepath>.tmp``, rotate the old file into a backup
+        generation, then ``os.replace()`` the tmp file into place.  Caller
+        holds ``_io_lock``."""
+        tmp_path = self.filepath + ".tmp"
+        if self.schema_version is not None:
+            data = {"version": self.schema_version, "data": data}
+        every_write = self._policy()[0] == "every-write"
+        payload = self.codec.dumps(data)
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(payload)
+                if every_write:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            self.backups.rotate()
+            os.replace(tmp_path, self.filepath)
+            self._written(self.filepath, data_synced=every_write)
+        except (OSError, PermissionError):
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            raise
 
     def _default(self):
         """Return the default value for this store."""
@@ -83,27 +837,429 @@ class JsonStore:
         return {}
 
 
-_life_game_store = JsonStore(LIFE_GAME_FILE, dict)
+class JournalLogStore(JsonStore):
+    """Journal store: compacted snapshot plus an append-only JSONL segment log.
 
-_config_store = JsonStore(
-    CONFIG_FILE,
-    lambda: {
-        "music_path": None,
-        "pomodoro": {
-            "default": {"work_duration": 25, "rest_duration": 5},
-            "morning_routine": {
-                "enabled": True,
-                "start_time": "05:00",
-                "end_time": "10:00",
-                "work_duration": 10,
-                "rest_duration": 5,
-            },
-        },
-    },
-)
+    ``filepath`` holds the last compacted snapshot in the usual date-keyed
+    format.  Answers saved after that are appended to ``<stem>.log.jsonl``,
+    one ``{"date", "created_at", "entry"}`` object per line, so a save costs
+    O(new answers) instead of re-serialising the whole history.  Parsing
+    replays the log over the snapshot.
+
+    ``save()`` diffs *data* against the cached document: pure appends are
+    queued as ``append`` ops, anything else (edits, deletions) as a full
+    snapshot rewrite.  Once the log would exceed *compact_threshold* lines
+    the save is turned into a snapshot, so compaction runs on the
+    persistence thread.
+
+    Every snapshot carries a log epoch under :attr:`EPOCH_KEY` (one more
+    than the previous snapshot's) and every log line the epoch of the
+    snapshot it follows.  Replay skips lines from older epochs, so a crash
+    between the snapshot replace and the log removal cannot bring back a
+    deleted answer or re-add the old text of an edited one.
+    """
+
+    EPOCH_KEY = "_log_epoch"
+
+    def __init__(self, filepath: str, default_factory=None, compact_threshold: int = 200,
+                 **store_kwargs):
+        super().__init__(filepath, default_factory, **store_kwargs)
+        self.log_path = os.path.splitext(filepath)[0] + ".log.jsonl"
+        self.compact_threshold = compact_threshold
+        self._log_lines = 0
+        self._epoch = 0  # epoch of the snapshot on disk; guarded by _io_lock
+
+    def save(self, data):
+        """Queue new answers for the log, or a snapshot rewrite if needed."""
+        with self._cond:
+            appended = self._diff_appends(self._cached(), data)
+            if appended is None:
+                self._snapshot(_copy_json(data))
+            elif appended:
+                self._append(appended)
+
+    def append(self, date_key: str, entry: dict, created_at: str = "") -> None:
+        """Append one answer to *date_key* without diffing the whole document."""
+        with self._cond:
+            self._cached()
+            self._append([(date_key, created_at, entry)])
+
+    def _snapshot(self, data):
+        """Replace the cache with *data* and queue a full rewrite.  Caller holds ``_cond``."""
+        self._set_cache(data, self._cache_key)
+        self._log_lines = 0
+        self._submit(("snapshot", _copy_json(data)))
+
+    def _append(self, appended):
+        """Apply ``[(date, created_at, entry), ...]`` and queue them.  Caller holds ``_cond``.
+
+        The cache is copied on write (top level and touched days only):
+        views handed out earlier keep seeing the old object unchanged.
+        """
+        cache = dict(self._cache)
+        touched: dict = {}
+        reshaped = False
+        for date_key, created_at, entry in appended:
+            day = touched.get(date_key)
+            if day is None:
+                old = cache.get(date_key)
+                if isinstance(old, dict) and isinstance(old.get("answers", []), list):
+                    day = dict(old)
+                    day["answers"] = list(old.get("answers", []))
+                else:
+                    reshaped = reshaped or date_key in cache
+                    day = {"answers": [], "created_at": created_at}
+                touched[date_key] = cache[date_key] = day
+            day["answers"].append(_copy_json(entry))
+        if reshaped or self._unsynced or self._log_lines + len(appended) >= self.compact_threshold:
+            self._snapshot(cache)
+            return
+        self._set_cache(cache, self._cache_key)
+        self._log_lines += len(appended)
+        self._submit(("append", _copy_json(appended)))
+
+    def compact(self):
+        """Queue a rewrite that folds the segment log into the snapshot."""
+        with self._cond:
+            if not os.path.exists(self.log_path) and not self._log_lines:
+                return
+            self._cached()
+            self._rewrite()
+
+    def _rewrite(self):
+        self._log_lines = 0
+        super()._rewrite()
+
+    def _execute(self, op):
+        kind, payload = op
+        if kind == "append":
+            every_write = self._policy()[0] == "every-write"
+            with open(self.log_path, "a", encoding="utf-8") as fh:
+                for date_key, created_at, entry in payload:
+                    fh.write(json.dumps(
+                        {"date": date_key, "created_at": created_at, "entry": entry, "epoch": self._epoch},
+                        ensure_ascii=False,
+                    ) + "\n")
+                if every_write:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            self._written(self.log_path, data_synced=every_write)
+            return
+        epoch = self._epoch + 1
+        self._write_file({**payload, self.EPOCH_KEY: epoch} if isinstance(payload, dict) else payload)
+        self._epoch = epoch  # from here on the old log lines are stale, even if removing them fails
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+            logging.info("Compacted journal log into %s", self.filepath)
+
+    def _stat_key(self):
+        return (_stat_key(self.filepath), _stat_key(self.log_path))
+
+    def fingerprint(self):
+        return [list(key) if key else None for key in self._stat_key()]
+
+    def _before_restore(self):
+        # Fold the log into the primary so the generation rotated out by the
+        # restore captures the full current state, then drop the log.
+        if os.path.exists(self.log_path):
+            self._write_file(self._parse())
+            os.remove(self.log_path)
+
+    def _parse(self):
+        data = self._read_body()
+        if not isinstance(data, dict):
+            data = self._default()
+        epoch = data.pop(self.EPOCH_KEY, 0)
+        self._epoch = epoch if isinstance(epoch, int) else 0
+        self._log_lines = 0
+        if not os.path.exists(self.log_path):
+            return data
+        seen: dict = {}
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as fh:
+                for lineno, line in enumerate(fh, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                        date_key, entry = rec["date"], rec["entry"]
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        # A torn final line after a crash is expected; skip it.
+                        logging.warning("Skipping bad journal log line %d in %s", lineno, self.log_path)
+                        continue
+                    if rec.get("epoch", 0) < self._epoch:
+                        continue  # written before the snapshot; already folded into it
+                    self._log_lines += 1
+                    day = data.setdefault(
+                        date_key, {"answers": [], "created_at": rec.get("created_at", "")}
+                    )
+                    answers = day.setdefault("answers", [])
+                    if date_key not in seen:
+                        seen[date_key] = {self._entry_key(e) for e in answers if isinstance(e, dict)}
+                    key = self._entry_key(entry)
+                    if key in seen[date_key]:
+                        continue
+                    seen[date_key].add(key)
+                    answers.append(entry)
+        except (OSError, PermissionError):
+            logging.error("OS error reading journal log %s", self.log_path, exc_info=True)
+        return data
+
+    @staticmethod
+    def _diff_appends(current, data):
+        """Return ``[(date, created_at, entry), ...]`` for pure appends, or ``None``.
+
+        Only new days and days whose answer count changed are diffed entry
+        by entry; any other day is compared as a whole, since an edit that
+        keeps the count must still force a snapshot.
+        """
+        if any(date_key not in data for date_key in current):
+            return None
+        appended = []
+        for date_key, day in data.items():
+            if date_key in current:
+                old = current[date_key]
+                if day is old:
+                    continue
+                old_answers = old.get("answers") if isinstance(old, dict) else None
+            else:
+                old, old_answers = None, []
+            answers = day.get("answers") if isinstance(day, dict) else None
+            if (
+                not isinstance(answers, list)
+                or not isinstance(old_answers, list)
+                or len(answers) == len(old_answers)
+            ):
+                if old is None or day != old:
+                    return None
+                continue
+            if set(day) - {"answers", "created_at"} or len(answers) < len(old_answers):
+                return None
+            if old is not None and (
+                day.get("created_at") != old.get("created_at")
+                or answers[:len(old_answers)] != old_answers
+            ):
+                return None
+            created_at = day.get("created_at", "")
+            appended.extend((date_key, created_at, entry) for entry in answers[len(old_answers):])
+        return appended
+
+    @staticmethod
+    def _entry_key(entry):
+        return (entry.get("question_id"), entry.get("answered_at"), entry.get("answer"))
+
+
+class JournalArchive:
+    """Read-only compressed archives of closed journal years.
+
+    Each past year lives in ``<stem>.<YYYY>.json.gz`` (or ``.json.xz`` with
+    *compression* ``"lzma"``) next to the live file, so the live store only
+    holds the open period and its parse/rewrite cost stops growing.  Years
+    are decompressed on first access and cached; an archive changes only
+    when :meth:`archive_closed` folds more days into it.
+
+    :meth:`archive_closed` is crash-safe: a year's archive is written to a
+    tmp file, fsynced and renamed into place *before* the archived days are
+    dropped from the live store.  A crash in between leaves the days in
+    both places; the live copy wins on read and the next pass removes it.
+
+    Archives have their own lock instead of ``_io_lock`` so a slow lzma
+    pass never blocks the stores' writers.  The archive listing is cached
+    until the directory's mtime changes or :meth:`_write` adds a file, and
+    :meth:`start` looks for closed years at most once per calendar day.
+    """
+
+    _EXTENSIONS = {"gzip": ".json.gz", "lzma": ".json.xz"}
+    _OPENERS = {".json.gz": gzip.open, ".json.xz": lzma.open}
+
+    def __init__(self, live_store: JsonStore, compression: str = "gzip"):
+        if compression not in self._EXTENSIONS:
+            raise ValueError(f"Unknown archive compression {compression!r}")
+        self.live = live_store
+        self.compression = compression
+        self.directory = os.path.dirname(live_store.filepath)
+        self.stem = os.path.splitext(os.path.basename(live_store.filepath))[0]
+        self._lock = threading.RLock()
+        self._years: dict = {}
+        self._listing = (None, {})  # (directory stat key, {year: path})
+        self._checked_on = None  # date of the last due() check by start()
+        self._worker = None
+
+    def years(self) -> list:
+        """Archived years, newest first."""
+        return sorted(self._files(), reverse=True)
+
+    def year(self, year: str) -> dict:
+        """The archived days of *year* (``{}`` if none).  Do not mutate."""
+        path = self._files().get(year)
+        if path is None:
+            return {}
+        key = _stat_key(path)
+        with self._lock:
+            cached = self._years.get(year)
+            if cached is not None and cached[0] == (path, key):
+                return cached[1]
+            opener = next(op for ext, op in self._OPENERS.items() if path.endswith(ext))
+            try:
+                with opener(path, "rb") as fh:
+                    days = decode_document(fh.read())
+            except (OSError, EOFError, ValueError, lzma.LZMAError):
+                logging.error("Unreadable journal archive %s", path, exc_info=True)
+                days = {}
+            self._years[year] = ((path, key), days)
+            return days
+
+    def live_part(self, data: dict) -> dict:
+        """*data* without the days that are already archived unchanged.
+
+        Days of archived years that differ from the archive stay in the
+        live store (they win on read) until the next :meth:`archive_closed`.
+        Removing an archived day from *data* does not delete it.
+        """
+        archived = {year: self.year(year) for year in self._files()}
+        if not archived:
+            return data
+        return {
+            k: v for k, v in data.items()
+            if k[:4] not in archived or archived[k[:4]].get(k) != v
+        }
+
+    def due(self) -> bool:
+        """``True`` if the live store still holds days of a closed year."""
+        this_year = str(date.today().year)
+        return any(isinstance(k, str) and k[:4] < this_year for k in self.live.view())
+
+    def start(self) -> None:
+        """Run :meth:`archive_closed` on a background thread if there is work.
+
+        Years only close at midnight, so the live store is scanned at most
+        once per day; later calls the same day return immediately.
+        """
+        today = date.today()
+        with self._lock:
+            if self._checked_on == today or (self._worker is not None and self._worker.is_alive()):
+                return
+            self._checked_on = today
+            if not self.due():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name=f"archiver:{self.stem}", daemon=True
+            )
+            self._worker.start()
+
+    def join(self, timeout=None) -> None:
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def archive_closed(self) -> list:
+        """Move every closed year out of the live store; returns the years moved."""
+        this_year = str(date.today().year)
+        live = self.live.load()
+        closed = sorted({k[:4] for k in live if isinstance(k, str) and k[:4] < this_year})
+        for year in closed:
+            days = {k: v for k, v in live.items() if k[:4] == year}
+            merged = dict(self.year(year))
+            merged.update(days)
+            self._write(year, merged)
+            with self.live._cond:
+                current = self.live.load()
+                for k, v in days.items():
+                    if current.get(k) == v:
+                        del current[k]
+                self.live.save(current)
+            logging.info("Archived %d journal days of %s", len(days), year)
+        if closed:
+            self.live.flush()
+        return closed
+
+    def _run(self):
+        try:
+            self.archive_closed()
+        except Exception as exc:  # reported; the live data is untouched
+            _report_persistence_error(self.live.filepath, exc)
+
+    def _files(self) -> dict:
+        """``{year: path}`` of the archives on disk."""
+        key = _stat_key(self.directory)
+        cached_key, found = self._listing
+        if key is not None and key == cached_key:
+            return found
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return {}
+        found = {}
+        prefix = self.stem + "."
+        for name in sorted(names):
+            for ext in self._OPENERS:
+                year = name[len(prefix):-len(ext)]
+                if name.startswith(prefix) and name.endswith(ext) and len(year) == 4 and year.isdigit():
+                    found[year] = os.path.join(self.directory, name)
+        self._listing = (key, found)
+        return found
+
+    def _write(self, year: str, days: dict) -> None:
+        ext = self._EXTENSIONS[self.compression]
+        path = os.path.join(self.directory, f"{self.stem}.{year}{ext}")
+        tmp_path = path + ".tmp"
+        payload = get_codec("json-compact").dumps(days)
+        with self._lock:
+            try:
+                with self._OPENERS[ext](tmp_path, "wb") as fh:
+                    fh.write(payload)
+                _fsync_file(tmp_path)
+                os.replace(tmp_path, path)
+                _fsync_dir(self.directory)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            for other in self._EXTENSIONS.values():
+                stale = os.path.join(self.directory, f"{self.stem}.{year}{other}")
+                if other != ext and os.path.exists(stale):
+                    os.remove(stale)
+            self._listing = (None, {})
+            self._years[year] = ((path, _stat_key(path)), days)
+
+
+class _ArchivedJournalView(Mapping):
+    """Read-only view over the live journal with archived years underneath.
+
+    Lookups only open the archive of the key's year; iterating opens all.
+    """
+
+    __slots__ = ("_live", "_archive")
+
+    def __init__(self, live: Mapping, archive: JournalArchive):
+        self._live = live
+        self._archive = archive
+
+    def __getitem__(self, date_key):
+        if date_key in self._live:
+            return self._live[date_key]
+        if isinstance(date_key, str):
+            days = self._archive.year(date_key[:4])
+            if date_key in days:
+                return _freeze(days[date_key])
+        raise KeyError(date_key)
+
+    def __contains__(self, date_key):
+        if date_key in self._live:
+            return True
+        return isinstance(date_key, str) and date_key in self._archive.year(date_key[:4])
+
+    def __iter__(self):
+        yield from self._live
+        for year in self._archive.years():
+            for date_key in self._archive.year(year):
+                if date_key not in self._live:
+                    yield date_key
+
+    def __len__(self):
+        return sum(1 for _ in self)
 
-_health_data_store = JsonStore(HEALTH_DATA_FILE, dict)
-_journal_data_store = JsonStore(JOURNAL_DATA_FILE, dict)
 
 _NUMERIC_FIELDS = {"weight", "bp_high", "bp_low", "heart_rate"}
 
@@ -128,6 +1284,10 @@ def migrate_health_data(data: dict) -> dict:
     - Flat dict entries (pre-2026-04) → wrapped in ``[dict]`` with numeric coercion.
     - List entries (2026-04+) → each record's numeric fields coerced to float.
     - Non-dict / non-list values pass through unchanged.
+
+    Runs once when a pre-envelope file is upgraded; saves normalise only
+    the days they change (:func:`_migrate_changed`), so files at
+    :data:`SCHEMA_VERSION` never need migrating on load.
     """
     if not isinstance(data, dict):
         return data
@@ -145,54 +1305,1040 @@ def migrate_health_data(data: dict) -> dict:
     return migrated
 
 
+def _migrate_changed(data: dict, current: Mapping) -> dict:
+    """*data* with :func:`migrate_health_data` applied to the days that differ from *current*.
+
+    Stored days were normalised when they were written (or when the file
+    was upgraded), so days equal to *current* are passed through as is.
+    """
+    changed = {k: v for k, v in data.items() if k not in current or current[k] != v}
+    if not changed:
+        return data
+    out = dict(data)
+    out.update(migrate_health_data(changed))
+    return out
+
+
+_life_game_store = JsonStore(LIFE_GAME_FILE, dict)
+
+_config_store = JsonStore(
+    CONFIG_FILE,
+    lambda: {
+        "music_path": None,
+        "pomodoro": {
+            "default": {"work_duration": 25, "rest_duration": 5},
+            "morning_routine": {
+                "enabled": True,
+                "start_time": "05:00",
+                "end_time": "10:00",
+                "work_duration": 10,
+                "rest_duration": 5,
+            },
+            "profiles": {},
+            "holidays": [],
+        },
+        "storage": {
+            "engine": "json",
+            "backups": {"max_count": 10, "max_age_days": 30},
+            "durability": {"mode": "group-commit", "group_commit_ms": 200},
+            "codecs": {"journal_archive": "gzip"},
+        },
+        "obsidian": {"vault": None, "folder": "Work Health"},
+        "activity": {"backend": "auto"},
+        "reminder": {"timeouts": {"prompt": 300, "break": 600}},
+    },
+)
+
+_health_data_store = JsonStore(
+    HEALTH_DATA_FILE, dict, schema_version=SCHEMA_VERSION, migrate=migrate_health_data,
+    codec=DEFAULT_CODECS["health"],
+)
+_journal_data_store = JournalLogStore(
+    JOURNAL_DATA_FILE, dict, schema_version=SCHEMA_VERSION, codec=DEFAULT_CODECS["journal"]
+)
+
+
+def _strip_version(data: dict) -> dict:
+    """Drop a legacy top-level ``"version"`` key from a date-keyed document."""
+    if isinstance(data, dict) and "version" in data:
+        return {k: v for k, v in data.items() if k != "version"}
+    return data
+
+
+class StorageEngine:
+    """Backend interface for the date-keyed health and journal datasets.
+
+    ``load_*`` return private, mutable documents in the historical JSON
+    shapes (``{date: [record, ...]}`` and ``{date: {"answers": [...],
+    "created_at": ...}}``); ``view_*`` return read-only views; ``save_*``
+    replace the whole dataset.  The query methods let hot paths avoid a
+    full scan where the backend can answer from an index.
+    """
+
+    name = "abstract"
+
+    def load_health(self) -> dict:
+        raise NotImplementedError
+
+    def view_health(self) -> Mapping:
+        raise NotImplementedError
+
+    def save_health(self, data: dict) -> None:
+        raise NotImplementedError
+
+    def load_journal(self) -> dict:
+        raise NotImplementedError
+
+    def view_journal(self) -> Mapping:
+        raise NotImplementedError
+
+    def save_journal(self, data: dict) -> None:
+        raise NotImplementedError
+
+    def save_health_days(self, days: dict) -> None:
+        """Replace the record lists of the dates in *days* (date → non-empty
+        list); other dates are left alone."""
+        data = self.load_health()
+        data.update(days)
+        self.save_health(data)
+
+    def append_health_record(self, date_str: str, record: dict) -> None:
+        """Add *record* to the end of *date_str*'s list."""
+        data = self.load_health()
+        records = data.get(date_str)
+        if not isinstance(records, list):
+            records = data[date_str] = []
+        records.append(record)
+        self.save_health(data)
+
+    def append_journal_answer(self, date_str: str, entry: dict, created_at: str = "") -> None:
+        """Add *entry* to *date_str*'s answers, creating the day if needed."""
+        data = self.load_journal()
+        day = data.get(date_str)
+        if not isinstance(day, dict):
+            day = data[date_str] = {"answers": [], "created_at": created_at}
+        day.setdefault("answers", []).append(entry)
+        self.save_journal(data)
+
+    def has_health_on(self, date_str: str) -> bool:
+        """``True`` if *date_str* has at least one health record."""
+        raise NotImplementedError
+
+    def last_health_record(self, until: str):
+        """Newest record on the newest date ``<= until``, or ``None``."""
+        raise NotImplementedError
+
+    def latest_answers(self, question_ids) -> dict:
+        """``{question_id: answer}`` of the newest answer for each requested ID."""
+        raise NotImplementedError
+
+    def journal_fingerprint(self):
+        """JSON-able value that changes whenever the stored journal changes
+        (call after :meth:`flush`); ``None`` if the backend cannot tell."""
+        return None
+
+    def health_version(self):
+        """Hashable value that changes whenever the health data changes, for
+        keying derived caches; ``None`` disables caching."""
+        return None
+
+    def flush(self, timeout=None) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class JsonStorageEngine(StorageEngine):
+    """The original layout: one JSON document per dataset.
+
+    With a *journal_archive*, closed journal years are read from compressed
+    archives (see :class:`JournalArchive`); ``load_journal`` / ``view_journal``
+    still present the whole history.
+    """
+
+    name = "json"
+
+    def __init__(self, health_store: JsonStore, journal_store: JsonStore,
+                 journal_archive: JournalArchive = None):
+        self.health_store = health_store
+        self.journal_store = journal_store
+        self.journal_archive = journal_archive
+
+    def load_health(self) -> dict:
+        return self.health_store.load()
+
+    def view_health(self) -> Mapping:
+        return self.health_store.view()
+
+    def save_health(self, data: dict) -> None:
+        data = _strip_version(data)
+        self.health_store.save(_migrate_changed(data, self.health_store.view()))
+
+    def append_health_record(self, date_str: str, record: dict) -> None:
+        record = migrate_health_data({date_str: [record]})[date_str][0]
+        store = self.health_store
+        with store._cond:
+            old = store._cached().get(date_str)
+            store.put(date_str, (list(old) if isinstance(old, list) else []) + [record])
+
+    def load_journal(self) -> dict:
+        live = self.journal_store.load()
+        if self.journal_archive is None:
+            return live
+        data = {}
+        for year in reversed(self.journal_archive.years()):
+            data.update(_copy_json(self.journal_archive.year(year)))
+        data.update(live)
+        return data
+
+    def view_journal(self) -> Mapping:
+        if self.journal_archive is None:
+            return self.journal_store.view()
+        return _ArchivedJournalView(self.journal_store.view(), self.journal_archive)
+
+    def save_journal(self, data: dict) -> None:
+        data = _strip_version(data)
+        if self.journal_archive is not None:
+            data = self.journal_archive.live_part(data)
+        self.journal_store.save(data)
+        if self.journal_archive is not None:
+            self.journal_archive.start()
+
+    def append_journal_answer(self, date_str: str, entry: dict, created_at: str = "") -> None:
+        # Appends only touch the live period; never pull the archives in.
+        if isinstance(self.journal_store, JournalLogStore):
+            self.journal_store.append(date_str, entry, created_at)
+            if self.journal_archive is not None:
+                self.journal_archive.start()
+            return
+        data = self.journal_store.load()
+        day = data.get(date_str)
+        if not isinstance(day, dict):
+            day = data[date_str] = {"answers": [], "created_at": created_at}
+        day.setdefault("answers", []).append(entry)
+        self.save_journal(data)
+
+    def has_health_on(self, date_str: str) -> bool:
+        records = self.view_health().get(date_str)
+        return isinstance(records, Sequence) and len(records) > 0
+
+    def last_health_record(self, until: str):
+        data = self.view_health()
+        for date_key in sorted((k for k in data if k <= until), reverse=True):
+            records = data[date_key]
+            if isinstance(records, Sequence) and len(records) > 0:
+                return dict(records[-1])
+        return None
+
+    def latest_answers(self, question_ids) -> dict:
+        wanted = set(question_ids)
+        found: dict = {}
+        for data in self._journal_periods():
+            for date_key in sorted(data, reverse=True):
+                day = data[date_key]
+                if not isinstance(day, Mapping):
+                    continue
+                for ans in reversed(day.get("answers", ())):
+                    q_id = ans.get("question_id")
+                    if q_id in wanted and q_id not in found:
+                        found[q_id] = ans.get("answer")
+                if len(found) >= len(wanted):
+                    return found
+        return found
+
+    def journal_fingerprint(self):
+        return self.journal_store.fingerprint()
+
+    def health_version(self):
+        return (self.name, id(self.health_store), self.health_store.version())
+
+    def _journal_periods(self):
+        """Journal days grouped by year, newest year first.
+
+        Archives are only opened once the scan reaches their year.
+        """
+        live = self.journal_store.view()
+        if self.journal_archive is None:
+            yield live
+            return
+        live_years = {k[:4] for k in live if isinstance(k, str)}
+        for year in sorted(live_years | set(self.journal_archive.years()), reverse=True):
+            days = {k: v for k, v in self.journal_archive.year(year).items() if k not in live}
+            days.update((k, live[k]) for k in live if isinstance(k, str) and k[:4] == year)
+            yield _freeze(days)
+
+    def flush(self, timeout=None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ok = True
+        for store in (self.health_store, self.journal_store):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ok = store.flush(remaining) and ok
+        return ok
+
+
+class SqliteStorageEngine(StorageEngine):
+    """stdlib ``sqlite3`` backend with indexed health and journal tables.
+
+    Each record/answer keeps its full JSON in a ``body`` column so documents
+    round-trip exactly; the indexed columns (``date``, ``time``,
+    ``question_id``) serve the query methods.  ``save_*`` diff against an
+    in-memory copy and rewrite only the dates that changed, in a single
+    transaction.  Dates without any records are not stored.
+    """
+
+    name = "sqlite"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS health_records (
+            date TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            time TEXT NOT NULL DEFAULT '',
+            weight REAL, bp_high REAL, bp_low REAL, heart_rate REAL,
+            body TEXT NOT NULL,
+            PRIMARY KEY (date, seq)
+        );
+        CREATE INDEX IF NOT EXISTS idx_health_date_time ON health_records (date, time);
+        CREATE TABLE IF NOT EXISTS journal_days (
+            date TEXT PRIMARY KEY,
+            created_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS journal_answers (
+            date TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            question_id TEXT,
+            answered_at TEXT,
+            body TEXT NOT NULL,
+            PRIMARY KEY (date, seq)
+        );
+        CREATE INDEX IF NOT EXISTS idx_journal_date_qid ON journal_answers (date, question_id);
+        CREATE INDEX IF NOT EXISTS idx_journal_qid_date ON journal_answers (question_id, date, seq);
+    """
+
+    _SYNCHRONOUS = {"none": "OFF", "on-close": "NORMAL", "group-commit": "NORMAL", "every-write": "FULL"}
+    """``PRAGMA synchronous`` per durability mode; in WAL mode ``NORMAL``
+    syncs at checkpoints, SQLite's own group commit."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={self._SYNCHRONOUS[_durability[0]]}")
+        self._conn.executescript(self._SCHEMA)
+        self._health = None
+        self._health_version = 0
+        self._journal = None
+
+    # -- health -----------------------------------------------------------
+
+    def load_health(self) -> dict:
+        with self._lock:
+            return _copy_json(self._health_doc())
+
+    def view_health(self) -> Mapping:
+        with self._lock:
+            return _freeze(self._health_doc())
+
+    def save_health(self, data: dict) -> None:
+        with self._lock:
+            old = self._health_doc()
+            new = {k: v for k, v in _migrate_changed(data, old).items() if isinstance(v, list) and v}
+            changed = [k for k, v in new.items() if old.get(k) != v]
+            removed = [k for k in old if k not in new]
+            if not changed and not removed:
+                return
+            with self._conn:
+                for date_key in removed + changed:
+                    self._conn.execute("DELETE FROM health_records WHERE date = ?", (date_key,))
+                self._conn.executemany(
+                    "INSERT INTO health_records "
+                    "(date, seq, time, weight, bp_high, bp_low, heart_rate, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._health_row(k, i, rec) for k in changed for i, rec in enumerate(new[k])],
+                )
+            self._health = _copy_json(new)
+            self._health_version += 1
+
+    def save_health_days(self, days: dict) -> None:
+        days = migrate_health_data(days)
+        with self._lock:
+            doc = self._health_doc()
+            changed = [k for k, v in days.items() if doc.get(k) != v]
+            if not changed:
+                return
+            with self._conn:
+                for date_key in changed:
+                    self._conn.execute("DELETE FROM health_records WHERE date = ?", (date_key,))
+                self._conn.executemany(
+                    "INSERT INTO health_records "
+                    "(date, seq, time, weight, bp_high, bp_low, heart_rate, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._health_row(k, i, rec) for k in changed for i, rec in enumerate(days[k])],
+                )
+            for date_key in changed:
+                doc[date_key] = _copy_json(days[date_key])
+            self._health_version += 1
+
+    def append_health_record(self, date_str: str, record: dict) -> None:
+        record = migrate_health_data({date_str: [record]})[date_str][0]
+        with self._lock:
+            doc = self._health_doc()
+            seq = len(doc.get(date_str, []))
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO health_records "
+                    "(date, seq, time, weight, bp_high, bp_low, heart_rate, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._health_row(date_str, seq, record),
+                )
+            doc.setdefault(date_str, []).append(_copy_json(record))
+            self._health_version += 1
+
+    def health_version(self):
+        return (self.name, id(self), self._health_version)
+
+    def has_health_on(self, date_str: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM health_records WHERE date = ? LIMIT 1", (date_str,)
+            ).fetchone()
+        return row is not None
+
+    def last_health_record(self, until: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM health_records WHERE date <= ? "
+                "ORDER BY date DESC, seq DESC LIMIT 1",
+                (until,),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # -- journal ----------------------------------------------------------
+
+    def load_journal(self) -> dict:
+        with self._lock:
+            return _copy_json(self._journal_doc())
+
+    def view_journal(self) -> Mapping:
+        with self._lock:
+            return _freeze(self._journal_doc())
+
+    def save_journal(self, data: dict) -> None:
+        new = {
+            k: {"answers": list(v.get("answers", [])), "created_at": v.get("created_at")}
+            for k, v in data.items()
+            if isinstance(v, dict)
+        }
+        with self._lock:
+            old = self._journal_doc()
+            changed = [k for k, v in new.items() if old.get(k) != v]
+            removed = [k for k in old if k not in new]
+            if not changed and not removed:
+                return
+            with self._conn:
+                for date_key in removed + changed:
+                    self._conn.execute("DELETE FROM journal_answers WHERE date = ?", (date_key,))
+                    self._conn.execute("DELETE FROM journal_days WHERE date = ?", (date_key,))
+                self._conn.executemany(
+                    "INSERT INTO journal_days (date, created_at) VALUES (?, ?)",
+                    [(k, new[k]["created_at"]) for k in changed],
+                )
+                self._conn.executemany(
+                    "INSERT INTO journal_answers (date, seq, question_id, answered_at, body) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (k, i, ans.get("question_id"), ans.get("answered_at"),
+                         json.dumps(ans, ensure_ascii=False))
+                        for k in changed
+                        for i, ans in enumerate(new[k]["answers"])
+                    ],
+                )
+            self._journal = _copy_json(new)
+
+    def append_journal_answer(self, date_str: str, entry: dict, created_at: str = "") -> None:
+        with self._lock:
+            doc = self._journal_doc()
+            day = doc.get(date_str)
+            with self._conn:
+                if day is None:
+                    self._conn.execute(
+                        "INSERT INTO journal_days (date, created_at) VALUES (?, ?)",
+                        (date_str, created_at),
+                    )
+                seq = len(day["answers"]) if day else 0
+                self._conn.execute(
+                    "INSERT INTO journal_answers (date, seq, question_id, answered_at, body) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (date_str, seq, entry.get("question_id"), entry.get("answered_at"),
+                     json.dumps(entry, ensure_ascii=False)),
+                )
+            if day is None:
+                day = doc[date_str] = {"answers": [], "created_at": created_at}
+            day["answers"].append(_copy_json(entry))
+
+    def latest_answers(self, question_ids) -> dict:
+        found: dict = {}
+        with self._lock:
+            for q_id in question_ids:
+                row = self._conn.execute(
+                    "SELECT body FROM journal_answers WHERE question_id = ? "
+                    "ORDER BY date DESC, seq DESC LIMIT 1",
+                    (q_id,),
+                ).fetchone()
+                if row:
+                    found[q_id] = json.loads(row[0]).get("answer")
+        return found
+
+    def journal_fingerprint(self):
+        with self._lock:
+            count, max_rowid = self._conn.execute(
+                "SELECT COUNT(*), MAX(rowid) FROM journal_answers"
+            ).fetchone()
+        return ["sqlite", count, max_rowid]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- internals --------------------------------------------------------
+
+    @staticmethod
+    def _health_row(date_key, seq, record):
+        def num(key):
+            value = record.get(key)
+            return value if isinstance(value, (int, float)) else None
+
+        return (
+            date_key, seq, str(record.get("time", "")),
+            num("weight"), num("bp_high"), num("bp_low"), num("heart_rate"),
+            json.dumps(record, ensure_ascii=False),
+        )
+
+    def _health_doc(self) -> dict:
+        if self._health is None:
+            doc: dict = {}
+            for date_key, body in self._conn.execute(
+                "SELECT date, body FROM health_records ORDER BY date, seq"
+            ):
+                doc.setdefault(date_key, []).append(json.loads(body))
+            self._health = doc
+        return self._health
+
+    def _journal_doc(self) -> dict:
+        if self._journal is None:
+            doc: dict = {}
+            for date_key, created_at in self._conn.execute(
+                "SELECT date, created_at FROM journal_days ORDER BY date"
+            ):
+                doc[date_key] = {"answers": [], "created_at": created_at}
+            for date_key, body in self._conn.execute(
+                "SELECT date, body FROM journal_answers ORDER BY date, seq"
+            ):
+                doc.setdefault(date_key, {"answers": [], "created_at": None})["answers"].append(
+                    json.loads(body)
+                )
+            self._journal = doc
+        return self._journal
+
+
+class _ShardedView(Mapping):
+    """Lazy merged read-only view over month shards.
+
+    The manifest answers "not present" without opening a shard; anything
+    it lists is confirmed against the owning shard, which is the source of
+    truth (after a crash the manifest may list a date the shard never got).
+    """
+
+    __slots__ = ("_shards",)
+
+    def __init__(self, shards):
+        self._shards = shards
+
+    def __getitem__(self, date_key):
+        if date_key in self:
+            return self._shards.shard(date_key[:7]).view()[date_key]
+        raise KeyError(date_key)
+
+    def __contains__(self, date_key):
+        if not isinstance(date_key, str) or date_key not in self._shards.dates(date_key[:7]):
+            return False
+        return date_key in self._shards.shard(date_key[:7]).view()
+
+    def __iter__(self):
+        for month in self._shards.months():
+            days = self._shards.shard(month).view()
+            for date_key in self._shards.dates(month):
+                if date_key in days:
+                    yield date_key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class _MonthShards:
+    """One dataset split into ``<directory>/YYYY-MM.json`` files plus a manifest.
+
+    ``manifest.json`` maps each month to the sorted dates it contains, so
+    "which dates exist" never needs a shard to be parsed.  Shards and the
+    manifest are separate write-behind stores, so a shard is flushed before
+    a manifest update that depends on it is queued.  On start-up a missing
+    manifest is rebuilt by scanning the shard files, and shards modified
+    after the manifest are re-checked (a crash between the two writes).
+    """
+
+    def __init__(self, directory: str, store_cls=JsonStore, migrate=None):
+        self.directory = directory
+        self.store_cls = store_cls
+        self.migrate = migrate
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = JsonStore(
+            os.path.join(directory, "manifest.json"), lambda: {"version": 1, "months": {}}
+        )
+        self._stores: dict = {}
+        if not os.path.exists(self.manifest.filepath):
+            self.rebuild_manifest()
+        else:
+            self._reconcile()
+
+    def shard(self, month: str) -> JsonStore:
+        store = self._stores.get(month)
+        if store is None:
+            store = self._stores[month] = self.store_cls(
+                os.path.join(self.directory, f"{month}.json"), dict,
+                schema_version=SCHEMA_VERSION, migrate=self.migrate,
+            )
+        return store
+
+    def months(self) -> list:
+        return sorted(self.manifest.view().get("months", {}))
+
+    def dates(self, month: str):
+        return self.manifest.view().get("months", {}).get(month, ())
+
+    def all_dates(self) -> list:
+        months = self.manifest.view().get("months", {})
+        return [d for m in sorted(months) for d in months[m]]
+
+    def merged(self) -> dict:
+        data: dict = {}
+        for month in self.months():
+            data.update(self.shard(month).load())
+        return data
+
+    def replace(self, data: dict, keep) -> None:
+        """Make the shards hold exactly the entries of *data* accepted by *keep*."""
+        by_month: dict = {}
+        for date_key, value in data.items():
+            if len(date_key) >= 7 and keep(value):
+                by_month.setdefault(date_key[:7], {})[date_key] = value
+        saved = []
+        for month in set(self.months()) | set(by_month):
+            wanted = by_month.get(month, {})
+            if self.shard(month).view() != wanted:
+                self.shard(month).save(wanted)
+                saved.append(self.shard(month))
+        for store in saved:
+            store.flush()
+        self._write_manifest({m: sorted(v) for m, v in by_month.items()})
+
+    def put(self, date_key: str, value) -> None:
+        """Replace one date's entry, touching only its month shard."""
+        self.put_many({date_key: value})
+
+    def put_many(self, entries: dict) -> None:
+        """Replace several dates' entries with one save per touched month shard."""
+        by_month: dict = {}
+        for date_key, value in entries.items():
+            by_month.setdefault(date_key[:7], {})[date_key] = value
+        added = {}
+        for month, values in by_month.items():
+            shard = self.shard(month)
+            data = shard.load()
+            data.update(values)
+            shard.save(data)
+            new = set(values).difference(self.dates(month))
+            if new:
+                shard.flush()  # the manifest must never list a date the shard does not have on disk
+                added[month] = new
+        if added:
+            months = {m: list(v) for m, v in self.manifest.view().get("months", {}).items()}
+            for month, new in added.items():
+                months[month] = sorted(new.union(months.get(month, [])))
+            self._write_manifest(months)
+
+    def rebuild_manifest(self) -> None:
+        months: dict = {}
+        for name in sorted(os.listdir(self.directory)):
+            stem, ext = os.path.splitext(name)
+            if ext == ".json" and len(stem) == 7 and stem[4] == "-":
+                dates = sorted(k for k in self.shard(stem).view() if k.startswith(stem))
+                if dates:
+                    months[stem] = dates
+        self._write_manifest(months)
+
+    def _reconcile(self) -> None:
+        """Re-list the dates of shards written after the manifest."""
+        manifest_key = _stat_key(self.manifest.filepath)
+        months = {m: list(v) for m, v in self.manifest.view().get("months", {}).items()}
+        newer = set()
+        for name in os.listdir(self.directory):
+            stem = name[:7]
+            if name[7:] not in (".json", ".log.jsonl") or stem[4:5] != "-":
+                continue  # shard files and journal shards' segment logs
+            key = _stat_key(os.path.join(self.directory, name))
+            if manifest_key is None or (key is not None and key[0] > manifest_key[0]):
+                newer.add(stem)
+        changed = False
+        for stem in sorted(newer):
+            dates = sorted(k for k in self.shard(stem).view() if k.startswith(stem))
+            if dates != months.get(stem, []):
+                logging.warning("Manifest of %s was stale for %s; repairing", self.directory, stem)
+                months[stem] = dates
+                changed = True
+        if changed:
+            self._write_manifest(months)
+
+    def flush(self, timeout=None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ok = True
+        for store in list(self._stores.values()) + [self.manifest]:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ok = store.flush(remaining) and ok
+        return ok
+
+    def _write_manifest(self, months: dict) -> None:
+        months = {m: d for m, d in months.items() if d}
+        if self.manifest.view().get("months") != months:
+            self.manifest.save({"version": 1, "months": months})
+
+
+def _is_health_day(value) -> bool:
+    return isinstance(value, list) and len(value) > 0
+
+
+def _is_journal_day(value) -> bool:
+    return isinstance(value, dict)
+
+
+class ShardedJsonStorageEngine(StorageEngine):
+    """Month-partitioned JSON layout: ``health/2026-10.json``, ``journal/2026-10.json``.
+
+    Today-only operations (status check, placeholders, appends) touch the
+    manifest and the current month's shard only.  ``view_*`` return lazy
+    merged views; ``load_*`` still build the full document for legacy
+    callers.
+    """
+
+    name = "sharded"
+
+    def __init__(self, health_dir: str, journal_dir: str):
+        self._lock = threading.RLock()
+        self.health = _MonthShards(health_dir, migrate=migrate_health_data)
+        self.journal = _MonthShards(journal_dir, JournalLogStore)
+
+    def load_health(self) -> dict:
+        with self._lock:
+            return self.health.merged()
+
+    def view_health(self) -> Mapping:
+        return _ShardedView(self.health)
+
+    def save_health(self, data: dict) -> None:
+        with self._lock:
+            self.health.replace(_migrate_changed(data, _ShardedView(self.health)), _is_health_day)
+
+    def append_health_record(self, date_str: str, record: dict) -> None:
+        with self._lock:
+            records = list(self.health.shard(date_str[:7]).load().get(date_str, []))
+            records.append(record)
+            self.health.put(date_str, migrate_health_data({date_str: records})[date_str])
+
+    def save_health_days(self, days: dict) -> None:
+        with self._lock:
+            self.health.put_many(migrate_health_data(days))
+
+    def load_journal(self) -> dict:
+        with self._lock:
+            return self.journal.merged()
+
+    def view_journal(self) -> Mapping:
+        return _ShardedView(self.journal)
+
+    def save_journal(self, data: dict) -> None:
+        with self._lock:
+            self.journal.replace(data, _is_journal_day)
+
+    def append_journal_answer(self, date_str: str, entry: dict, created_at: str = "") -> None:
+        with self._lock:
+            day = self.journal.shard(date_str[:7]).load().get(date_str)
+            if not isinstance(day, dict):
+                day = {"answers": [], "created_at": created_at}
+            day.setdefault("answers", []).append(entry)
+            self.journal.put(date_str, day)
+
+    def has_health_on(self, date_str: str) -> bool:
+        return date_str in self.view_health()
+
+    def last_health_record(self, until: str):
+        for month in reversed(self.health.months()):
+            if month > until[:7]:
+                continue
+            records_by_date = self.health.shard(month).view()
+            for date_key in reversed(self.health.dates(month)):
+                records = records_by_date.get(date_key, ())
+                if date_key <= until and len(records) > 0:
+                    return thaw(records[-1])
+        return None
+
+    def latest_answers(self, question_ids) -> dict:
+        wanted = set(question_ids)
+        found: dict = {}
+        for month in reversed(self.journal.months()):
+            days = self.journal.shard(month).view()
+            for date_key in sorted(days, reverse=True):
+                day = days[date_key]
+                if not isinstance(day, Mapping):
+                    continue
+                for ans in reversed(day.get("answers", ())):
+                    q_id = ans.get("question_id")
+                    if q_id in wanted and q_id not in found:
+                        found[q_id] = ans.get("answer")
+            if len(found) >= len(wanted):
+                break
+        return found
+
+    def health_version(self):
+        shards = self.health
+        with self._lock:
+            loaded = sum(store.version() for store in list(shards._stores.values()))
+        return (self.name, id(self), shards.manifest.version(), loaded)
+
+    def journal_fingerprint(self):
+        directory = self.journal.directory
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return None
+        return [[name, *(_stat_key(os.path.join(directory, name)) or ())] for name in names]
+
+    def flush(self, timeout=None) -> bool:
+        return self.health.flush(timeout) and self.journal.flush(timeout)
+
+
+def split_into_shards(health_dir: str = HEALTH_SHARD_DIR,
+                      journal_dir: str = JOURNAL_SHARD_DIR,
+                      health_file: str = HEALTH_DATA_FILE,
+                      journal_file: str = JOURNAL_DATA_FILE) -> ShardedJsonStorageEngine:
+    """Split the monolithic JSON files into month shards (files are kept)."""
+    journal = JournalLogStore(journal_file, dict, write_behind=False, schema_version=SCHEMA_VERSION)
+    source = JsonStorageEngine(
+        JsonStore(health_file, dict, write_behind=False,
+                  schema_version=SCHEMA_VERSION, migrate=migrate_health_data),
+        journal,
+        JournalArchive(journal),
+    )
+    target = ShardedJsonStorageEngine(health_dir, journal_dir)
+    health, journal = source.load_health(), source.load_journal()
+    target.save_health(health)
+    target.save_journal(journal)
+    target.flush()
+    logging.info("Split %d health dates and %d journal dates into month shards",
+                 len(health), len(journal))
+    return target
+
+
+_journal_archive = JournalArchive(_journal_data_store)
+
+_engine: StorageEngine = JsonStorageEngine(_health_data_store, _journal_data_store, _journal_archive)
+
+
+def get_storage_engine() -> StorageEngine:
+    """Return the active health/journal storage backend."""
+    return _engine
+
+
+def set_storage_engine(engine: StorageEngine) -> StorageEngine:
+    """Switch the active backend; returns the previous one (already flushed)."""
+    global _engine
+    previous = _engine
+    previous.flush()
+    _engine = engine
+    return previous
+
+
+def migrate_json_to_sqlite(db_path: str = SQLITE_DB_FILE,
+                           health_file: str = HEALTH_DATA_FILE,
+                           journal_file: str = JOURNAL_DATA_FILE) -> SqliteStorageEngine:
+    """One-shot import of the JSON datasets into a SQLite database.
+
+    Existing rows for the imported dates are replaced; the JSON files are
+    left untouched so the migration can be repeated or rolled back.
+    """
+    journal = JournalLogStore(journal_file, dict, write_behind=False, schema_version=SCHEMA_VERSION)
+    source = JsonStorageEngine(
+        JsonStore(health_file, dict, write_behind=False,
+                  schema_version=SCHEMA_VERSION, migrate=migrate_health_data),
+        journal,
+        JournalArchive(journal),
+    )
+    target = SqliteStorageEngine(db_path)
+    health, journal = source.load_health(), source.load_journal()
+    merged_health = target.load_health()
+    merged_health.update(health)
+    target.save_health(merged_health)
+    merged_journal = target.load_journal()
+    merged_journal.update({k: v for k, v in journal.items() if isinstance(v, dict)})
+    target.save_journal(merged_journal)
+    logging.info(
+        "Migrated %d health dates and %d journal dates into %s",
+        len(health), len(journal), db_path,
+    )
+    return target
+
+
+def configure_storage(config: dict) -> StorageEngine:
+    """Select the backend named by ``config["storage"]["engine"]``
+    (``json`` / ``sharded`` / ``sqlite``).
+
+    Switching to SQLite or shards for the first time imports the JSON
+    files once.
+    """
+    name = config.get("storage", {}).get("engine", "json")
+    if name == _engine.name:
+        return _engine
+    if name == "sqlite":
+        if os.path.exists(SQLITE_DB_FILE):
+            engine = SqliteStorageEngine(SQLITE_DB_FILE)
+        else:
+            engine = migrate_json_to_sqlite(SQLITE_DB_FILE)
+    elif name == "sharded":
+        if os.path.exists(os.path.join(HEALTH_SHARD_DIR, "manifest.json")):
+            engine = ShardedJsonStorageEngine(HEALTH_SHARD_DIR, JOURNAL_SHARD_DIR)
+        else:
+            engine = split_into_shards()
+    elif name == "json":
+        engine = JsonStorageEngine(_health_data_store, _journal_data_store, _journal_archive)
+    else:
+        logging.error("Unknown storage engine %r; keeping %s", name, _engine.name)
+        return _engine
+    set_storage_engine(engine)
+    logging.info("Storage engine: %s", engine.name)
+    return engine
+
+
 def load_life_game_data() -> dict:
     """Load life-game data from ``life_game.json``."""
     return _life_game_store.load()
 
 
+def view_life_game_data() -> Mapping:
+    """Read-only cached view of ``life_game.json`` (no copy)."""
+    return _life_game_store.view()
+
+
 def load_config() -> dict:
     """Load application configuration from ``config.json``."""
     return _config_store.load()
 
 
 def save_config(config: dict) -> None:
-    """Persist *config* to ``config.json`` atomically."""
+    """Persist *config* to ``config.json`` atomically (queued, see :func:`flush_all`)."""
     _config_store.save(config)
 
 
 def load_health_data() -> dict:
-    """Load health data, applying schema migration automatically.
+    """Load health data (date → list of records).
 
-    All date entries are guaranteed to use the list-of-records format.
+    Pre-envelope files are migrated and rewritten once on first load; the
+    result never contains a ``"version"`` key.
     """
-    return migrate_health_data(_health_data_store.load())
+    return _engine.load_health()
+
+
+def view_health_data() -> Mapping:
+    """Read-only view of health data for hot read paths (no copy)."""
+    return _engine.view_health()
 
 
 def save_health_data(data: dict) -> None:
-    """Persist *data* to ``health_data.json`` atomically.
+    """Persist *data* to ``health_data.json`` atomically (queued, see :func:`flush_all`).
+
+    Records are normalised with :func:`migrate_health_data` and written in
+    the ``{"version", "data"}`` envelope; a legacy ``"version"`` key in
+    *data* is ignored (caller's dict is not mutated).
+    """
+    _engine.save_health(data)
+
 
-    A ``"version"`` key is added to the saved payload (caller's dict
-    is not mutated).
+def save_health_days(days: dict) -> None:
+    """Replace the record lists of the dates in *days*, leaving other dates alone.
+
+    The sharded and SQLite engines write only the touched months / dates.
     """
-    to_save = dict(data)
-    to_save["version"] = SCHEMA_VERSION
-    _health_data_store.save(to_save)
+    _engine.save_health_days(days)
+
+
+def append_health_record(record: dict, date_str: str = None) -> None:
+    """Append one health *record* to *date_str* (default: today)."""
+    _engine.append_health_record(date_str or str(date.today()), record)
+
+
+def has_health_record(date_str: str) -> bool:
+    """``True`` if *date_str* has at least one health record."""
+    return _engine.has_health_on(date_str)
+
+
+def get_last_health_record(until: str = None):
+    """Newest health record on or before *until* (default: today), or ``None``."""
+    return _engine.last_health_record(until or str(date.today()))
 
 
 def load_journal_data() -> dict:
-    """Load journal data from ``journal_data.json``."""
-    return _journal_data_store.load()
+    """Load journal data from ``journal_data.json`` plus its segment log."""
+    return _engine.load_journal()
+
+
+def view_journal_data() -> Mapping:
+    """Read-only cached view of journal data (no copy)."""
+    return _engine.view_journal()
 
 
 def save_journal_data(data: dict) -> None:
-    """Persist *data* to ``journal_data.json`` atomically.
+    """Persist *data* to ``journal_data.json`` (queued, see :func:`flush_all`).
 
-    A ``"version"`` key is added to the saved payload (caller's dict
-    is not mutated).
+    New answers are appended to the segment log; edits trigger an atomic
+    snapshot rewrite (see :class:`JournalLogStore`) in the ``{"version",
+    "data"}`` envelope.  A legacy ``"version"`` key in *data* is ignored.
     """
-    to_save = dict(data)
-    to_save["version"] = SCHEMA_VERSION
-    _journal_data_store.save(to_save)
+    _engine.save_journal(data)
+    _latest_answers.mark_stale()
+
+
+def append_journal_answer(entry: dict, date_str: str = None, created_at: str = "") -> None:
+    """Append one journal answer *entry* to *date_str* (default: today).
+
+    *created_at* is only used when the day does not exist yet.
+    """
+    date_str = date_str or str(date.today())
+    _engine.append_journal_answer(date_str, entry, created_at)
+    _latest_answers.record(date_str, entry)
+
+
+def get_latest_answers(question_ids) -> dict:
+    """``{question_id: answer}`` with the newest journal answer per requested ID.
+
+    Served from the materialised :class:`LatestAnswerIndex` once it has been
+    validated, otherwise by the engine.
+    """
+    if _latest_answers.usable(_engine):
+        return _latest_answers.answers(question_ids)
+    return _engine.latest_answers(question_ids)
+
+
+def get_health_version():
+    """Cache key for data derived from the health dataset (see :meth:`StorageEngine.health_version`)."""
+    return _engine.health_version()
 
 
 def check_today_record_status() -> str:
@@ -201,6 +2347,324 @@ def check_today_record_status() -> str:
     Returns ``" (已填)"`` if today has at least one record, otherwise
     ``" (未填!)"``.
     """
-    today_str = str(date.today())
-    data = load_health_data()
-    return " (已填)" if today_str in data else " (未填!)"
+    return " (已填)" if _engine.has_health_on(str(date.today())) else " (未填!)"
+
+
+class LatestAnswerIndex:
+    """Materialised newest answer per question ID, in ``latest_answers.json``.
+
+    ``{"source": fingerprint, "answers": {question_id: {"answer", "date",
+    "answered_at"}}}``.  The journal write path keeps it current:
+    :meth:`record` for appends, while a whole-document save only calls
+    :meth:`mark_stale` and the next lookup (:meth:`usable`) rebuilds once
+    from the engine's in-memory view, so a burst of saves costs one scan.  ``source`` is the engine's
+    :meth:`StorageEngine.journal_fingerprint` as of the last time the index
+    was known to match; it is refreshed by :meth:`seal` on shutdown, and a
+    mismatch at startup (crash, external edit, restored backup) makes
+    :meth:`ensure` rebuild from scratch.  Until then :attr:`ready` is
+    ``False`` and callers fall back to the engine's own query.
+    """
+
+    def __init__(self, store: JsonStore):
+        self.store = store
+        self.ready = False
+        self.stale = False
+
+    def get(self, question_id: str):
+        """``{"answer", "date", "answered_at"}`` or ``None``."""
+        item = self.store.view()["answers"].get(question_id)
+        return dict(item) if item is not None else None
+
+    def answers(self, question_ids) -> dict:
+        found = self.store.view()["answers"]
+        return {q_id: found[q_id]["answer"] for q_id in question_ids if q_id in found}
+
+    def record(self, date_str: str, entry: dict) -> None:
+        """Note a newly appended answer (newer than or as new as any before it)."""
+        q_id = entry.get("question_id")
+        if q_id is None:
+            return
+        with self.store._cond:
+            doc = self.store.load()
+            current = doc["answers"].get(q_id)
+            if current is not None and current.get("date", "") > date_str:
+                return
+            doc["answers"][q_id] = {
+                "answer": entry.get("answer"), "date": date_str, "answered_at": entry.get("answered_at", ""),
+            }
+            self.store.save(doc)
+
+    def mark_stale(self) -> None:
+        """The journal was saved wholesale; rebuild before the next lookup."""
+        self.stale = True
+
+    def usable(self, engine: "StorageEngine") -> bool:
+        """``True`` if lookups can be served from the index, rebuilding it
+        from *engine*'s view first if it was marked stale."""
+        if self.ready and self.stale:
+            self.stale = False
+            self.rebuild(engine.view_journal())
+        return self.ready
+
+    def rebuild(self, journal, source=None) -> None:
+        """Recompute from a whole journal document or view."""
+        answers: dict = {}
+        for date_str in sorted(journal):
+            day = journal[date_str]
+            if not isinstance(day, Mapping):
+                continue
+            for entry in day.get("answers", ()):
+                if isinstance(entry, Mapping) and entry.get("question_id") is not None:
+                    answers[entry["question_id"]] = {
+                        "answer": entry.get("answer"), "date": date_str,
+                        "answered_at": entry.get("answered_at", ""),
+                    }
+        with self.store._cond:
+            if source is None:
+                source = self.store.view()["source"]
+            self.store.save({"source": source, "answers": answers})
+            self.ready = True
+
+    def ensure(self, engine: "StorageEngine") -> bool:
+        """Rebuild unless the stored fingerprint matches *engine*; ``True`` if rebuilt."""
+        engine.flush()
+        source = engine.journal_fingerprint()
+        if source is not None and self.store.view()["source"] == source:
+            self.ready = True
+            return False
+        logging.info("Latest-answer index is missing or stale; rebuilding")
+        self.stale = False
+        self.rebuild(engine.view_journal(), source)
+        return True
+
+    def invalidate(self) -> None:
+        """Forget the index (the journal was replaced wholesale)."""
+        with self.store._cond:
+            self.ready = False
+            self.store.save(self.store._default())
+
+    def seal(self, engine: "StorageEngine", timeout=None) -> bool:
+        """Record *engine*'s current fingerprint once the journal is on disk.
+
+        A stale index is left unsealed so the next start rebuilds it.
+        """
+        if not self.ready or self.stale:
+            return True
+        if not engine.flush(timeout):
+            return False
+        source = engine.journal_fingerprint()
+        with self.store._cond:
+            doc = self.store.load()
+            if doc["source"] != source:
+                doc["source"] = source
+                self.store.save(doc)
+        return self.store.flush(timeout)
+
+
+_latest_answers = LatestAnswerIndex(JsonStore(
+    LATEST_ANSWERS_FILE, lambda: {"source": None, "answers": {}},
+    codec="json-compact", backup_policy=BackupPolicy(max_count=1),
+))
+
+
+def ensure_latest_answers_index() -> None:
+    """Validate the latest-answer index against the active engine; rebuild if stale."""
+    _latest_answers.ensure(_engine)
+
+
+def get_last_answer(question_id: str):
+    """``{"answer", "date", "answered_at"}`` of the last answer to *question_id*, or ``None``."""
+    if _latest_answers.usable(_engine):
+        return _latest_answers.get(question_id)
+    view = _engine.view_journal()
+    for date_str in sorted(view, reverse=True):
+        day = view[date_str]
+        if not isinstance(day, Mapping):
+            continue
+        for entry in reversed(day.get("answers", ())):
+            if entry.get("question_id") == question_id:
+                return {"answer": entry.get("answer"), "date": date_str,
+                        "answered_at": entry.get("answered_at", "")}
+    return None
+
+
+_BACKUP_TARGETS = {
+    "config": _config_store,
+    "health": _health_data_store,
+    "journal": _journal_data_store,
+}
+"""Stores whose backup generations can be listed/restored from the tray."""
+
+
+def list_backups(name: str) -> list:
+    """Backup generations of dataset *name* (``config`` / ``health`` / ``journal``).
+
+    Returns ``[{"path", "created", "size"}, ...]`` newest first.  Only the
+    JSON files are covered; shard and SQLite layouts are not listed.
+    """
+    result = []
+    for path, created in _BACKUP_TARGETS[name].backups.generations():
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        result.append({"path": path, "created": created, "size": size})
+    return result
+
+
+def restore_backup(name: str, backup_path: str) -> None:
+    """Roll dataset *name* back to *backup_path* (see :meth:`JsonStore.restore`)."""
+    _BACKUP_TARGETS[name].restore(backup_path)
+    if name == "journal":
+        _latest_answers.invalidate()
+        threading.Thread(target=ensure_latest_answers_index, name="latest-answers", daemon=True).start()
+
+
+def configure_backups(config: dict) -> BackupPolicy:
+    """Apply ``config["storage"]["backups"]`` (``max_count`` / ``max_age_days``) to every store."""
+    cfg = config.get("storage", {}).get("backups", {})
+    policy = BackupPolicy(
+        max_count=cfg.get("max_count", DEFAULT_BACKUP_POLICY.max_count),
+        max_age_days=cfg.get("max_age_days", DEFAULT_BACKUP_POLICY.max_age_days),
+    )
+    for store in _all_stores():
+        store.backups.policy = policy
+    return policy
+
+
+def _all_stores():
+    return (_config_store, _life_game_store, _health_data_store, _journal_data_store)
+
+
+_registered_stores: list = []
+
+
+def register_store(store: JsonStore) -> JsonStore:
+    """Include an auxiliary *store* (scheduler state, export watermark, ...)
+    in :func:`flush_all`; backup and codec settings are left alone."""
+    if store not in _registered_stores:
+        _registered_stores.append(store)
+    return store
+
+
+def get_cache_stats() -> dict:
+    """Per-store cache counters, keyed by file name."""
+    return {os.path.basename(s.filepath): s.cache_stats() for s in _all_stores()}
+
+
+def flush_all(timeout=None, sync=False) -> bool:
+    """Wait for every store's queued writes; ``False`` if *timeout* (seconds, shared) expired.
+
+    With *sync* also ``fsync`` whatever the ``on-close`` / ``group-commit``
+    policies have not synced yet (used on quit).
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    ok = True
+    for flushable in _all_stores() + tuple(_registered_stores) + (_engine,):
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        ok = flushable.flush(remaining) and ok
+    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+    ok = _latest_answers.seal(_engine, remaining) and ok
+    if sync:
+        for store in _all_stores() + tuple(_registered_stores) + (_latest_answers.store,):
+            try:
+                store.sync()
+            except OSError:
+                logging.error("fsync failed for %s", store.filepath, exc_info=True)
+    return ok
+
+
+def configure_codecs(config: dict) -> dict:
+    """Apply ``config["storage"]["codecs"]`` (dataset name → codec name).
+
+    Health and journal default to compact JSON and config / life_game to
+    pretty JSON so they remain hand-editable; ``"binary"`` for health or
+    journal opts into the length-prefixed record format.
+    """
+    stores = {
+        "config": _config_store,
+        "life_game": _life_game_store,
+        "health": _health_data_store,
+        "journal": _journal_data_store,
+    }
+    wanted = dict(DEFAULT_CODECS)
+    wanted.update(config.get("storage", {}).get("codecs", {}))
+    applied = {}
+    for name, store in stores.items():
+        try:
+            codec = get_codec(wanted.get(name))
+        except ValueError:
+            logging.error("Unknown codec %r for %s; keeping %s", wanted.get(name), name, store.codec.name)
+            codec = store.codec
+        with store._cond:
+            store.codec = codec
+        applied[name] = codec.name
+    compression = wanted.get("journal_archive", "gzip")
+    if compression in JournalArchive._EXTENSIONS:
+        _journal_archive.compression = compression
+    else:
+        logging.error("Unknown journal archive compression %r; keeping %s",
+                      compression, _journal_archive.compression)
+    applied["journal_archive"] = _journal_archive.compression
+    return applied
+
+
+def archive_journal_async() -> None:
+    """Move closed journal years into their archives on a background thread
+    (JSON engine only; a no-op when there is nothing to archive)."""
+    engine = _engine
+    if isinstance(engine, JsonStorageEngine) and engine.journal_archive is not None:
+        engine.journal_archive.start()
+
+
+def convert_file(path: str, codec) -> None:
+    """Rewrite *path* in *codec* (format of the source is auto-detected).
+
+    The previous file is kept as a backup generation.  Raises
+    ``ValueError`` / ``OSError`` if *path* cannot be parsed.
+    """
+    store = JsonStore(path, write_behind=False, durability="every-write", codec=codec)
+    with _io_lock:
+        document = store._read_raw()
+        store._write_file(document)
+    logging.info("Converted %s to %s", path, store.codec.name)
+
+
+def configure_durability(config: dict) -> str:
+    """Apply ``config["storage"]["durability"]`` (``mode`` / ``group_commit_ms``).
+
+    Unknown modes are logged and fall back to ``group-commit``.
+    """
+    cfg = config.get("storage", {}).get("durability", {})
+    mode = cfg.get("mode", "group-commit")
+    try:
+        set_durability(mode, cfg.get("group_commit_ms", 200))
+    except ValueError:
+        logging.error("Unknown durability mode %r; using group-commit", mode)
+        set_durability("group-commit", cfg.get("group_commit_ms", 200))
+    return _durability[0]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Work Health storage maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_sqlite = sub.add_parser("migrate-sqlite", help="import the JSON datasets into SQLite")
+    p_sqlite.add_argument("--db", default=SQLITE_DB_FILE)
+    p_shard = sub.add_parser("shard", help="split the JSON datasets into month shards")
+    p_shard.add_argument("--health-dir", default=HEALTH_SHARD_DIR)
+    p_shard.add_argument("--journal-dir", default=JOURNAL_SHARD_DIR)
+    p_convert = sub.add_parser("convert", help="rewrite data files in another codec")
+    p_convert.add_argument("paths", nargs="+")
+    p_convert.add_argument("--to", choices=sorted(CODECS), required=True)
+    args = parser.parse_args()
+
+    if args.command == "migrate-sqlite":
+        migrate_json_to_sqlite(args.db).close()
+    elif args.command == "shard":
+        split_into_shards(args.health_dir, args.journal_dir)
+    elif args.command == "convert":
+        for path in args.paths:
+            convert_file(path, args.to)
@@ -0,0 +1,274 @@
+"""Bulk CSV / JSONL export and import of the health and journal datasets.
+
+Run from ``src``::
+
+    python -m data_transfer export health --format csv --from 2026-01-01 -o health.csv
+    python -m data_transfer export journal --format jsonl > journal.jsonl
+    python -m data_transfer import health health.csv
+
+Exports stream one row per health record / journal answer straight from
+the cached read-only views, so memory does not grow with the output.
+Every row carries its ``date``; JSONL rows hold the full record, CSV rows
+the columns in :data:`FIELDS`.
+
+Imports stream the file, skip rows already present (health by ``(date,
+time)``, or by date and content for records without a time; journal by
+``(date, question_id, answered_at)``; looked up in a hash set built once
+from the current data) and commit everything in one
+batched save at the end.  A ``.json`` file is parsed as one document: an
+array of rows or a date-keyed dataset as the app stores it.
+"""
+
+import csv
+import json
+import logging
+import os
+import sys
+from collections.abc import Mapping
+from datetime import date
+
+from config_manager import (
+    flush_all,
+    load_health_data,
+    load_journal_data,
+    save_health_data,
+    save_journal_data,
+    thaw,
+    view_health_data,
+    view_journal_data,
+)
+
+DATASETS = ("health", "journal")
+FORMATS = ("csv", "jsonl")
+IMPORT_FORMATS = FORMATS + ("json",)
+FIELDS = {
+    "health": ("date", "time", "weight", "bp_high", "bp_low", "heart_rate"),
+    "journal": ("date", "answered_at", "question_id", "question_zh", "question_en", "answer"),
+}
+_NUMERIC = {"weight", "bp_high", "bp_low", "heart_rate"}
+
+
+def iter_rows(dataset: str, date_from: str = None, date_to: str = None):
+    """Yield flat ``{"date", ...}`` rows of *dataset* in date order; the
+    bounds are inclusive ``YYYY-MM-DD`` strings."""
+    _check_dataset(dataset)
+    view = view_health_data() if dataset == "health" else view_journal_data()
+    for date_str in sorted(view):
+        if (date_from and date_str < date_from) or (date_to and date_str > date_to):
+            continue
+        day = view[date_str]
+        items = day if dataset == "health" else (day.get("answers", ()) if hasattr(day, "get") else ())
+        for item in items:
+            if isinstance(item, Mapping):
+                yield {"date": date_str, **item}
+
+
+def write_rows(rows, fh, fmt: str, dataset: str) -> int:
+    """Write *rows* to the text stream *fh*; returns the row count."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(fh, fieldnames=FIELDS[dataset], extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            fh.write(json.dumps(thaw(row), ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {FORMATS}")
+    return count
+
+
+def read_rows(fh, fmt: str):
+    """Yield dict rows from the text stream *fh* (CSV header, JSONL or a JSON document).
+
+    A ``json`` document is parsed whole: either an array of rows or a
+    date-keyed dataset as stored by the app (``{date: [record, ...]}`` /
+    ``{date: {"answers": [...]}}``, optionally in the ``{"version",
+    "data"}`` envelope).
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(fh):
+            yield {k: v for k, v in row.items() if k and v not in (None, "")}
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                logging.warning("Skipping unparsable line %d", line_no)
+                continue
+            if isinstance(row, dict):
+                yield row
+    elif fmt == "json":
+        yield from _document_rows(json.load(fh))
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {IMPORT_FORMATS}")
+
+
+def import_rows(dataset: str, rows) -> dict:
+    """Merge *rows* into *dataset* with a single save.
+
+    Returns ``{"added", "duplicates", "invalid"}`` counts.
+    """
+    _check_dataset(dataset)
+    view = view_health_data() if dataset == "health" else view_journal_data()
+    seen = set(_existing_keys(dataset, view))
+    added: dict = {}
+    stats = {"added": 0, "duplicates": 0, "invalid": 0}
+    for row in rows:
+        record = _normalise(dataset, row)
+        if record is None:
+            stats["invalid"] += 1
+            continue
+        date_str, item = record
+        key = _key(dataset, date_str, item)
+        if key in seen:
+            stats["duplicates"] += 1
+            continue
+        seen.add(key)
+        added.setdefault(date_str, []).append(item)
+        stats["added"] += 1
+
+    if added:
+        if dataset == "health":
+            data = load_health_data()
+            for date_str, records in added.items():
+                data.setdefault(date_str, []).extend(records)
+                data[date_str].sort(key=lambda r: r.get("time") or "")
+            save_health_data(data)
+        else:
+            data = load_journal_data()
+            for date_str, entries in added.items():
+                entries.sort(key=lambda e: e.get("answered_at") or "")
+                day = data.setdefault(date_str, {"answers": [], "created_at": entries[0].get("answered_at", "")})
+                # Append only: existing answers keep their order, so the save
+                # goes to the segment log instead of a snapshot rewrite.
+                day.setdefault("answers", []).extend(entries)
+            save_journal_data(data)
+    logging.info("Imported %s: %s", dataset, stats)
+    return stats
+
+
+def _existing_keys(dataset, view):
+    for date_str in view:
+        day = view[date_str]
+        items = day if dataset == "health" else (day.get("answers", ()) if hasattr(day, "get") else ())
+        for item in items:
+            if hasattr(item, "get"):
+                yield _key(dataset, date_str, item)
+
+
+def _key(dataset, date_str, item):
+    if dataset == "health":
+        if item.get("time"):
+            return (date_str, item["time"])
+        # Records without a time are only duplicates if their content matches.
+        content = {k: thaw(v) for k, v in item.items() if k != "time" and v not in (None, "")}
+        return (date_str, "", json.dumps(content, sort_keys=True, default=str))
+    return (date_str, item.get("question_id"), item.get("answered_at"))
+
+
+def _normalise(dataset, row):
+    """``(date, record)`` from an imported row, or ``None`` if unusable."""
+    date_str = str(row.get("date", "")).strip()
+    try:
+        date.fromisoformat(date_str)
+    except ValueError:
+        return None
+    item = {k: v for k, v in row.items() if k != "date"}
+    if dataset == "health":
+        for key in _NUMERIC & item.keys():
+            try:
+                item[key] = float(item[key])
+            except (TypeError, ValueError):
+                return None
+        if not _NUMERIC & item.keys():
+            return None
+    elif not item.get("question_id") or not isinstance(item.get("answer"), str):
+        return None
+    return date_str, item
+
+
+def _document_rows(doc):
+    if isinstance(doc, dict) and set(doc) == {"version", "data"}:
+        doc = doc["data"]
+    if isinstance(doc, list):
+        yield from (row for row in doc if isinstance(row, dict))
+        return
+    if not isinstance(doc, dict):
+        raise ValueError("A JSON import must be an array of rows or a date-keyed object")
+    for date_str, day in doc.items():
+        if isinstance(day, dict):
+            items = day.get("answers", ()) if "answers" in day else (day,)  # legacy flat health day
+        else:
+            items = day if isinstance(day, list) else ()
+        for item in items:
+            if isinstance(item, dict):
+                yield {"date": date_str, **item}
+
+
+def _check_dataset(dataset):
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset {dataset!r}; expected one of {DATASETS}")
+
+
+def _detect_format(path, fmt):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        return "json"
+    return "jsonl" if ext in (".jsonl", ".ndjson") else "csv"
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    from config_manager import configure_backups, configure_codecs, configure_durability, configure_storage, load_config
+
+    parser = argparse.ArgumentParser(prog="python -m data_transfer", description="Bulk CSV/JSONL export and import")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_export = sub.add_parser("export", help="stream a dataset to CSV or JSONL")
+    p_export.add_argument("dataset", choices=DATASETS)
+    p_export.add_argument("--format", choices=FORMATS, default="csv")
+    p_export.add_argument("--from", dest="date_from")
+    p_export.add_argument("--to", dest="date_to")
+    p_export.add_argument("-o", "--output", help="file to write (default: stdout)")
+    p_import = sub.add_parser("import", help="merge records from CSV, JSONL or JSON, skipping duplicates")
+    p_import.add_argument("dataset", choices=DATASETS)
+    p_import.add_argument("path")
+    p_import.add_argument("--format", choices=IMPORT_FORMATS, help="default: from the file extension")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    # Same engine, codecs and write policies as the app, so the CLI never rewrites
+    # the store in a different format or bypasses the configured backend.
+    config = load_config()
+    configure_durability(config)
+    configure_codecs(config)
+    configure_backups(config)
+    configure_storage(config)
+    if args.command == "export":
+        rows = iter_rows(args.dataset, args.date_from, args.date_to)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8", newline="") as fh:
+                count = write_rows(rows, fh, args.format, args.dataset)
+        else:
+            count = write_rows(rows, sys.stdout, args.format, args.dataset)
+        logging.info("Exported %d %s rows", count, args.dataset)
+    else:
+        with open(args.path, "r", encoding="utf-8-sig", newline="") as fh:
+            import_rows(args.dataset, read_rows(fh, _detect_format(args.path, args.format)))
+        if not flush_all(timeout=30):
+            logging.error("Import was not fully written to disk within 30s")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""Vectorised analytics over the health dataset (weight / BP / heart rate).
+
+Records are loaded once into columnar NumPy arrays: ``timestamps``
+(``datetime64[s]``, sorted) plus one ``float64`` column per metric, with
+NaN where a record has no value.  Everything else is array arithmetic on
+those columns:
+
+* :func:`resample` — per day / week (Monday start) / month aggregates via
+  ``ufunc.reduceat`` over the sorted buckets;
+* :func:`rolling` — batched calendar-day rolling mean / min / max / std for
+  several metrics and window lengths in one call;
+* :func:`percentiles` — overall or per-bucket percentiles;
+* :func:`week_over_week` — change of the weekly mean.
+
+Results are cached in memory keyed by :func:`config_manager.get_health_version`
+(which changes whenever the health data does) and returned as read-only
+arrays, so repeated chart redraws cost a dict lookup.
+"""
+
+import threading
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+
+from config_manager import get_health_version, view_health_data
+
+METRICS = ("weight", "bp_high", "bp_low", "heart_rate")
+FREQUENCIES = ("D", "W", "M")
+AGGREGATES = ("mean", "min", "max", "count", "last")
+ROLLING_STATS = ("mean", "min", "max", "std")
+
+_CACHE_SIZE = 64
+_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class HealthSeries:
+    """Columnar, time-sorted view of every health record."""
+
+    __slots__ = ("timestamps", "columns")
+
+    def __init__(self, timestamps, columns: dict):
+        self.timestamps = timestamps
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, metric):
+        return self.columns[metric]
+
+    @property
+    def days(self):
+        return self.timestamps.astype("datetime64[D]")
+
+
+def build_series(data) -> HealthSeries:
+    """Convert a ``{date: [record, ...]}`` mapping into a :class:`HealthSeries`.
+
+    Records without a usable ``time`` are placed at midnight; values that
+    are missing or not numeric become NaN.
+    """
+    stamps = []
+    values = {metric: [] for metric in METRICS}
+    for date_key in data:
+        records = data[date_key]
+        if not isinstance(date_key, str) or isinstance(records, (str, bytes)):
+            continue
+        try:
+            records = list(records)
+        except TypeError:
+            continue
+        for record in records:
+            if not hasattr(record, "get"):
+                continue
+            time_str = record.get("time")
+            if not (isinstance(time_str, str) and len(time_str) == 8):
+                time_str = "00:00:00"
+            stamps.append(f"{date_key}T{time_str}")
+            for metric in METRICS:
+                values[metric].append(_to_float(record.get(metric)))
+    try:
+        timestamps = np.array(stamps, dtype="datetime64[s]")
+    except ValueError:
+        # A malformed date key somewhere: parse one by one and drop it.
+        keep = [i for i, s in enumerate(stamps) if _valid_stamp(s)]
+        timestamps = np.array([stamps[i] for i in keep], dtype="datetime64[s]")
+        values = {m: [v[i] for i in keep] for m, v in values.items()}
+    order = np.argsort(timestamps, kind="stable")
+    columns = {m: np.asarray(v, dtype=np.float64)[order] for m, v in values.items()}
+    return HealthSeries(timestamps[order], columns)
+
+
+def load_series() -> HealthSeries:
+    """The current health data as a :class:`HealthSeries` (cached)."""
+    return _cached("series", (), lambda: _freeze(build_series(view_health_data())))
+
+
+def resample(freq: str = "D", how: str = "mean", metrics=METRICS):
+    """Aggregate each metric per bucket.
+
+    Returns ``(starts, {metric: values})`` where ``starts`` are the bucket
+    start dates (``datetime64[D]``) of buckets that contain records.
+    *how* is one of :data:`AGGREGATES`; NaNs are ignored (an all-NaN bucket
+    yields NaN, or 0 for ``count``).
+    """
+    _check(freq, FREQUENCIES, "freq")
+    _check(how, AGGREGATES, "how")
+    metrics = tuple(metrics)
+    return _cached("resample", (freq, how, metrics), lambda: _resample(load_series(), freq, how, metrics))
+
+
+def rolling(windows=(7,), stats=("mean",), metrics=METRICS):
+    """Calendar-day rolling statistics, batched.
+
+    Daily means are laid on a dense day grid from the first to the last
+    recorded day (NaN on days without data); each window covers the
+    trailing *w* days including the current one and ignores NaNs.  Returns
+    ``(days, {(metric, window, stat): values})``.
+    """
+    windows, stats, metrics = tuple(windows), tuple(stats), tuple(metrics)
+    for stat in stats:
+        _check(stat, ROLLING_STATS, "stat")
+    if any(int(w) < 1 for w in windows):
+        raise ValueError("Rolling windows must be at least one day")
+    return _cached("rolling", (windows, stats, metrics), lambda: _rolling(windows, stats, metrics))
+
+
+def percentiles(q=(5, 50, 95), metrics=METRICS, freq: str = None):
+    """Percentiles *q* (0–100) of each metric, ignoring NaN.
+
+    Without *freq* returns ``{metric: values}`` with one value per *q*;
+    with a *freq* returns ``(starts, {metric: array of shape (buckets, len(q))})``.
+    """
+    q, metrics = tuple(q), tuple(metrics)
+    if freq is not None:
+        _check(freq, FREQUENCIES, "freq")
+    return _cached("percentiles", (q, metrics, freq), lambda: _percentiles(q, metrics, freq))
+
+
+def week_over_week(metrics=METRICS):
+    """``(week_starts, {metric: delta})``: weekly mean minus the previous
+    calendar week's mean (NaN when either week has no value)."""
+    metrics = tuple(metrics)
+    return _cached("wow", metrics, lambda: _week_over_week(metrics))
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+# -- implementation -----------------------------------------------------------
+
+
+def _cached(name, args, compute):
+    version = get_health_version()
+    if version is None:
+        return compute()
+    key = (version, name, args)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    result = _freeze(compute())
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def _freeze(result):
+    """Mark every array in *result* read-only (cached results are shared)."""
+    if isinstance(result, np.ndarray):
+        result.flags.writeable = False
+    elif isinstance(result, HealthSeries):
+        _freeze(result.timestamps)
+        _freeze(result.columns)
+    elif isinstance(result, dict):
+        for value in result.values():
+            _freeze(value)
+    elif isinstance(result, tuple):
+        for value in result:
+            _freeze(value)
+    return result
+
+
+def _bucket_keys(days, freq):
+    if freq == "D":
+        return days
+    if freq == "W":
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday.
+        return days - ((days.astype(np.int64) + 3) % 7).astype("timedelta64[D]")
+    return days.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def _bucket_starts(keys):
+    """Indices where a new bucket begins in the sorted *keys*."""
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+
+
+def _resample(series, freq, how, metrics):
+    keys = _bucket_keys(series.days, freq)
+    starts = _bucket_starts(keys)
+    out = {}
+    for metric in metrics:
+        out[metric] = _reduce(series[metric], starts, how)
+    return keys[starts], out
+
+
+def _reduce(values, starts, how):
+    if len(starts) == 0:
+        return np.zeros(0)
+    present = ~np.isnan(values)
+    if how == "count":
+        return np.add.reduceat(present.astype(np.int64), starts)
+    if how == "min":
+        return np.fmin.reduceat(values, starts)
+    if how == "max":
+        return np.fmax.reduceat(values, starts)
+    if how == "last":
+        positions = np.where(present, np.arange(len(values)), -1)
+        last = np.maximum.reduceat(positions, starts)
+        return np.where(last >= 0, values[np.maximum(last, 0)], np.nan)
+    sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+    counts = np.add.reduceat(present.astype(np.int64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def _daily_grid(metrics):
+    """``(days, {metric: daily mean})`` on a dense day range."""
+    day_keys, daily = resample("D", "mean", metrics)
+    if len(day_keys) == 0:
+        return day_keys, {m: np.zeros(0) for m in metrics}
+    first = day_keys[0]
+    n_days = int((day_keys[-1] - first).astype(np.int64)) + 1
+    offsets = (day_keys - first).astype(np.int64)
+    grid = {}
+    for metric in metrics:
+        dense = np.full(n_days, np.nan)
+        dense[offsets] = daily[metric]
+        grid[metric] = dense
+    return first + np.arange(n_days).astype("timedelta64[D]"), grid
+
+
+def _rolling(windows, stats, metrics):
+    days, grid = _daily_grid(metrics)
+    out = {}
+    for metric in metrics:
+        values = grid[metric]
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        csum = np.concatenate(([0.0], np.cumsum(filled)))
+        csq = np.concatenate(([0.0], np.cumsum(filled * filled)))
+        ccount = np.concatenate(([0], np.cumsum(present)))
+        for window in windows:
+            window = int(window)
+            idx = np.arange(1, len(values) + 1)
+            lo = np.maximum(idx - window, 0)
+            counts = ccount[idx] - ccount[lo]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(counts > 0, (csum[idx] - csum[lo]) / counts, np.nan)
+                for stat in stats:
+                    if stat == "mean":
+                        result = mean
+                    elif stat == "std":
+                        var = (csq[idx] - csq[lo]) / counts - mean * mean
+                        result = np.where(counts > 0, np.sqrt(np.maximum(var, 0.0)), np.nan)
+                    else:
+                        padded = np.concatenate((np.full(window - 1, np.nan), values))
+                        view = np.lib.stride_tricks.sliding_window_view(padded, window)
+                        ufunc = np.fmin if stat == "min" else np.fmax
+                        result = ufunc.reduce(view, axis=1) if len(values) else np.zeros(0)
+                    out[(metric, window, stat)] = result
+    return days, out
+
+
+def _percentiles(q, metrics, freq):
+    series = load_series()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN slices -> NaN
+        if freq is None:
+            return {
+                m: np.nanpercentile(series[m], q) if len(series) else np.full(len(q), np.nan)
+                for m in metrics
+            }
+        keys = _bucket_keys(series.days, freq)
+        starts = _bucket_starts(keys)
+        bounds = np.append(starts, len(keys))
+        out = {}
+        for metric in metrics:
+            values = series[metric]
+            rows = [np.nanpercentile(values[a:b], q) for a, b in zip(bounds[:-1], bounds[1:])]
+            out[metric] = np.array(rows).reshape(len(starts), len(q))
+        return keys[starts], out
+
+
+def _week_over_week(metrics):
+    weeks, means = resample("W", "mean", metrics)
+    out = {}
+    for metric in metrics:
+        values = means[metric]
+        delta = np.full(len(values), np.nan)
+        if len(values) > 1:
+            consecutive = (weeks[1:] - weeks[:-1]) == np.timedelta64(7, "D")
+            delta[1:] = np.where(consecutive, values[1:] - values[:-1], np.nan)
+        out[metric] = delta
+    return weeks, out
+
+
+def _to_float(value):
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _valid_stamp(stamp):
+    try:
+        np.datetime64(stamp, "s")
+        return True
+    except ValueError:
+        return False
+
+
+def _check(value, allowed, name):
+    if value not in allowed:
+        raise ValueError(f"Unknown {name} {value!r}; expected one of {allowed}")
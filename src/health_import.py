@@ -0,0 +1,312 @@
+"""Import readings from smart-scale / BP-cuff CSV files and health-app XML exports.
+
+Run from ``src``::
+
+    python -m health_import export.xml                  # Apple Health export
+    python -m health_import omron.csv --metrics bp_high bp_low heart_rate
+
+Both parsers stream: XML through ``ElementTree.iterparse`` (each element
+is cleared once read, so the tree never grows), CSV row by row with a
+header mapping guessed from common column names (English and Chinese).
+Each reading is ``(date, time, metric, value)`` in the local time it was
+taken; readings sharing a ``(date, time)`` are merged into one health
+record (a cuff's systolic, diastolic and pulse become one row).
+
+Readings are committed in batches of *batch_size* records; each batch
+reads and writes only the dates it touches (``save_health_days``), so
+memory and per-batch work are bounded by the batch, not by the history
+or the file.  A record
+that already exists for the same ``(date, time)`` only has its missing
+metrics filled in.  *progress(bytes_read, total_bytes)* is called as the
+file is consumed.
+"""
+
+import csv
+import io
+import logging
+import os
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from config_manager import save_health_days, thaw, view_health_data
+
+METRICS = ("weight", "bp_high", "bp_low", "heart_rate")
+DEFAULT_BATCH_SIZE = 50_000
+_LB_TO_KG = 0.45359237
+_PROGRESS_STEP = 1 << 20
+
+_APPLE_TYPES = {
+    "HKQuantityTypeIdentifierBodyMass": "weight",
+    "HKQuantityTypeIdentifierBloodPressureSystolic": "bp_high",
+    "HKQuantityTypeIdentifierBloodPressureDiastolic": "bp_low",
+    "HKQuantityTypeIdentifierHeartRate": "heart_rate",
+}
+
+# Header keywords (lower-case, checked with ``in``) per CSV column role,
+# most specific first.
+_CSV_COLUMNS = (
+    ("bp_high", ("systolic", "收缩压", "高压", "sys")),
+    ("bp_low", ("diastolic", "舒张压", "低压", "dia")),
+    ("heart_rate", ("heart rate", "heart_rate", "pulse", "心率", "脉搏", "bpm")),
+    ("weight", ("weight", "体重")),
+    ("datetime", ("datetime", "timestamp", "测量时间", "measurement date", "measured at", "date time")),
+    ("date", ("date", "日期")),
+    ("time", ("time", "时间")),
+)
+
+_DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M",
+    "%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M %p", "%d.%m.%Y %H:%M", "%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y",
+)
+
+
+class _ProgressReader(io.RawIOBase):
+    """Binary file wrapper that reports how many bytes were read."""
+
+    def __init__(self, raw, total, progress):
+        self._raw = raw
+        self._total = total
+        self._progress = progress
+        self._read = 0
+        self._reported = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self._raw.readinto(buffer)
+        self._read += n or 0
+        if self._progress and (not n or self._read - self._reported >= _PROGRESS_STEP):
+            self._reported = self._read
+            self._progress(self._read, self._total)
+        return n
+
+
+def parse_apple_health(fh, metrics=METRICS):
+    """Yield ``(date, time, metric, value)`` from an Apple Health ``export.xml`` (binary stream)."""
+    wanted = {t: m for t, m in _APPLE_TYPES.items() if m in metrics}
+    context = ET.iterparse(fh, events=("start", "end"))
+    _, root = next(context)
+    depth = 0
+    for event, elem in context:
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if elem.tag == "Record":
+            metric = wanted.get(elem.get("type"))
+            if metric is not None:
+                reading = _apple_reading(elem, metric)
+                if reading is not None:
+                    yield reading
+        if depth == 0:
+            root.clear()  # drop finished top-level elements (and their children)
+
+
+def _apple_reading(elem, metric):
+    try:
+        value = float(elem.get("value"))
+    except (TypeError, ValueError):
+        return None
+    if metric == "weight" and (elem.get("unit") or "").lower() in ("lb", "lbs"):
+        value *= _LB_TO_KG
+    start = elem.get("startDate") or ""
+    # Exports always use "YYYY-MM-DD HH:MM:SS +ZZZZ"; slicing avoids strptime
+    # on what can be millions of records.
+    if len(start) >= 19 and start[4] == start[7] == "-" and start[10] == " " and start[13] == start[16] == ":":
+        return start[:10], start[11:19], metric, round(value, 2) if metric == "weight" else value
+    stamp = _parse_datetime(start[:19])
+    return None if stamp is None else _reading(stamp, metric, value)
+
+
+def parse_csv(fh, metrics=METRICS):
+    """Yield ``(date, time, metric, value)`` from a scale / cuff CSV (text stream)."""
+    reader = csv.reader(fh)
+    header = next(reader, None)
+    if header is None:
+        return
+    roles = _map_columns(header)
+    if not any(r in roles for r in ("datetime", "date")):
+        raise ValueError(f"No date column found in CSV header: {header}")
+    lb = {col for role, col in roles.items() if role == "weight" and "lb" in header[col].lower()}
+    for row in reader:
+        stamp = _row_datetime(row, roles)
+        if stamp is None:
+            continue
+        for metric in metrics:
+            col = roles.get(metric)
+            if col is None or col >= len(row):
+                continue
+            value = _parse_number(row[col])
+            if value is None:
+                continue
+            if col in lb:
+                value *= _LB_TO_KG
+            yield _reading(stamp, metric, value)
+
+
+def _map_columns(header):
+    roles = {}
+    for col, name in enumerate(header):
+        name = name.strip().lower()
+        for role, keywords in _CSV_COLUMNS:
+            if role not in roles and any(k in name for k in keywords):
+                roles[role] = col
+                break
+    return roles
+
+
+def _row_datetime(row, roles):
+    def cell(role):
+        col = roles.get(role)
+        return row[col].strip() if col is not None and col < len(row) else ""
+
+    if "datetime" in roles:
+        return _parse_datetime(cell("datetime"))
+    text = cell("date")
+    if "time" in roles and cell("time"):
+        text = f"{text} {cell('time')}"
+    return _parse_datetime(text)
+
+
+def _parse_datetime(text):
+    text = text.strip().strip('"')
+    if not text:
+        return None
+    if text.isdigit():  # epoch seconds / milliseconds
+        seconds = int(text) / (1000 if len(text) > 11 else 1)
+        return datetime.fromtimestamp(seconds)
+    for fmt in _DATETIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(text).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _parse_number(text):
+    text = text.strip().replace(",", ".")
+    for suffix in ("kg", "lbs", "lb", "mmhg", "bpm"):
+        if text.lower().endswith(suffix):
+            text = text[: -len(suffix)].strip()
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _reading(stamp, metric, value):
+    if metric == "weight":
+        value = round(value, 2)
+    return stamp.strftime("%Y-%m-%d"), stamp.strftime("%H:%M:%S"), metric, value
+
+
+def import_readings(readings, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Bucket *readings* into ``(date, time)`` records and commit them in batches.
+
+    Returns ``{"readings", "added", "merged", "unchanged"}`` counts
+    (``merged``: an existing record gained metrics).
+    """
+    stats = {"readings": 0, "added": 0, "merged": 0, "unchanged": 0}
+    batch: dict = {}
+    for date_str, time_str, metric, value in readings:
+        stats["readings"] += 1
+        key = (date_str, time_str)
+        if key not in batch and len(batch) >= batch_size:
+            _commit(batch, stats)
+            batch = {}
+        batch.setdefault(key, {})[metric] = value
+    if batch:
+        _commit(batch, stats)
+    logging.info("Health import: %s", stats)
+    return stats
+
+
+def _commit(batch: dict, stats: dict) -> None:
+    """Merge one batch into the health store, reading and saving only its dates."""
+    view = view_health_data()
+    days = {}
+    by_key = {}
+    for date_str in {d for d, _ in batch}:
+        records = thaw(view[date_str]) if date_str in view else []
+        days[date_str] = records if isinstance(records, list) else []
+        for record in days[date_str]:
+            by_key[(date_str, record.get("time") or "")] = record
+    changed = set()
+    for (date_str, time_str), fields in batch.items():
+        record = by_key.get((date_str, time_str))
+        if record is None:
+            record = {"time": time_str, **fields}
+            days[date_str].append(record)
+            by_key[(date_str, time_str)] = record
+            changed.add(date_str)
+            stats["added"] += 1
+            continue
+        missing = {k: v for k, v in fields.items() if record.get(k) in (None, "")}
+        if missing:
+            record.update(missing)
+            changed.add(date_str)
+            stats["merged"] += 1
+        else:
+            stats["unchanged"] += 1
+    for date_str in changed:
+        days[date_str].sort(key=lambda r: r.get("time") or "")
+    if changed:
+        save_health_days({d: days[d] for d in changed})
+
+
+def import_file(path: str, fmt: str = None, metrics=METRICS, progress=None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Import *path* (``fmt``: ``"apple-xml"`` / ``"csv"``, default by extension)."""
+    fmt = fmt or ("apple-xml" if path.lower().endswith(".xml") else "csv")
+    with open(path, "rb") as raw:
+        fh = io.BufferedReader(_ProgressReader(raw, os.path.getsize(path), progress), 1 << 16)
+        if fmt == "apple-xml":
+            readings = parse_apple_health(fh, metrics)
+        elif fmt == "csv":
+            readings = parse_csv(io.TextIOWrapper(fh, encoding="utf-8-sig", newline=""), metrics)
+        else:
+            raise ValueError(f"Unknown import format {fmt!r}")
+        return import_readings(readings, batch_size)
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    from config_manager import (configure_backups, configure_codecs, configure_durability, configure_storage,
+                                flush_all, load_config)
+
+    parser = argparse.ArgumentParser(prog="python -m health_import",
+                                     description="Import smart-scale / BP-cuff CSV or Apple Health XML")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("apple-xml", "csv"), help="default: from the file extension")
+    parser.add_argument("--metrics", nargs="+", choices=METRICS, default=list(METRICS))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    config = load_config()
+    configure_durability(config)
+    configure_codecs(config)
+    configure_backups(config)
+    configure_storage(config)
+
+    def progress(done, total):
+        print(f"\r{done * 100 // max(total, 1):3d}%  {done >> 20} / {total >> 20} MB", end="", file=sys.stderr)
+
+    stats = import_file(args.path, args.format, tuple(args.metrics), progress, args.batch_size)
+    print(file=sys.stderr)
+    print(stats)
+    if not flush_all(timeout=60):
+        logging.error("Import was not fully written to disk within 60s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+"""Full-text search over journal answers.
+
+A persistent inverted index maps tokens to the answers containing them:
+lower-cased ASCII words, and overlapping character bigrams for CJK runs
+(a lone CJK character is kept as a unigram).  Answers are numbered in
+date order, so each posting list is a sorted ``array`` of answer ids and a
+date range maps to an id range by bisection.
+
+The index is updated incrementally from ``Monitor._save_journal_answer``
+via :func:`index_answer`; persistence is a compact JSON snapshot plus a
+JSONL log of answers added since, written on a single background thread
+and folded into the snapshot every :data:`COMPACT_EVERY` answers.  The
+index is append-only, so it also keeps an order-independent digest of
+every indexed answer (date, time, question and text); :func:`ensure_index`
+recomputes that digest from the journal and rebuilds in the background on
+any mismatch, which catches edits and deletions as well as new answers.
+"""
+
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+from config_manager import BASE_DIR, _fsync_file, view_journal_data
+
+JOURNAL_INDEX_FILE = os.path.join(BASE_DIR, "journal_index.json")
+INDEX_VERSION = 2
+COMPACT_EVERY = 500
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list:
+    """ASCII words plus CJK bigrams of *text*, in order (duplicates kept)."""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        run = match.group()
+        if run[0] < "\u0080":
+            tokens.append(run)
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+class SearchIndex:
+    """Inverted index over journal answers with BM25-ranked AND queries.
+
+    ``docs`` holds ``(date, answered_at, question_id)`` per answer id;
+    ``_postings[token]`` is ``(ids, tfs)``, two parallel arrays sorted by
+    id, and ``_char_tokens[ch]`` lists the CJK tokens containing ``ch`` so a
+    one-character query does not scan the vocabulary.  With *path* ``None``
+    nothing is persisted.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.log_path = None if path is None else os.path.splitext(path)[0] + ".log.jsonl"
+        self.docs: list = []
+        self._dates: list = []
+        self._lengths = array("I")
+        self._total_length = 0
+        self.digest = 0
+        self._postings: dict = {}
+        self._char_tokens: dict = {}
+        self._keys: set = set()
+        self._in_order = True
+        self._log_lines = 0
+        self._lock = threading.RLock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-index")
+
+    def __len__(self):
+        return len(self.docs)
+
+    # -- updates ------------------------------------------------------------
+
+    def add(self, date_str: str, entry: dict) -> bool:
+        """Index one answer; ``False`` if it was already indexed."""
+        with self._lock:
+            if not self._add(date_str, entry):
+                return False
+            if self.path is not None:
+                line = json.dumps({"date": date_str, "entry": _doc_fields(entry)}, ensure_ascii=False)
+                self._log_lines += 1
+                compact = self._log_lines >= COMPACT_EVERY
+                if compact:
+                    self._log_lines = 0
+                self._writer.submit(self._persist, line, compact)
+            return True
+
+    def rebuild(self, journal) -> None:
+        """Re-index every answer of *journal* (``{date: {"answers": [...]}}``)."""
+        fresh = SearchIndex()
+        for date_str, entry in _indexable(journal):
+            fresh._add(date_str, entry)
+        with self._lock:
+            for attr in ("docs", "_dates", "_lengths", "_total_length", "digest", "_postings", "_char_tokens",
+                         "_keys", "_in_order"):
+                setattr(self, attr, getattr(fresh, attr))
+            self._log_lines = 0
+            if self.path is not None:
+                self._writer.submit(self._persist, None, True)
+        logging.info("Rebuilt journal search index: %d answers", len(self.docs))
+
+    def _add(self, date_str, entry) -> bool:
+        key = (date_str, entry.get("answered_at"), entry.get("question_id"))
+        if key in self._keys or not isinstance(entry.get("answer"), str):
+            return False
+        self._keys.add(key)
+        self.digest = (self.digest + _entry_hash(date_str, entry)) & _DIGEST_MASK
+        doc_id = len(self.docs)
+        if self._dates and date_str < self._dates[-1]:
+            self._in_order = False
+        self.docs.append(key)
+        self._dates.append(date_str)
+        tokens = tokenize(entry["answer"])
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        counts: dict = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = (array("I"), array("H"))
+                self._note_chars(token)
+            posting[0].append(doc_id)
+            posting[1].append(min(tf, 0xFFFF))
+        return True
+
+    def _note_chars(self, token):
+        if token[0] >= "\u0080":
+            for ch in set(token):
+                self._char_tokens.setdefault(ch, []).append(token)
+
+    # -- queries ------------------------------------------------------------
+
+    def search(self, query: str, date_from: str = None, date_to: str = None, limit: int = 50) -> list:
+        """Answers containing every query token, best first.
+
+        Returns ``[(score, date, answered_at, question_id), ...]``; the date
+        bounds are inclusive ``YYYY-MM-DD`` strings.
+        """
+        with self._lock:
+            terms = [self._expand(t) for t in dict.fromkeys(tokenize(query))]
+            if not terms or not self.docs or any(not postings for postings in terms):
+                return []
+            lo, hi = self._id_range(date_from, date_to)
+            if lo >= hi:
+                return []
+            # Rarest term first: its posting list bounds the candidate set.
+            terms.sort(key=lambda postings: sum(len(ids) for ids, _ in postings))
+            n_docs = len(self.docs)
+            avg_len = self._total_length / n_docs or 1.0
+            # Out-of-order ids (an answer filed under an earlier date) make
+            # the id range a superset; check those dates one by one.
+            check_dates = not self._in_order and (date_from is not None or date_to is not None)
+            scores: dict = {}
+            for ids, tfs in terms[0]:
+                idf = _idf(n_docs, len(ids))
+                for i in range(bisect_left(ids, lo), bisect_left(ids, hi)):
+                    doc_id = ids[i]
+                    if check_dates and not _in_range(self._dates[doc_id], date_from, date_to):
+                        continue
+                    scores[doc_id] = scores.get(doc_id, 0.0) + self._bm25(idf, tfs[i], doc_id, avg_len)
+            for postings in terms[1:]:
+                if not scores:
+                    break
+                matched: dict = {}
+                for ids, tfs in postings:
+                    idf = _idf(n_docs, len(ids))
+                    for doc_id in scores:
+                        i = bisect_left(ids, doc_id)
+                        if i < len(ids) and ids[i] == doc_id:
+                            matched[doc_id] = matched.get(doc_id, scores[doc_id]) + \
+                                self._bm25(idf, tfs[i], doc_id, avg_len)
+                scores = matched
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+            return [(score, *self.docs[doc_id]) for doc_id, score in best]
+
+    def _expand(self, token: str) -> list:
+        """Posting lists matching *token*; a single CJK character matches
+        every bigram that contains it."""
+        if len(token) == 1 and token >= "\u0080":
+            return [self._postings[t] for t in self._char_tokens.get(token, ())]
+        posting = self._postings.get(token)
+        return [posting] if posting is not None else []
+
+    def _id_range(self, date_from, date_to):
+        if not self._in_order:
+            return 0, len(self.docs)
+        lo = 0 if date_from is None else bisect_left(self._dates, date_from)
+        hi = len(self.docs) if date_to is None else bisect_right(self._dates, date_to)
+        return lo, hi
+
+    def _bm25(self, idf, tf, doc_id, avg_len):
+        norm = _K1 * (1 - _B + _B * self._lengths[doc_id] / avg_len)
+        return idf * tf * (_K1 + 1) / (tf + norm)
+
+    # -- persistence --------------------------------------------------------
+
+    def load(self) -> bool:
+        """Read the snapshot and replay the log; ``False`` if there is no usable snapshot."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+            if raw.get("version") != INDEX_VERSION:
+                return False
+        except (OSError, ValueError, AttributeError):
+            return False
+        with self._lock:
+            self.docs = [tuple(doc) for doc in raw["docs"]]
+            self._dates = [doc[0] for doc in self.docs]
+            self._keys = set(self.docs)
+            self._lengths = array("I", raw["lengths"])
+            self._total_length = sum(self._lengths)
+            self.digest = raw["digest"]
+            self._postings = {
+                token: (array("I", ids), array("H", tfs)) for token, (ids, tfs) in raw["postings"].items()
+            }
+            self._char_tokens = {}
+            for token in self._postings:
+                self._note_chars(token)
+            self._in_order = all(a <= b for a, b in zip(self._dates, self._dates[1:]))
+            self._log_lines = 0
+            try:
+                with open(self.log_path, "r", encoding="utf-8") as fh:
+                    for line in fh:
+                        try:
+                            rec = json.loads(line)
+                            self._add(rec["date"], rec["entry"])
+                        except (ValueError, KeyError, TypeError):
+                            continue  # torn final line
+                        self._log_lines += 1
+            except FileNotFoundError:
+                pass
+        return True
+
+    def flush(self, timeout=None) -> None:
+        """Wait until queued index writes are on disk."""
+        self._writer.submit(lambda: None).result(timeout)
+
+    def _persist(self, line, compact):
+        """Writer thread: append *line* to the log, or fold everything into a snapshot."""
+        try:
+            if compact:
+                with self._lock:
+                    snapshot = {
+                        "version": INDEX_VERSION,
+                        "docs": [list(doc) for doc in self.docs],
+                        "lengths": self._lengths.tolist(),
+                        "digest": self.digest,
+                        "postings": {t: [ids.tolist(), tfs.tolist()] for t, (ids, tfs) in self._postings.items()},
+                    }
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    json.dump(snapshot, fh, separators=(",", ":"), ensure_ascii=False)
+                _fsync_file(tmp_path)
+                os.replace(tmp_path, self.path)
+                if os.path.exists(self.log_path):
+                    os.remove(self.log_path)
+            elif line is not None:
+                with open(self.log_path, "a", encoding="utf-8") as fh:
+                    fh.write(line + "\n")
+        except OSError:
+            # The index is derived data: the next ensure_index() rebuilds it.
+            logging.error("Failed to persist journal search index", exc_info=True)
+
+
+def _indexable(journal):
+    """``(date, entry)`` of every answer the index holds (text answers), in date order."""
+    for date_str in sorted(journal):
+        day = journal[date_str]
+        if not hasattr(day, "get"):
+            continue
+        for entry in day.get("answers", ()):
+            if isinstance(entry.get("answer"), str):
+                yield date_str, entry
+
+
+_DIGEST_MASK = (1 << 64) - 1
+
+
+def _entry_hash(date_str, entry) -> int:
+    payload = json.dumps([date_str, entry.get("answered_at"), entry.get("question_id"), entry.get("answer")],
+                         ensure_ascii=False)
+    return int.from_bytes(hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def journal_digest(journal) -> int:
+    """The :attr:`SearchIndex.digest` a fresh index over *journal* would have."""
+    seen = set()
+    digest = 0
+    for date_str, entry in _indexable(journal):
+        key = (date_str, entry.get("answered_at"), entry.get("question_id"))
+        if key not in seen:
+            seen.add(key)
+            digest = (digest + _entry_hash(date_str, entry)) & _DIGEST_MASK
+    return digest
+
+
+def _doc_fields(entry: dict) -> dict:
+    return {k: entry.get(k) for k in ("question_id", "answered_at", "answer")}
+
+
+def _idf(n_docs, df):
+    return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+def _in_range(date_str, date_from, date_to):
+    return (date_from is None or date_str >= date_from) and (date_to is None or date_str <= date_to)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex:
+    """The process-wide index over the journal, loaded from disk on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex(JOURNAL_INDEX_FILE)
+            _index.load()
+        return _index
+
+
+def index_answer(date_str: str, entry: dict) -> None:
+    """Add one freshly saved answer to the index."""
+    get_index().add(date_str, entry)
+
+
+def ensure_index() -> None:
+    """Rebuild the index if it does not cover the journal (run off the Tk thread)."""
+    index = get_index()
+    journal = view_journal_data()
+    if journal_digest(journal) != index.digest:
+        logging.info("Journal search index is stale (%d answers indexed); rebuilding", len(index))
+        index.rebuild(journal)
+
+
+def search_journal(query: str, date_from: str = None, date_to: str = None, limit: int = 50) -> list:
+    """Ranked matches with their text: ``[{"date", "answered_at", "question_id", "answer", "score"}]``."""
+    hits = get_index().search(query, date_from, date_to, limit)
+    journal = view_journal_data()
+    results = []
+    for score, date_str, answered_at, question_id in hits:
+        day = journal.get(date_str)
+        answer = None
+        for entry in (day.get("answers", ()) if hasattr(day, "get") else ()):
+            if entry.get("question_id") == question_id and entry.get("answered_at") == answered_at:
+                answer = entry.get("answer", "")
+                break
+        if answer is None:
+            continue  # deleted since it was indexed; the next ensure_index() drops it
+        results.append({
+            "date": date_str, "answered_at": answered_at, "question_id": question_id,
+            "answer": answer, "score": round(score, 3),
+        })
+    return results
@@ -7,7 +7,24 @@ import pystray
 import logging
 from PIL import Image
 from monitor import Monitor
-from config_manager import load_config, save_config, load_health_data, check_today_record_status
+import obsidian_export
+from config_manager import (
+    load_config,
+    save_config,
+    configure_storage,
+    archive_journal_async,
+    ensure_latest_answers_index,
+    configure_backups,
+    configure_codecs,
+    configure_durability,
+    has_health_record,
+    check_today_record_status,
+    get_cache_stats,
+    flush_all,
+    set_persistence_error_handler,
+    list_backups,
+    restore_backup,
+)
 from utils import hide_console, is_autostart_enabled, set_autostart
 
 # Configure Logging
@@ -40,6 +57,11 @@ gui_queue = queue.Queue()  # 主线程 GUI 任务队列
 def on_quit(icon, item):
     global monitor_app
     logging.info("User quit.")
+    logging.info(f"Store cache stats: {get_cache_stats()}")
+    if not obsidian_export.flush(timeout=3):
+        logging.warning("Obsidian export did not finish within 3s of quitting.")
+    if not flush_all(timeout=5, sync=True):
+        logging.warning("Pending data writes did not finish within 5s of quitting.")
     icon.stop()
     if monitor_app:
         monitor_app.stop()
@@ -111,6 +133,13 @@ def select_reflection_music(icon, item):
 
 
 
+def open_search_window(icon, item):
+    """在主线程打开「搜索反思」窗口。"""
+    from view import show_search_window
+
+    gui_queue.put(show_search_window)
+
+
 def record_health_data_threaded(icon, item):
     """在主线程调度整合后的手动录入 GUI。"""
     from view import show_manual_record
@@ -123,6 +152,55 @@ def record_health_data_threaded(icon, item):
     )
 
 
+BACKUP_DATASETS = (("health", "健康数据"), ("journal", "反思日记"), ("config", "配置"))
+
+
+def restore_backup_threaded(name, label, backup):
+    """确认后在主线程回滚指定数据集到某个备份版本。"""
+
+    def do_restore():
+        from tkinter import messagebox
+
+        stamp = backup["created"].strftime("%Y-%m-%d %H:%M:%S")
+        if not messagebox.askyesno(
+            "恢复数据备份",
+            f"确定将{label}恢复到 {stamp} 的版本吗？\n当前数据会先保存为一个新的备份。",
+            parent=tk_root,
+        ):
+            return
+        try:
+            restore_backup(name, backup["path"])
+            logging.info("Restored %s from %s", name, backup["path"])
+        except Exception as exc:
+            logging.error("Failed to restore %s from %s: %s", name, backup["path"], exc)
+            messagebox.showerror("恢复数据备份", f"恢复失败：{exc}", parent=tk_root)
+
+    gui_queue.put(do_restore)
+
+
+def _backup_items(name, label):
+    items = []
+    for backup in list_backups(name):
+        text = f"{backup['created']:%Y-%m-%d %H:%M:%S}  ({backup['size'] // 1024 + 1} KB)"
+        items.append(
+            pystray.MenuItem(
+                text,
+                lambda icon, item, b=backup: restore_backup_threaded(name, label, b),
+            )
+        )
+    return tuple(items) or (pystray.MenuItem("（暂无备份）", lambda: None, enabled=False),)
+
+
+def build_backup_menu():
+    """每次展开时重新列出备份，避免菜单内容过期。"""
+    return pystray.Menu(
+        *(
+            pystray.MenuItem(label, pystray.Menu(lambda n=name, lbl=label: _backup_items(n, lbl)))
+            for name, label in BACKUP_DATASETS
+        )
+    )
+
+
 def toggle_autostart(icon, item):
     enable = not is_autostart_enabled()
     set_autostart(enable)
@@ -146,7 +224,11 @@ def get_status_text(item):
         "SNOOZE": "已推迟",
     }
     state_text = state_map.get(monitor_app.state, monitor_app.state)
-    mode_suffix = " [🌞晨间]" if monitor_app.mode_name == "morning_routine" else ""
+    mode_name = monitor_app.mode_name
+    if mode_name == "morning_routine":
+        mode_suffix = " [🌞晨间]"
+    else:
+        mode_suffix = "" if mode_name == "default" else f" [{mode_name}]"
     return f"状态: {state_text}{mode_suffix} | 剩余: {mins:02d}:{secs:02d} | 已完成: {monitor_app.completed_rounds} 轮"
 
 
@@ -160,6 +242,7 @@ def setup_tray():
             lambda item: "记录今日指标" + check_today_record_status(),
             record_health_data_threaded,
         ),
+        pystray.MenuItem("搜索反思", open_search_window),
         pystray.Menu.SEPARATOR,
         pystray.MenuItem("重置并开始工作", lambda icon, item: monitor_app.reset_work()),
         pystray.MenuItem("选择提醒音乐 (A)", select_music),
@@ -168,6 +251,7 @@ def setup_tray():
             lambda item: "禁用开机自启" if is_autostart_enabled() else "启用开机自启",
             toggle_autostart,
         ),
+        pystray.MenuItem("恢复数据备份", build_backup_menu()),
         pystray.MenuItem("退出", on_quit),
     )
     return pystray.Icon("HealthAssistant", image, "久坐助手", menu)
@@ -200,7 +284,19 @@ def main():
             os._exit(0)
 
     config = load_config()
-    
+    # 先应用所有写入策略（持久化 / 编码 / 备份），再启动任何会写文件的引擎迁移与后台任务
+    configure_durability(config)
+    configure_codecs(config)
+    configure_backups(config)
+    configure_storage(config)
+    archive_journal_async()
+    obsidian_export.configure_export(config)
+    obsidian_export.export_all_async()
+    # 全文索引 / 最新回答索引缺失或与日记不一致时在后台重建
+    from journal_search import ensure_index
+    threading.Thread(target=ensure_index, name="journal-index-check", daemon=True).start()
+    threading.Thread(target=ensure_latest_answers_index, name="latest-answers", daemon=True).start()
+
     # 确保 audio 配置结构存在
     if "audio" not in config:
         config["audio"] = {
@@ -272,6 +368,15 @@ def main():
     icon.run_detached()
     logging.info("Tray icon started (detached).")
 
+    def on_persistence_error(path, exc):
+        logging.error(f"Failed to save {path}: {exc}")
+        try:
+            icon.notify(f"{os.path.basename(path)} 保存失败，请检查磁盘空间或权限。", "数据保存失败")
+        except Exception:
+            logging.debug("Failed to show persistence error notification.", exc_info=True)
+
+    set_persistence_error_handler(on_persistence_error)
+
     # 托盘状态刷新线程
     def refresh_loop():
         while monitor_app.running:
@@ -288,7 +393,7 @@ def main():
     # 每日提醒通知
     from datetime import date
 
-    if str(date.today()) not in load_health_data():
+    if not has_health_record(str(date.today())):
         icon.notify("Master, 别忘了记录今天的体重和血压哦！", "每日健康提醒")
 
     # ===== 主线程：Tkinter 消息泵 =====
@@ -317,6 +422,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # 让其他模块的 `import main` 拿到本模块（同一个 gui_queue / tk_root），而不是重新导入一份
+    sys.modules.setdefault("main", sys.modules[__name__])
     hide_console()
     if not os.path.exists(ASSETS_DIR):
         logging.error("Assets not found. Run generate_assets.py first.")
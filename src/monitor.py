@@ -1,33 +1,33 @@
-import time
 import ctypes
+import functools
 import os
 import threading
 import logging
-from datetime import date, datetime, time as dt_time
+from datetime import datetime
+
+from activity import create_source
+from clock import SYSTEM_CLOCK
+from schedule import compile_schedule
 
 # Constants
 IDLE_PAUSE_THRESHOLD = 1200  # 20 minutes without input before pausing
-
-
-class LASTINPUTINFO(ctypes.Structure):
-    _fields_ = [
-        ("cbSize", ctypes.c_uint),
-        ("dwTime", ctypes.c_uint),
-    ]
-
-
-def get_idle_duration():
-    """Returns the time in seconds since the last user input (mouse/keyboard)."""
-    lastInputInfo = LASTINPUTINFO()
-    lastInputInfo.cbSize = ctypes.sizeof(lastInputInfo)
-    if ctypes.windll.user32.GetLastInputInfo(ctypes.byref(lastInputInfo)):
-        millis = ctypes.windll.kernel32.GetTickCount() - lastInputInfo.dwTime
-        return max(0, millis / 1000.0)
-    return 0
+ACTIVE_PROBE_INTERVAL = 15  # max seconds between lock/idle probes while the timer runs
+PAUSED_PROBE_MIN = 2  # first re-probe after pausing; doubles up to PAUSED_PROBE_MAX
+PAUSED_PROBE_MAX = 30
+PUSH_SAFETY_INTERVAL = 300  # push sources: re-probe at least this often in case an event was missed
+SUSPEND_THRESHOLD = 30  # a wait overshooting by more than this was a system suspend
+# Per-state reminder timeouts in seconds (config["reminder"]["timeouts"]; null disables):
+# "prompt" = unanswered reminder, "break" = counted from the end of the rest countdown
+DEFAULT_TIMEOUTS = {"prompt": 300, "break": 600}
+REFLECTION_GRACE = 60  # a BREAK timeout is extended while the user had input within this
+REMINDER_EVENTS = ("rest", "snooze", "close", "error")
 
 
 def _send_global_pause():
     """Sends a global media STOP command using virtual keys."""
+    if not hasattr(ctypes, "windll"):
+        logging.info("Global media STOP is only available on Windows; skipping.")
+        return
     logging.info("Sending global media STOP via keybd_event (0xB2)")
     # 0xB2 is VK_MEDIA_STOP.
     # Unlike PLAY_PAUSE (0xB3), STOP will not resume already paused media.
@@ -52,194 +52,330 @@ def resume_all_media():
 
 
 class Monitor:
+    """WORK -> PROMPT -> BREAK -> WORK 状态机，运行在后台线程。
+
+    关键字参数均为可注入依赖（默认即真实实现），供 ``simulation.py`` 以虚拟时钟驱动：
+
+    - clock: ``clock.Clock``，所有计时、等待与墙上时间的来源
+    - audio: 具有 ``play/stop/set_volume`` 的对象，默认 ``audio.AudioManager``
+    - activity: ``activity.ActivitySource``，默认按 ``config["activity"]["backend"]`` 创建；
+      推送型来源（``push=True``）的事件会立即唤醒调度线程
+    - show_reminder: 与 ``view.show_reminder_process`` 同签名的弹窗入口
+    - pick_question: 返回本次自省问题（或 ``None``）的可调用对象；缺省为持久化加权抽题器，
+      其状态文件取 ``question_state``，否则 ``config["questions"]["state_file"]``，再否则数据目录下的
+      ``question_state.json``（首次抽题时才解析）。注入 pick_question 时不读写抽题状态
+    - pause_media: 弹窗前暂停其他程序媒体播放的可调用对象
+    - on_transition: ``(when, event, state)`` 回调，每次状态变化时在持锁状态下调用，不得回调 Monitor
+    """
+
     def __init__(
         self,
         assets_dir,
         config,
         gui_queue=None,
+        *,
+        clock=None,
+        audio=None,
+        activity=None,
+        show_reminder=None,
+        pick_question=None,
+        question_state=None,
+        pause_media=None,
+        on_transition=None,
     ):
         self.assets_dir = assets_dir
         self.config = config
         self.running = True
         self.paused = False
         self.state = "WORK"  # WORK, PROMPT, BREAK, SNOOZE
-        
-        # 时间解耦：支持虚拟时间注入（用于测试）
+
+        self.clock = clock or SYSTEM_CLOCK
+        if activity is None:
+            activity = create_source(config.get("activity", {}).get("backend", "auto"))
+        self.activity = activity
+        self.show_reminder = show_reminder
+        self.question_state = question_state or config.get("questions", {}).get("state_file")
+        self._scheduled_questions = pick_question is None
+        self.pick_question = pick_question or self._pick_scheduled_question
+        self.pause_media = pause_media or pause_all_media
+        self.on_transition = on_transition
+
+        # 时间解耦：支持虚拟时间注入（用于测试）；未设置时取 clock.now()
         self.virtual_time = None
         self.mode_name = "default"
         self.work_duration_minutes = 25
         self.break_duration_seconds = 5 * 60
         self.snooze_duration_seconds = 5 * 60
+        self._mode_boundary = None  # 下一次模式切换的 clock.monotonic() 时刻，None 表示不再切换
         self._refresh_durations()
 
         self.completed_rounds = 0
         self.gui_queue = gui_queue  # 主线程 GUI 任务队列
 
         # Audio
-        from audio import AudioManager
-
         audio_cfg = config.get("audio", {})
         self.music_path = audio_cfg.get("reminder_rest_path")
         self.reflection_music_path = audio_cfg.get("reflection_path")
-        
-        # Determine initial music
-        if self.music_path and os.path.exists(self.music_path):
-            initial_music = self.music_path
-        else:
-            initial_music = os.path.join(assets_dir, "default_music.wav")
 
-        self.audio = AudioManager(initial_music)
-        self.audio.set_volume(audio_cfg.get("volume", 0.3))
-
-        # Config
-        self.work_time_remaining = self.work_duration_minutes * 60
-        self.last_sync_time = time.time()
+        if audio is None:
+            from audio import AudioManager
 
-        # 自省问答追踪：当天已展示过的问题 ID
-        self.shown_question_ids = []
+            # Determine initial music
+            if self.music_path and os.path.exists(self.music_path):
+                initial_music = self.music_path
+            else:
+                initial_music = os.path.join(assets_dir, "default_music.wav")
+            audio = AudioManager(initial_music)
+        self.audio = audio
+        self.audio.set_volume(audio_cfg.get("volume", 0.3))
 
+        # 截止时间调度：计时中 _deadline 为 time.monotonic() 时刻，暂停时为 None，
+        # 剩余秒数冻结在 _remaining；外部事件（贪睡/重置/停止）经 _wake 通知唤醒
         self.lock = threading.Lock()
+        self._cond = threading.Condition(self.lock)
+        self._deadline = None
+        self._remaining = 0.0
+        self._next_probe = 0.0
+        self._paused_probe = PAUSED_PROBE_MIN
+        # 弹窗编排：GUI 回调只投递 (事件, 会话号) 到 _events，由调度线程按状态迁移；
+        # 每次提醒一个会话号，迟到的旧窗口事件被忽略；_state_deadline 为 PROMPT/BREAK 的超时时刻
+        self._events = []
+        self._session = 0
+        self._session_break = 0
+        self._state_deadline = None
+        self.work_time_remaining = self.work_duration_minutes * 60
+        if self.activity.push:
+            self.activity.subscribe(self._on_activity_event)
+
+    @property
+    def work_time_remaining(self):
+        """距下次休息的秒数（计时中由截止时间推算）。"""
+        deadline = self._deadline
+        if deadline is None:
+            return self._remaining
+        return max(0.0, deadline - self.clock.monotonic())
+
+    @work_time_remaining.setter
+    def work_time_remaining(self, seconds):
+        # 调用方持有 self.lock 时应随后调用 _wake()，让调度线程重新计算截止时间
+        self._remaining = max(0.0, float(seconds))
+        self._deadline = None if self.paused else self.clock.monotonic() + self._remaining
+
+    def _wake(self):
+        """唤醒正在等待截止时间的调度线程（须持有 self.lock）。"""
+        self._cond.notify_all()
+
+    def _set_state(self, state, event):
+        """切换状态并上报迁移（须持有 self.lock）。"""
+        self.state = state
+        self._emit(event)
+
+    def _emit(self, event):
+        if self.on_transition:
+            self.on_transition(self.clock.now(), event, self.state)
+
+    def _on_activity_event(self, event):
+        """推送型活动来源的回调（来源线程）：立即重新探测。"""
+        with self.lock:
+            self._next_probe = 0.0
+            self._wake()
 
     def is_system_locked(self):
         """Checks if the workstation is locked (simplified heuristic)."""
-        try:
-            user32 = ctypes.windll.user32
-            hwnd = user32.GetForegroundWindow()
-            return hwnd == 0
-        except Exception:
-            return False
+        return self.activity.is_locked()
 
     def check_activity_status(self):
-        """Updates paused state based on lock status and idle time."""
+        """Updates paused state based on lock status and idle time, and schedules the next probe."""
         locked = self.is_system_locked()
-        idle_sec = get_idle_duration()
+        idle_sec = self.activity.idle_seconds()
 
         should_pause = locked or (idle_sec >= IDLE_PAUSE_THRESHOLD)
 
         with self.lock:
+            now = self.clock.monotonic()
             if should_pause and not self.paused:
                 reason = "Locked" if locked else f"Idle ({int(idle_sec)}s)"
                 logging.info(f"System {reason}. Pausing timer.")
+                self._remaining = self.work_time_remaining
+                self._deadline = None
                 self.paused = True
+                self._paused_probe = PAUSED_PROBE_MIN
+                self._emit("lock" if locked else "idle")
             elif not should_pause and self.paused:
                 logging.info("User active. Resuming.")
                 self.paused = False
+                self._deadline = now + self._remaining
+                self._emit("resume")
+
+            # 无输入时空闲时长线性增长，最早在阈值到达时才可能需要暂停
+            until_idle = max(1.0, IDLE_PAUSE_THRESHOLD - idle_sec)
+            if self.activity.push:
+                # 锁屏/解锁/恢复输入由事件送达，只需在空闲阈值处（及兜底间隔）探测
+                interval = PUSH_SAFETY_INTERVAL if self.paused else min(PUSH_SAFETY_INTERVAL, until_idle)
+            elif self.paused:
+                # 离开/锁屏期间计时冻结，探测间隔逐步拉长
+                interval = self._paused_probe
+                self._paused_probe = min(self._paused_probe * 2, PAUSED_PROBE_MAX)
+            else:
+                interval = min(ACTIVE_PROBE_INTERVAL, until_idle)
+            self._next_probe = now + interval
 
     def run(self):
-        """Main loop. Runs in a background thread."""
+        """Main loop. Runs in a background thread.
+
+        Sleeps until the earliest of: break due, next activity probe, the next
+        profile boundary of the schedule, the PROMPT/BREAK timeout, or an
+        external event (reminder callbacks / reset / stop) signalled through
+        ``_wake``.  Never blocks on the reminder window, so probing and
+        profile changes continue while it is open.
+        """
         logging.info("Monitor thread started.")
         while True:
             with self.lock:
                 if not self.running:
                     break
+                events, self._events = self._events, []
+                probe_due = self.clock.monotonic() >= self._next_probe
 
-            self.check_activity_status()
-
-            with self.lock:
-                paused = self.paused
+            for event, session in events:
+                self._handle_event(event, session)
 
-            if paused:
-                time.sleep(1)
-                with self.lock:
-                    self.last_sync_time = time.time()
-                continue
+            if probe_due:
+                self.check_activity_status()
 
             with self.lock:
-                state = self.state
-                if state == "WORK":
-                    now = time.time()
-                    elapsed = now - self.last_sync_time
-                    self.last_sync_time = now
-                    remaining = self.work_time_remaining
-                else:
-                    remaining = None
-
-            if remaining is not None:
-                if remaining > 0:
-                    with self.lock:
-                        self.work_time_remaining -= elapsed
-                        if self.work_time_remaining < 0:
-                            self.work_time_remaining = 0
-                    time.sleep(1)
-                else:
-                    self.trigger_break()
-
-    def _get_effective_time(self):
-        """获取当前生效的时间（支持虚拟模拟）。"""
+                if not self.running:
+                    break
+                now = self.clock.monotonic()
+                if self._mode_boundary is not None and now >= self._mode_boundary:
+                    self._enter_mode()
+                break_due = (
+                    self.state == "WORK" and self._deadline is not None and now >= self._deadline
+                )
+                timeout_due = self._state_deadline is not None and now >= self._state_deadline
+                if not (break_due or timeout_due or self._events):
+                    wake_at = self._next_probe
+                    if self.state == "WORK" and self._deadline is not None:
+                        wake_at = min(wake_at, self._deadline)
+                    if self._mode_boundary is not None:
+                        wake_at = min(wake_at, self._mode_boundary)
+                    if self._state_deadline is not None:
+                        wake_at = min(wake_at, self._state_deadline)
+                    self._sleep_until(wake_at)
+                    continue
+
+            if break_due:
+                self.trigger_break()
+            elif timeout_due:
+                self._on_state_timeout()
+
+    def _sleep_until(self, wake_at):
+        """Waits on the condition until *wake_at* (monotonic), compensating for suspend.
+
+        Must hold ``self.lock``.  On Windows ``time.monotonic()`` keeps counting
+        through sleep/hibernate, so a wait that overshoots by more than
+        ``SUSPEND_THRESHOLD`` is treated as a suspend and the deadline is moved
+        forward by the missing time instead of firing a break on wake-up.
+        """
+        clock = self.clock
+        timeout = max(0.0, wake_at - clock.monotonic())
+        start, wall_start = clock.monotonic(), clock.time()
+        clock.wait(self._cond, timeout)
+        overshoot = clock.monotonic() - start - timeout
+        wall_overshoot = clock.time() - wall_start - timeout
+        if overshoot > SUSPEND_THRESHOLD:
+            logging.info(f"Resumed from suspend ({int(overshoot)}s). Not counting it as work time.")
+            if self._deadline is not None:
+                self._deadline += overshoot
+            self._next_probe = 0.0
+            self._mode_boundary = 0.0  # 模式边界按墙上时间换算，醒来后重新查表
+            self._emit("suspend")
+        elif wall_overshoot > SUSPEND_THRESHOLD:
+            # 墙上时钟跳变（休眠时单调时钟不走的平台、或手动改时间）：计时基于单调时钟，仅立即重新探测
+            logging.info(f"Wall clock jumped {int(wall_overshoot)}s. Re-probing activity.")
+            self._next_probe = 0.0
+            self._mode_boundary = 0.0
+
+    def _pick_scheduled_question(self):
+        from questions import get_scheduler
+        # 持久化加权抽题：当天已展示过的问题不重复，跨天/重启后状态保留
+        return get_scheduler(self.question_state).pick()
+
+    def _get_effective_now(self):
+        """获取当前生效的时刻（支持虚拟模拟：virtual_time 为当天的时间点）。"""
+        now = self.clock.now()
         if self.virtual_time:
-            return self.virtual_time
-        return datetime.now().time()
+            return datetime.combine(now.date(), self.virtual_time)
+        return now
 
     def _refresh_durations(self):
-        """核心巡检逻辑：根据当前时间（或模拟时间）更新 Profile。"""
-        now_time = self._get_effective_time()
-        pomodoro_cfg = self.config.get("pomodoro", {})
-        
-        # 默认值
-        default_cfg = pomodoro_cfg.get("default", {"work_duration": 25, "rest_duration": 5})
-        selected_mode = "default"
-        work_min = default_cfg.get("work_duration", 25)
-        rest_min = default_cfg.get("rest_duration", 5)
-
-        # 检查晨间模式
-        morning_cfg = pomodoro_cfg.get("morning_routine", {})
-        if morning_cfg.get("enabled", False):
-            try:
-                sh, sm = map(int, morning_cfg['start_time'].split(':'))
-                eh, em = map(int, morning_cfg['end_time'].split(':'))
-                if dt_time(sh, sm) <= now_time < dt_time(eh, em):
-                    selected_mode = "morning_routine"
-                    work_min = morning_cfg["work_duration"]
-                    rest_min = morning_cfg["rest_duration"]
-            except Exception as e:
-                logging.error(f"Error parsing profile time: {e}")
+        """核心巡检逻辑：按编译后的日程表查出当前 Profile，并记下下一个模式边界。
+
+        日程表按 ``config["pomodoro"]`` 对象缓存（见 ``schedule.compile_schedule``），原地修改后需调用 ``invalidate_schedule()``；
+        查表为 bisect，边界换算为单调时钟时刻供 run() 精确唤醒。
+        """
+        now = self._get_effective_now()
+        profile, boundary = compile_schedule(self.config.get("pomodoro", {})).lookup(now)
 
-        self.mode_name = selected_mode
-        self.work_duration_minutes = work_min
-        self.break_duration_seconds = rest_min * 60
+        self.mode_name = profile.name
+        self.work_duration_minutes = profile.work_duration
+        self.break_duration_seconds = profile.rest_duration * 60
         # snooze 暂时维持 5 分钟默认，或可后续加入配置
         self.snooze_duration_seconds = 5 * 60
+        if boundary is None:
+            self._mode_boundary = None
+        else:
+            self._mode_boundary = self.clock.monotonic() + max(0.0, (boundary - now).total_seconds())
+
+    def _enter_mode(self):
+        """到达模式边界（须持有 self.lock）：切换 Profile，工作倒计时不超过新模式的工作时长。"""
+        previous = self.mode_name
+        self._refresh_durations()
+        if self.mode_name == previous:
+            return
+        logging.info(f"Schedule: {previous} -> {self.mode_name}.")
+        if self.state == "WORK":
+            self.work_time_remaining = min(self.work_time_remaining, self.work_duration_minutes * 60)
+        self._emit("mode")
 
     def trigger_break(self):
-        """Transition from WORK to PROMPT state, show reminder window, and wait for user response."""
+        """Transition from WORK to PROMPT state and queue the reminder window (returns immediately)."""
         with self.lock:
             self._refresh_durations()  # 准备进入休息前刷新一次，确保时长准确
-            self.state = "PROMPT"
+            self._session += 1
+            session = self._session
+            self._session_break = self.break_duration_seconds
+            self._set_state("PROMPT", "prompt")
+            self._state_deadline = self._timeout_at("prompt")
             captured_mode_name = self.mode_name
             captured_break_duration = self.break_duration_seconds
 
         logging.info(f"Triggering break (Mode: {captured_mode_name})...")
-        pause_all_media()
+        self.pause_media()
         self.audio.play(self.music_path)
 
         # 挑选一个自省问题
         current_question = None
         try:
-            from questions import pick_random_question
-            with self.lock:
-                current_question = pick_random_question(exclude_ids=self.shown_question_ids)
-                if current_question:
-                    self.shown_question_ids.append(current_question["id"])
+            current_question = self.pick_question()
             if current_question:
                 logging.info(f"Selected reflection question: {current_question['id']}")
         except Exception as e:
             logging.error(f"Error picking question: {e}", exc_info=True)
 
-        # 用 Event 等待主线程弹窗关闭
-        done_event = threading.Event()
-
         def show_window():
             """此函数由主线程通过 gui_queue 调用，在主线程安全地创建 Tkinter 窗口。"""
-            from view import show_reminder_process
+            show_reminder_process = self.show_reminder
+            if show_reminder_process is None:
+                from view import show_reminder_process
 
             try:
-                # 再次检查状态，如果在等待期间被重置了就直接返回
+                # 再次检查状态，如果在排队期间被重置或已进入下一次提醒就直接返回
                 with self.lock:
-                    if self.state not in ["PROMPT", "BREAK"]:
+                    if self.state not in ["PROMPT", "BREAK"] or self._session != session:
                         logging.info(
                             "State changed before window could be shown, aborting show."
                         )
-                        done_event.set()
                         return
 
                 msg = (
@@ -248,85 +384,133 @@ class Monitor:
                     else f"请起身活动 {captured_break_duration // 60} 分钟！"
                 )
 
-                def on_close_callback():
-                    # 只有从弹窗真正关闭时，才唤醒挂起的Monitor后台线程
-                    done_event.set()
-
+                # 回调均只投递事件，由 Monitor 线程完成状态迁移
                 show_reminder_process(
                     message=msg,
                     duration=captured_break_duration,
-                    on_rest=self.on_user_start_rest,
-                    on_snooze=self.on_user_snooze,
-                    on_close=on_close_callback,
+                    on_rest=functools.partial(self._post, "rest", session),
+                    on_snooze=functools.partial(self._post, "snooze", session),
+                    on_close=functools.partial(self._post, "close", session),
                     question=current_question,
                     on_answer=self._save_journal_answer,
                     on_reflection_start=self.on_user_start_reflection, # 新增
                     mode_name=captured_mode_name,
+                    clock=self.clock,
                 )
             except Exception as e:
                 logging.error(f"GUI Error in show_window: {e}", exc_info=True)
-                self.audio.stop()
-                self.reset_work()
-                done_event.set()
+                self._post("error", session)
 
         if self.gui_queue:
             self.gui_queue.put(show_window)
-            logging.info("Reminder window task queued. Waiting for user response...")
-            if not done_event.wait(timeout=300):
-                logging.critical("Reminder window did not close within 300s. Force-resetting state machine.")
-                self.audio.stop()
-                self.reset_work()
-                return
+            logging.info("Reminder window task queued.")
         else:
-            # 降级：没有 gui_queue 时直接调用（不推荐，调试用）
+            # 降级：没有 gui_queue 时直接调用（调试与模拟用）
             show_window()
-            if not done_event.wait(timeout=300):
-                logging.critical("Reminder window did not close within 300s. Force-resetting state machine.")
-                self.audio.stop()
-                self.reset_work()
-                return
 
-        # 弹窗关闭后处理状态
+    def _timeout_at(self, state, after=0):
+        """*state*（"prompt"/"break"）的超时时刻（单调时钟），配置为 null 时返回 None（须持有 self.lock）。"""
+        timeouts = self.config.get("reminder", {}).get("timeouts", {})
+        timeout = timeouts.get(state, DEFAULT_TIMEOUTS[state])
+        if timeout is None:
+            return None
+        return self.clock.monotonic() + after + timeout
+
+    def _post(self, event, session=None):
+        """GUI 线程投递弹窗事件并唤醒调度线程；session 缺省为当前提醒。"""
+        if event not in REMINDER_EVENTS:
+            raise ValueError(f"Unknown reminder event {event!r}; expected one of {REMINDER_EVENTS}")
+        with self.lock:
+            self._events.append((event, self._session if session is None else session))
+            self._wake()
+
+    def _handle_event(self, event, session):
+        """在调度线程中按当前状态处理一个弹窗事件。"""
         with self.lock:
-            should_reset = self.state in ["PROMPT", "BREAK"]
+            if session != self._session:
+                logging.info(f"Ignoring {event!r} from a previous reminder.")
+                return
+            state = self.state
+            if event == "rest" and state == "PROMPT":
+                logging.info("User started rest. Stopping music.")
+                self.audio.stop()
+                self._set_state("BREAK", "rest")
+                self._state_deadline = self._timeout_at("break", after=self._session_break)
+                return
+            if event == "snooze" and state in ["PROMPT", "BREAK"]:
+                logging.info("User snoozed.")
+                self.audio.stop()
+                self._state_deadline = None
+                self._set_state("WORK", "snooze")
+                self.work_time_remaining = self.snooze_duration_seconds
+                return
+            should_reset = event in ("close", "error") and state in ["PROMPT", "BREAK"]
             if should_reset:
-                logging.info(f"Window closed in state {self.state}. Resetting to Work.")
+                logging.info(f"Window closed in state {state}. Resetting to Work.")
         if should_reset:
             self.reset_work()
 
+    def _on_state_timeout(self):
+        """PROMPT/BREAK 超时：BREAK 期间用户仍在输入（正在写反思）则顺延，否则强制回到工作。"""
+        idle_sec = self.activity.idle_seconds() if self.state == "BREAK" else None
+        with self.lock:
+            if self._state_deadline is None or self.state not in ["PROMPT", "BREAK"]:
+                return
+            if idle_sec is not None and idle_sec < REFLECTION_GRACE:
+                self._state_deadline = self.clock.monotonic() + REFLECTION_GRACE
+                return
+            logging.warning(f"Reminder timed out in state {self.state}. Resetting to Work.")
+            self._state_deadline = None
+            self._emit("timeout")
+        self.reset_work()
+
     def _save_journal_answer(self, question_id, answer_text):
         """保存自省问答回答到 journal_data.json。"""
         try:
-            from config_manager import load_journal_data, save_journal_data
+            from config_manager import append_journal_answer
             from questions import get_question_by_id
-            import time as _time
-
-            today_str = str(date.today())
-            data = load_journal_data()
-
-            if today_str not in data:
-                data[today_str] = {"answers": [], "created_at": _time.strftime("%H:%M:%S")}
 
             q = get_question_by_id(question_id)
+            now = self.clock.now()
             entry = {
                 "question_id": question_id,
                 "question_en": q["en"] if q else "",
                 "question_zh": q["zh"] if q else "",
                 "answer": answer_text,
-                "answered_at": _time.strftime("%H:%M:%S"),
+                "answered_at": now.strftime("%H:%M:%S"),
             }
-            data[today_str]["answers"].append(entry)
-            save_journal_data(data)
+            today = now.date().isoformat()
+            # 仅追加到今天所在的分片/日志段，不再整份加载后重写
+            append_journal_answer(entry, today, created_at=entry["answered_at"])
             logging.info(f"Journal answer saved: {question_id} at {entry['answered_at']}")
         except Exception as e:
             logging.error(f"Failed to save journal answer: {e}", exc_info=True)
+            return
+
+        if self._scheduled_questions:
+            try:
+                from questions import get_scheduler
+                get_scheduler(self.question_state).mark_answered(question_id, now)
+            except Exception as e:
+                logging.error(f"Failed to update question schedule: {e}", exc_info=True)
+
+        # 全文索引增量更新；失败不影响已保存的回答，下次启动会重建
+        try:
+            from journal_search import index_answer
+            index_answer(today, entry)
+        except Exception as e:
+            logging.error(f"Failed to index journal answer: {e}", exc_info=True)
+
+        # Obsidian 导出（未配置 vault 时为空操作），在后台线程执行
+        try:
+            from obsidian_export import schedule_export
+            schedule_export(today)
+        except Exception as e:
+            logging.error(f"Failed to schedule Obsidian export: {e}", exc_info=True)
 
     def on_user_start_rest(self):
-        """Called when user clicks 'Start Rest' in the reminder window."""
-        logging.info("User started rest. Stopping music.")
-        with self.lock:
-            self.audio.stop()
-            self.state = "BREAK"
+        """Called when user clicks 'Start Rest' in the reminder window (queued for the monitor thread)."""
+        self._post("rest")
 
     def on_user_start_reflection(self):
         """Called when user starts typing a reflection answer. Switches to reflection music."""
@@ -335,13 +519,8 @@ class Monitor:
             self.audio.play(self.reflection_music_path)
 
     def on_user_snooze(self):
-        """Called when user clicks 'Snooze' in the reminder window. Resets timer and returns to WORK."""
-        with self.lock:
-            logging.info("User snoozed.")
-            self.audio.stop()
-            self.work_time_remaining = self.snooze_duration_seconds
-            self.last_sync_time = time.time()
-            self.state = "WORK"
+        """Called when user clicks 'Snooze' in the reminder window (queued for the monitor thread)."""
+        self._post("snooze")
 
     def reset_work(self):
         """Reset the state machine back to WORK, incrementing round counter if coming from BREAK."""
@@ -353,10 +532,14 @@ class Monitor:
             if self.state == "BREAK":
                 self.completed_rounds += 1
 
-            self.state = "WORK"
-            self._refresh_durations()  # 返回工作前巡检，可能已跨过模式边界时间
+            self._state_deadline = None
+            previous_mode = self.mode_name
+            self._refresh_durations()  # 返回工作前巡检，休息期间可能已跨过模式边界时间
+            if self.mode_name != previous_mode:
+                self._emit("mode")
+            self._set_state("WORK", "work")
             self.work_time_remaining = self.work_duration_minutes * 60
-            self.last_sync_time = time.time()
+            self._wake()
 
         if self.gui_queue:
 
@@ -388,7 +571,9 @@ class Monitor:
         """Signal the monitor thread to stop and clean up audio."""
         with self.lock:
             self.running = False
+            self._wake()
         self.audio.stop()
+        self.activity.close()
 
     def get_status(self):
         """Thread-safe accessor for status fields read by the tray refresh loop.
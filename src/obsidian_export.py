@@ -0,0 +1,309 @@
+"""Incremental Markdown export of journal and health data into an Obsidian vault.
+
+Each day with data becomes ``<vault>/<folder>/<YYYY>/<YYYY-MM-DD>.md``.
+A watermark file (:data:`EXPORT_STATE_FILE`) remembers a digest of every
+exported day's source data, so a run only renders and writes the days
+whose journal answers or health records changed (or whose note is
+missing); a full run also removes notes of days that no longer have data.
+``--full`` ignores the watermark, rewrites every note and deletes stale
+``YYYY/YYYY-MM-DD.md`` notes this exporter wrote earlier, recognised by
+the ``tags: [work-health]`` frontmatter (days deleted from the journal
+while the watermark was lost, say).  Notes without that marker are the
+user's own and are never touched, even when the export folder is shared
+with the vault's daily notes.
+
+Configured by ``config["obsidian"]`` (``vault``: directory or ``null`` to
+disable, ``folder``: sub-folder inside the vault).  After each save the
+app calls :func:`schedule_export` for the affected day; the export runs
+on a single background thread and coalesces bursts of saves.  Backfill
+or re-export from the command line::
+
+    python src/obsidian_export.py --vault ~/Notes [--folder "Work Health"] [--full]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+from config_manager import BASE_DIR, BackupPolicy, JsonStore, thaw, view_health_data, view_journal_data
+
+EXPORT_STATE_FILE = os.path.join(BASE_DIR, "obsidian_export.json")
+DEFAULT_FOLDER = "Work Health"
+FORMAT_VERSION = 1
+"""Bump when :func:`render_day` output changes so every note is rewritten."""
+NOTE_MARKER = "tags: [work-health]"
+"""Frontmatter line identifying notes written by this exporter."""
+
+_HEALTH_COLUMNS = (
+    ("weight", "体重 (kg)"),
+    ("bp_high", "收缩压"),
+    ("bp_low", "舒张压"),
+    ("heart_rate", "心率"),
+)
+
+
+def render_day(date_str: str, journal_day, health_records) -> str:
+    """Markdown note for one day (either part may be ``None``)."""
+    lines = [
+        "---",
+        f"date: {date_str}",
+        NOTE_MARKER,
+        "---",
+        "",
+        f"# {date_str}",
+    ]
+    if health_records:
+        lines += [
+            "",
+            "## 健康指标",
+            "",
+            "| 时间 | " + " | ".join(label for _, label in _HEALTH_COLUMNS) + " |",
+            "|---" * (len(_HEALTH_COLUMNS) + 1) + "|",
+        ]
+        for record in health_records:
+            cells = [record.get("time") or "—"] + [_cell(record.get(key)) for key, _ in _HEALTH_COLUMNS]
+            lines.append("| " + " | ".join(cells) + " |")
+    answers = journal_day.get("answers", ()) if hasattr(journal_day, "get") else ()
+    if answers:
+        lines += ["", "## 自省"]
+        for entry in answers:
+            question = entry.get("question_zh") or entry.get("question_id") or ""
+            lines += ["", f"### {entry.get('answered_at') or ''} · {question}".rstrip(" ·")]
+            if entry.get("question_en"):
+                lines.append(f"> {entry['question_en']}")
+            lines += ["", str(entry.get("answer", "")).strip()]
+    return "\n".join(lines) + "\n"
+
+
+def day_digest(journal_day, health_records) -> str:
+    """Digest of one day's source data (the watermark compared between runs)."""
+    payload = json.dumps(
+        [FORMAT_VERSION, thaw(journal_day), thaw(health_records)],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class VaultExporter:
+    """Writes day notes under *vault*/*folder*, skipping days whose digest
+    matches the watermark in *state_store*."""
+
+    def __init__(self, vault: str, folder: str = DEFAULT_FOLDER, state_store: JsonStore = None):
+        self.target = os.path.abspath(os.path.join(os.path.expanduser(vault), folder))
+        self.state_store = state_store or JsonStore(
+            EXPORT_STATE_FILE, lambda: {"target": None, "days": {}},
+            codec="json-compact", backup_policy=BackupPolicy(max_count=1),
+        )
+        self._lock = threading.Lock()
+
+    def note_path(self, date_str: str) -> str:
+        return os.path.join(self.target, date_str[:4], date_str + ".md")
+
+    def export(self, dates=None, progress=None, rewrite=False) -> dict:
+        """Export *dates* (default: every day, removing notes of days without
+        data).  *progress(done, total)* is called every 100 days.  With
+        *rewrite* every note is written regardless of the watermark and a
+        full run sweeps stale notes this exporter wrote (see :func:`_is_exported_note`).
+
+        Returns ``{"written", "unchanged", "removed"}`` counts.
+        """
+        with self._lock:
+            journal = view_journal_data()
+            health = view_health_data()
+            state = self.state_store.load()
+            retarget = state.get("target") != self.target
+            if retarget:
+                state = {"target": self.target, "days": {}}
+            days = state["days"]
+            full = dates is None
+            if full:
+                wanted = sorted(set(journal) | set(health))
+            else:
+                wanted = sorted(set(dates))
+            stats = {"written": 0, "unchanged": 0, "removed": 0}
+
+            for done, date_str in enumerate(wanted, 1):
+                journal_day, health_records = journal.get(date_str), health.get(date_str)
+                if not _has_content(journal_day, health_records):
+                    if self._remove(date_str, days):
+                        stats["removed"] += 1
+                else:
+                    digest = day_digest(journal_day, health_records)
+                    path = self.note_path(date_str)
+                    if not rewrite and days.get(date_str) == digest and os.path.exists(path):
+                        stats["unchanged"] += 1
+                    else:
+                        _write_text(path, render_day(date_str, journal_day, health_records))
+                        days[date_str] = digest
+                        stats["written"] += 1
+                if progress is not None and (done % 100 == 0 or done == len(wanted)):
+                    progress(done, len(wanted))
+
+            if full:
+                present = set(wanted)
+                for date_str in [d for d in days if d not in present]:
+                    if self._remove(date_str, days):
+                        stats["removed"] += 1
+                if rewrite:
+                    stats["removed"] += self._sweep(days)
+            if stats["written"] or stats["removed"] or retarget:
+                self.state_store.save(state)
+        logging.info("Obsidian export to %s: %s", self.target, stats)
+        return stats
+
+    def _sweep(self, keep) -> int:
+        """Delete exported ``YYYY/YYYY-MM-DD.md`` notes under the target whose day is not in *keep*."""
+        removed = 0
+        try:
+            years = os.listdir(self.target)
+        except OSError:
+            return 0
+        for year in years:
+            directory = os.path.join(self.target, year)
+            if not (len(year) == 4 and year.isdigit() and os.path.isdir(directory)):
+                continue
+            for name in os.listdir(directory):
+                date_str, ext = os.path.splitext(name)
+                path = os.path.join(directory, name)
+                if (ext == ".md" and len(date_str) == 10 and date_str.startswith(year + "-")
+                        and date_str not in keep and _is_exported_note(path)):
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    def _remove(self, date_str, days) -> bool:
+        if days.pop(date_str, None) is None:
+            return False
+        try:
+            os.remove(self.note_path(date_str))
+        except FileNotFoundError:
+            pass
+        return True
+
+
+def _has_content(journal_day, health_records) -> bool:
+    answers = journal_day.get("answers") if hasattr(journal_day, "get") else None
+    return bool(answers) or bool(health_records)
+
+
+def _is_exported_note(path: str) -> bool:
+    """``True`` if *path*'s frontmatter carries :data:`NOTE_MARKER`."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            if fh.readline().rstrip("\r\n") != "---":
+                return False
+            for _ in range(20):
+                line = fh.readline().rstrip("\r\n")
+                if line == NOTE_MARKER:
+                    return True
+                if not line or line == "---":
+                    return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    return False
+
+
+def _cell(value) -> str:
+    if value is None or value == "":
+        return "—"
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def _write_text(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as fh:
+        fh.write(text)
+    os.replace(tmp_path, path)
+
+
+_exporter = None
+_pending: set = set()
+_pending_lock = threading.Lock()
+_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="obsidian-export")
+
+
+def configure_export(config: dict):
+    """Apply ``config["obsidian"]``; returns the exporter or ``None`` if disabled."""
+    global _exporter
+    cfg = config.get("obsidian") or {}
+    vault = cfg.get("vault")
+    _exporter = VaultExporter(vault, cfg.get("folder") or DEFAULT_FOLDER) if vault else None
+    return _exporter
+
+
+def export_all_async() -> None:
+    """Catch up every changed day in the background (e.g. on start-up)."""
+    if _exporter is not None:
+        _worker.submit(_run, None)
+
+
+def schedule_export(date_str: str) -> None:
+    """Queue *date_str* for export after a save; bursts share one run."""
+    if _exporter is None:
+        return
+    with _pending_lock:
+        first = not _pending
+        _pending.add(date_str)
+    if first:
+        _worker.submit(_drain)
+
+
+def flush(timeout=None) -> bool:
+    """Wait for queued exports and the watermark write; ``False`` on timeout."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        _worker.submit(lambda: None).result(timeout)
+    except FuturesTimeoutError:
+        return False
+    if _exporter is None:
+        return True
+    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+    return _exporter.state_store.flush(remaining)
+
+
+def _drain():
+    with _pending_lock:
+        dates = set(_pending)
+        _pending.clear()
+    _run(dates)
+
+
+def _run(dates):
+    exporter = _exporter
+    if exporter is None:
+        return
+    try:
+        exporter.export(dates)
+    except Exception:
+        logging.error("Obsidian export failed", exc_info=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from config_manager import configure_storage, flush_all, load_config
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    config = load_config()
+    cfg = config.get("obsidian") or {}
+    parser = argparse.ArgumentParser(description="Export journal and health data as Markdown day notes")
+    parser.add_argument("--vault", default=cfg.get("vault"), required=not cfg.get("vault"))
+    parser.add_argument("--folder", default=cfg.get("folder") or DEFAULT_FOLDER)
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the watermark, rewrite every note and remove stale notes this exporter wrote")
+    args = parser.parse_args()
+
+    configure_storage(config)
+    exporter = VaultExporter(args.vault, args.folder)
+    exporter.export(progress=lambda done, total: print(f"\r{done}/{total}", end="", flush=True), rewrite=args.full)
+    print()
+    exporter.state_store.flush()
+    flush_all(timeout=10)
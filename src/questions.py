@@ -5,385 +5,218 @@
   - 早晨：心理挖掘 (Psychological Excavation)
   - 全天：打断自动驾驶 (Interrupting Autopilot)
   - 晚间：综合洞察 (Synthesizing Insight)
+
+题库存放在 ``assets/questions/*.json``：``default.json`` 为内置题库，
+同目录下的其他 JSON 文件为用户题包，按文件名顺序在其后加载（同 ID 覆盖
+内置问题）。每个文件的结构::
+
+    {"name": "...", "morning": [...], "daytime": [...], "evening": [...],
+     "synthesis": [...], "quotes": [{"zh": "...", "source": "..."}]}
+
+首次使用时编译为 id → 记录的索引和阶段 → ID 元组；文件在磁盘上变化后
+（最多每 ``RELOAD_CHECK_INTERVAL`` 秒检查一次 mtime）自动重新编译，
+无需重启托盘程序。
 """
 
+import json
+import os
 import random
 import logging
+import threading
+import time
 from datetime import datetime
 
+QUESTION_BANK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "questions")
+DEFAULT_BANK = "default.json"
+PHASES = ("morning", "daytime", "evening")
+RELOAD_CHECK_INTERVAL = 2.0  # 秒
+
 
 # ============================================================
-# 早晨 — 心理挖掘 (Morning — Psychological Excavation)
+# 题库记录 (Records)
 # ============================================================
 
-MORNING_QUESTIONS = [
-    # --- 觉察痛苦 (Awareness of Pain) ---
-    {
-        "id": "m1",
-        "section": "觉察痛苦",
-        "en": "What is the dull and persistent dissatisfaction you've learned to live with? "
-              "Not the deep suffering — but what you've learned to tolerate.",
-        "zh": "你已经习以为常的、那种钝痛般的持久不满是什么？"
-              "不是深层痛苦，而是你学会了忍受的东西。",
-    },
-    {
-        "id": "m2",
-        "section": "觉察痛苦",
-        "en": "What do you complain about repeatedly but never actually change? "
-              "Write down the three complaints you've voiced most often in the past year.",
-        "zh": "你反复抱怨却从未真正改变的事情是什么？"
-              "写下过去一年你最常发出的三个抱怨。",
-    },
-    {
-        "id": "m3",
-        "section": "觉察痛苦",
-        "en": "For each complaint: What would someone who watched your behavior "
-              "(not your words) conclude that you actually want?",
-        "zh": "针对每个抱怨：如果有人只观察你的行为（而非听你的话），"
-              "他会得出结论说你实际上想要什么？",
-    },
-    {
-        "id": "m4",
-        "section": "觉察痛苦",
-        "en": "What truth about your current life would be unbearable to admit "
-              "to someone you deeply respect?",
-        "zh": "关于你目前生活的哪个真相，如果要向你深深尊敬的人承认，"
-              "会令你难以承受？",
-    },
-    # --- 反愿景 (Anti-Vision) ---
-    {
-        "id": "m5",
-        "section": "反愿景",
-        "en": "If absolutely nothing changes for the next five years, describe an average Tuesday. "
-              "Where do you wake up? What does your body feel like? What's the first thing you think about? "
-              "Who's around you? What do you do between 9am and 6pm? How do you feel at 10pm?",
-        "zh": "如果未来五年一切都不改变，描述一个普通的周二。"
-              "你在哪醒来？身体感觉如何？脑中浮现的第一个念头是什么？"
-              "身边有谁？9 点到 18 点你在做什么？晚上 10 点你的感受是？",
-    },
-    {
-        "id": "m6",
-        "section": "反愿景",
-        "en": "Now do it but for ten years. What have you missed? What opportunities closed? "
-              "Who gave up on you? What do people say about you when you're not in the room?",
-        "zh": "现在把时间拉到十年后。你错过了什么？哪些机会已经关闭？"
-              "谁放弃了你？当你不在场时，人们怎么评价你？",
-    },
-    {
-        "id": "m7",
-        "section": "反愿景",
-        "en": "You're at the end of your life. You lived the safe version. You never broke the pattern. "
-              "What was the cost? What did you never let yourself feel, try, or become?",
-        "zh": "你走到了生命的尽头。你过了安全版本的人生，从未打破固有模式。"
-              "代价是什么？你从未允许自己去感受、尝试或成为什么？",
-    },
-    {
-        "id": "m8",
-        "section": "反愿景",
-        "en": "Who in your life is already living the future you just described? "
-              "Someone five, ten, twenty years ahead on the same trajectory? "
-              "What do you feel when you think about becoming them?",
-        "zh": "你身边有谁已经活在你刚才描述的未来里？"
-              "比你早五年、十年、二十年走在同一条轨迹上的人？"
-              "当你想到自己可能变成他们时，你有什么感受？",
-    },
-    {
-        "id": "m9",
-        "section": "反愿景",
-        "en": "What identity would you have to give up to actually change? "
-              "('I am the type of person who...') "
-              "What would it cost you socially to no longer be that person?",
-        "zh": "要真正改变，你必须放弃什么身份认同？"
-              "（'我是那种……的人'）"
-              "不再做那样的人，在社交上需要付出什么代价？",
-    },
-    {
-        "id": "m10",
-        "section": "反愿景",
-        "en": "What is the most embarrassing reason you haven't changed? "
-              "The one that makes you sound weak, scared, or lazy rather than reasonable.",
-        "zh": "你没有改变的最令人难堪的原因是什么？"
-              "那个让你听起来软弱、害怕或懒惰（而非'合理'）的理由。",
-    },
-    {
-        "id": "m11",
-        "section": "反愿景",
-        "en": "If your current behavior is a form of self-protection, "
-              "what exactly are you protecting? And what is that protection costing you?",
-        "zh": "如果你当前的行为是一种自我保护，"
-              "你到底在保护什么？这种保护又让你付出了什么代价？",
-    },
-    # --- 最小可行愿景 (Vision MVP) ---
-    {
-        "id": "m12",
-        "section": "最小可行愿景",
-        "en": "Forget practicality for a minute. If you could snap your fingers and be living "
-              "a different life in three years — not what's realistic, what you actually want — "
-              "what does an average Tuesday look like?",
-        "zh": "暂时忘掉可行性。如果你能打个响指就在三年后过上不同的生活——"
-              "不是'现实的'，而是你真正想要的——一个普通的周二是什么样？",
-    },
-    {
-        "id": "m13",
-        "section": "最小可行愿景",
-        "en": "What would you have to believe about yourself for that life to feel natural "
-              "rather than forced? Write the identity statement: 'I am the type of person who...'",
-        "zh": "你需要对自己持有什么样的信念，才能让那种生活感觉是自然的而非强撑的？"
-              "写下身份宣言：'我是那种……的人'",
-    },
-    {
-        "id": "m14",
-        "section": "最小可行愿景",
-        "en": "What is one thing you would do this week if you were already that person?",
-        "zh": "如果你已经是那个人了，这周你会做的一件事是什么？",
-    },
-    {
-        "id": "m15",
-        "section": "觉察真相",
-        "en": "What is the most obvious truth about your life that you are currently putting the most energy into avoiding?",
-        "zh": "关于你的生活，你目前正投入最大精力去逃避的、最显而易见的真相是什么？",
-    },
-]
+class _Record:
+    """紧凑的只读记录；兼容原先字典式的 ``q["zh"]`` / ``q.get("en")`` 访问。"""
 
+    __slots__ = ()
 
-# ============================================================
-# 全天 — 打断自动驾驶 (Daytime — Interrupting Autopilot)
-# ============================================================
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
 
-DAYTIME_QUESTIONS = [
-    # --- 定时中断 (Timed Interrupts) ---
-    {
-        "id": "d1",
-        "time": "11:00",
-        "en": "What am I avoiding right now by doing what I'm doing?",
-        "zh": "我现在做的事情，是在逃避什么？",
-    },
-    {
-        "id": "d2",
-        "time": "13:30",
-        "en": "If someone filmed the last two hours, what would they "
-              "conclude I want from my life?",
-        "zh": "如果有人拍下过去两小时我的行为，他会觉得我想从人生中得到什么？",
-    },
-    {
-        "id": "d3",
-        "time": "15:15",
-        "en": "Am I moving toward the life I hate or the life I want?",
-        "zh": "我正在走向我厌恶的生活，还是我想要的生活？",
-    },
-    {
-        "id": "d4",
-        "time": "17:00",
-        "en": "What's the most important thing I'm pretending isn't important?",
-        "zh": "我在假装什么最重要的事情不重要？",
-    },
-    {
-        "id": "d5",
-        "time": "19:30",
-        "en": "What did I do today out of identity protection rather than genuine desire?",
-        "zh": "今天我做的哪些事是出于身份保护而非真心渴望？",
-    },
-    {
-        "id": "d6",
-        "time": "21:00",
-        "en": "When did I feel most alive today? When did I feel most dead?",
-        "zh": "今天什么时候我感觉最有活力？什么时候最死气沉沉？",
-    },
-    # --- 补充思考 (Supplementary) ---
-    {
-        "id": "d7",
-        "time": None,
-        "en": "What would change if I stopped needing people to see me as "
-              "[the identity you protect]?",
-        "zh": "如果我不再需要别人把我看作[你保护的那个身份]，会有什么改变？",
-    },
-    {
-        "id": "d8",
-        "time": None,
-        "en": "Where in my life am I trading aliveness for safety?",
-        "zh": "在我的生活中，哪些地方我在用活力换取安全感？",
-    },
-    {
-        "id": "d9",
-        "time": None,
-        "en": "What's the smallest version of the person I want to become "
-              "that I could be tomorrow?",
-        "zh": "明天我能成为的、我想要成为的那个人的最小版本是什么？",
-    },
-    {
-        "id": "d10",
-        "time": None,
-        "en": "Is the problem you’re trying to solve a real blockage, or a "
-              "distraction you’ve created to 'feel useful' without making progress?",
-        "zh": "你试图解决的问题是真正的障碍，还是你为了让自己看起来“有用”而创造的借口？",
-    },
-    {
-        "id": "d11",
-        "time": None,
-        "en": "If you had to live this exact day again for the next 100 days, "
-              "would it be a heaven of progress or a hell of stagnation?",
-        "zh": "如果你必须在接下来的 100 天内重复过这完全相同的一天，这会是进步的天堂还是停滞的地狱？",
-    },
-]
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
 
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
 
-# ============================================================
-# 晚间 — 综合洞察 (Evening — Synthesizing Insight)
-# ============================================================
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
 
-EVENING_QUESTIONS = [
-    {
-        "id": "e1",
-        "section": "洞察",
-        "en": "After today, what feels most true about why you've been stuck?",
-        "zh": "经过今天，关于你为什么一直停滞不前，什么感觉最真实？",
-    },
-    {
-        "id": "e2",
-        "section": "洞察",
-        "en": "What is the actual enemy? Name it clearly. Not circumstances. Not other people. "
-              "The internal pattern or belief that has been running the show.",
-        "zh": "真正的敌人是什么？清晰地命名它。不是环境，不是他人。"
-              "是一直在操控全局的那个内在模式或信念。",
-    },
-    {
-        "id": "e3",
-        "section": "反愿景压缩",
-        "en": "Write a single sentence that captures what you refuse to let your life become. "
-              "This is your anti-vision compressed. It should make you feel something when you read it.",
-        "zh": "用一句话概括你拒绝让人生变成的样子。"
-              "这是你反愿景的压缩版。读到它时，你应该有所触动。",
-    },
-    {
-        "id": "e4",
-        "section": "愿景 MVP",
-        "en": "Write a single sentence that captures what you're building toward, "
-              "knowing it will evolve. This is your vision MVP.",
-        "zh": "用一句话概括你正在朝着什么方向努力，同时知道它会不断演变。"
-              "这是你的最小可行愿景。",
-    },
-    {
-        "id": "e5",
-        "section": "目标透镜",
-        "en": "One-year lens: What would have to be true in one year for you to know "
-              "you've broken the old pattern? One concrete thing.",
-        "zh": "一年透镜：一年后，什么事情必须成为现实，你才能确认自己打破了旧模式？"
-              "一件具体的事。",
-    },
-    {
-        "id": "e6",
-        "section": "目标透镜",
-        "en": "One-month lens: What would have to be true in one month "
-              "for the one-year lens to remain possible?",
-        "zh": "一月透镜：一个月后，什么事情必须成为现实，"
-              "才能让一年目标依然可行？",
-    },
-    {
-        "id": "e7",
-        "section": "目标透镜",
-        "en": "Daily lens: What are 2-3 actions you can timeblock tomorrow "
-              "that the person you're becoming would simply do?",
-        "zh": "每日透镜：明天你可以用时间块安排的 2-3 个行动是什么？"
-              "那个你正在成为的人会自然而然去做的事。",
-    },
-]
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
 
+    def keys(self):
+        return [name for name in self.__slots__ if getattr(self, name) is not None]
 
-# ============================================================
-# 人生游戏综述 (Synthesis — The Life Game)
-# ============================================================
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    __hash__ = None
 
-SYNTHESIS_QUESTIONS = [
-    {
-        "id": "s1",
-        "section": "反愿景 (Anti-Vision)",
-        "game_role": "危险/敌方设定",
-        "icon": "💀",
-        "zh": "描述你绝不想过上的那种生活。",
-    },
-    {
-        "id": "s2",
-        "section": "愿景 (Vision)",
-        "game_role": "最终胜利目标",
-        "icon": "🌟",
-        "zh": "在你不考虑现实限制的情况下，理想的一天是什么样的？",
-    },
-    {
-        "id": "s3",
-        "section": "1年目标 (1 Year)",
-        "game_role": "当前关卡任务",
-        "icon": "🚩",
-        "zh": "一年后，哪一个具体的成就能代表你打破了旧模式？",
-    },
-    {
-        "id": "s4",
-        "section": "1月项目 (1 Month)",
-        "game_role": "BOSS 战",
-        "icon": "⚔️",
-        "zh": "本月你要集中攻克的技能、学习或构建的任务是什么？",
-    },
-    {
-        "id": "s5",
-        "section": "每日杠杆 (Levers)",
-        "game_role": "每日任务/日常",
-        "icon": "⚡",
-        "zh": "哪 2-3 个核心行动能最快推进你的月度项目和年目标？",
-    },
-    {
-        "id": "s6",
-        "section": "规则限制 (Constraints)",
-        "game_role": "游戏规则/物理边界",
-        "icon": "🧱",
-        "zh": "为了达成愿景，你绝对不愿牺牲的原则或底线是什么？",
-    },
-]
-
-QUOTES = [
-    {"zh": "真正的智能是你能如愿以偿地过上自己想要的生活。", "source": "Naval Ravikant"},
-    {"zh": "如果你不为自己设定目标，你就会沦为别人达成目标的工具。", "source": "Dan Koe"},
-    {"zh": "反愿景比愿景更有力量，因为痛苦是比快乐更强的原动力。", "source": "Dan Koe"},
-    {"zh": "专注是拒绝一千个好主意，只为一个伟大的主意留出空间。", "source": "Steve Jobs"},
-    {"zh": "你的每一个行动都是在为你未来想成为的那个人投票。", "source": "James Clear"},
-    {"zh": "如果一件事情你无法想象自己坚持做 10 年，那就连 10 分钟都不要去碰。", "source": "Naval Ravikant"},
-]
+    def __repr__(self):
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.keys())
+        return f"{type(self).__name__}({fields})"
+
+
+class Question(_Record):
+    __slots__ = ("id", "phase", "section", "time", "game_role", "icon", "en", "zh")
+
+
+class Quote(_Record):
+    __slots__ = ("zh", "en", "source")
+
+
+class _Bank:
+    """编译后的题库：``by_id`` 索引、阶段 → ID 元组、综述问题与金句。"""
+
+    __slots__ = ("by_id", "phases", "synthesis", "quotes", "signature", "version")
+
+    def __init__(self, by_id, phases, synthesis, quotes, signature, version):
+        self.by_id = by_id
+        self.phases = phases
+        self.synthesis = synthesis
+        self.quotes = quotes
+        self.signature = signature
+        self.version = version
+
+
+def _bank_files(directory):
+    """``(路径, mtime_ns, size)``，内置题库在前，其余按文件名排序。"""
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.lower().endswith(".json"):
+                    st = entry.stat()
+                    entries.append((entry.name != DEFAULT_BANK, entry.name, entry.path, st.st_mtime_ns, st.st_size))
+    except FileNotFoundError:
+        pass
+    entries.sort()
+    return tuple((path, mtime, size) for _, _, path, mtime, size in entries)
+
+
+def _compile(signature, version):
+    by_id = {}
+    synthesis_ids = []
+    quotes = []
+    for path, _, _ in signature:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                pack = json.load(f)
+            if not isinstance(pack, dict):
+                raise ValueError("top level must be an object")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Skipping question pack {path}: {e}")
+            continue
+        for group in PHASES + ("synthesis",):
+            for item in pack.get(group) or ():
+                if not isinstance(item, dict) or not item.get("id") or not item.get("zh"):
+                    logging.warning(f"Skipping invalid {group} entry in {path}: {item!r}")
+                    continue
+                qid = str(item["id"])
+                if qid in by_id:
+                    logging.debug(f"Question {qid} overridden by {path}")
+                by_id[qid] = Question(**{**item, "id": qid, "phase": group})
+                if group == "synthesis" and qid not in synthesis_ids:
+                    synthesis_ids.append(qid)
+        for item in pack.get("quotes") or ():
+            if isinstance(item, dict) and item.get("zh"):
+                quotes.append(Quote(**item))
+    phases = {phase: tuple(qid for qid, q in by_id.items() if q.phase == phase) for phase in PHASES}
+    synthesis = tuple(by_id[qid] for qid in synthesis_ids if by_id[qid].phase == "synthesis")
+    return _Bank(by_id, phases, synthesis, tuple(quotes), signature, version)
+
+
+_bank_state = None
+_bank_checked = 0.0
+_bank_lock = threading.Lock()
+
+
+def _bank():
+    """当前题库；首次调用时编译，文件变化后重新编译。"""
+    global _bank_state, _bank_checked
+    now = time.monotonic()
+    bank = _bank_state
+    if bank is not None and now - _bank_checked < RELOAD_CHECK_INTERVAL:
+        return bank
+    with _bank_lock:
+        bank = _bank_state
+        signature = _bank_files(QUESTION_BANK_DIR)
+        if bank is None or signature != bank.signature:
+            bank = _compile(signature, (bank.version + 1) if bank else 1)
+            if _bank_state is not None:
+                logging.info(f"Question bank reloaded ({len(bank.by_id)} questions)")
+            _bank_state = bank
+        _bank_checked = now
+    return bank
+
+
+def reload_questions():
+    """强制重新检查题库文件（用户题包放入后可立即生效）。"""
+    global _bank_checked
+    _bank_checked = float("-inf")
+    return _bank().version
+
+
+def question_bank_version():
+    """题库版本号，每次重新编译后递增。"""
+    return _bank().version
+
+
+def __getattr__(name):
+    # 兼容旧的模块级常量；每次访问返回当前题库的快照列表
+    if name in ("MORNING_QUESTIONS", "DAYTIME_QUESTIONS", "EVENING_QUESTIONS"):
+        return list(get_questions_for_phase(name.split("_")[0].lower()))
+    if name == "ALL_QUESTIONS":
+        bank = _bank()
+        return [bank.by_id[qid] for phase in PHASES for qid in bank.phases[phase]]
+    if name == "SYNTHESIS_QUESTIONS":
+        return list(get_synthesis_questions())
+    if name == "QUOTES":
+        return list(_bank().quotes)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================
 # 数据交互与检索函数
 # ============================================================
 
-ALL_QUESTIONS = MORNING_QUESTIONS + DAYTIME_QUESTIONS + EVENING_QUESTIONS
-
-
 def get_latest_synthesis_answers():
     """获取人生游戏 6 组件的最新回答。
     优先从 life_game.json 读取 (Single Source of Truth)，
     如果 JSON 中缺失组件，则回退到 journal_data.json 的历史记录。
     """
-    from config_manager import load_journal_data, load_life_game_data
+    from config_manager import get_latest_answers, view_life_game_data
     
     # 1. 尝试从 life_game.json 读取
-    json_data = load_life_game_data()
+    json_data = view_life_game_data()
     all_answers = {k: v for k, v in json_data.items() if k.startswith("s")}
     
     # 如果已经集齐 6 个，直接返回
     if len(all_answers) >= 6:
         return all_answers
 
-    # 2. 兜底逻辑：从历史日志中提取
+    # 2. 兜底逻辑：从历史日志中按索引查询缺失组件的最后一次有效输入
     try:
-        data = load_journal_data()
-        # 遍历所有日期的回答，获取 s1-s6 每个问题的最后一次有效输入
-        for date_str in sorted(data.keys(), reverse=True):
-            day_answers = data[date_str].get("answers", [])
-            for ans in day_answers:
-                q_id = ans.get("question_id")
-                if q_id.startswith("s") and q_id not in all_answers:
-                    all_answers[q_id] = ans.get("answer")
-            
-            # 如果已经找全了，提前结束
-            if len(all_answers) >= 6:
-                break
+        missing = [q["id"] for q in get_synthesis_questions() if q["id"] not in all_answers]
+        all_answers.update(get_latest_answers(missing))
         return all_answers
     except Exception:
         return all_answers
@@ -391,7 +224,8 @@ def get_latest_synthesis_answers():
 
 def pick_random_quote():
     """随机返回一个启发金句。"""
-    return random.choice(QUOTES)
+    quotes = _bank().quotes
+    return random.choice(quotes) if quotes else Quote(zh="", source="")
 
 
 def get_phase_by_time(hour=None):
@@ -406,14 +240,22 @@ def get_phase_by_time(hour=None):
         return "evening"
 
 
+def get_question_ids_for_phase(phase):
+    """阶段对应的问题 ID 元组（未知阶段按全天处理）。"""
+    phases = _bank().phases
+    return phases.get(phase, phases["daytime"])
+
+
 def get_questions_for_phase(phase):
     """根据阶段获取对应的问题列表。"""
-    phase_map = {
-        "morning": MORNING_QUESTIONS,
-        "daytime": DAYTIME_QUESTIONS,
-        "evening": EVENING_QUESTIONS,
-    }
-    return phase_map.get(phase, DAYTIME_QUESTIONS)
+    bank = _bank()
+    ids = bank.phases.get(phase, bank.phases["daytime"])
+    return tuple(bank.by_id[qid] for qid in ids)
+
+
+def get_synthesis_questions():
+    """人生游戏 6 组件题库。"""
+    return _bank().synthesis
 
 
 def pick_random_question(phase=None, exclude_ids=None):
@@ -438,15 +280,202 @@ def pick_random_question(phase=None, exclude_ids=None):
 
 def get_question_by_id(question_id):
     """根据 ID 查找问题。支持常规题库和人生游戏 6 组件题库。"""
-    # 优先查找常规库
-    for q in ALL_QUESTIONS:
-        if q["id"] == question_id:
-            return q
-    # 查找人生游戏库
-    for q in SYNTHESIS_QUESTIONS:
-        if q["id"] == question_id:
-            return q
-    return None
+    return _bank().by_id.get(question_id)
+
+
+# ============================================================
+# 持久化加权抽题 (Persistent Weighted Scheduler)
+# ============================================================
+
+NEW_QUESTION_WEIGHT = 8.0   # 从未出现过的问题
+MAX_GAP_WEIGHT = 8.0        # 距上次出现的天数带来的权重上限
+RECENTLY_ANSWERED_FACTOR = 0.25
+MAX_INTERVAL_EXP = 6        # 回答间隔最多 2^6 = 64 天
+
+
+class _Fenwick:
+    """树状数组：O(log n) 更新单个权重、按前缀和定位抽样下标。"""
+
+    __slots__ = ("n", "tree", "values")
+
+    def __init__(self, weights):
+        self.n = len(weights)
+        self.values = list(weights)
+        self.tree = [0.0] + self.values
+        for i in range(1, self.n + 1):
+            parent = i + (i & -i)
+            if parent <= self.n:
+                self.tree[parent] += self.tree[i]
+
+    def update(self, index, weight):
+        delta = weight - self.values[index]
+        self.values[index] = weight
+        i = index + 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self):
+        total, i = 0.0, self.n
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, r):
+        """前缀和首次超过 *r* 的下标（0 <= r < total）。"""
+        pos, step = 0, 1 << (self.n.bit_length() - 1) if self.n else 0
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and self.tree[nxt] <= r:
+                pos = nxt
+                r -= self.tree[nxt]
+            step >>= 1
+        return min(pos, self.n - 1)
+
+
+class QuestionScheduler:
+    """按阶段加权抽题，状态持久化到 *store*（``question_state.json``）。
+
+    每个问题记录 ``shown`` / ``answered``（最近一次时间）与 ``answers``（回答次数）。
+    权重：从未出现过的问题最高；否则随距上次出现的天数增长；若最近回答
+    距今不足 ``2^answers`` 天（间隔随回答次数翻倍，类似间隔重复），权重打折。
+    当天已出现过的问题权重为 0，全部出现过后当天重新开放。
+
+    每个阶段一棵树状数组，抽样与更新均为 O(log n)；权重只随日期变化，
+    因此跨天时整体重建一次。*seed* 固定随机序列，*now* 可注入时钟，供测试使用。
+    """
+
+    def __init__(self, store, seed=None, now=None):
+        self.store = store
+        self._rng = random.Random(seed)
+        self._now = now or datetime.now
+        self._lock = threading.Lock()
+        self._trees = {}   # phase -> (ids, _Fenwick)
+        self._day = None
+        self._bank_version = None
+
+    def pick(self, phase=None):
+        """抽取一个问题并记为已展示。"""
+        now = self._now()
+        if phase is None:
+            phase = get_phase_by_time(now.hour)
+        with self._lock:
+            state = self._state(now)
+            ids, tree = self._tree(phase, state, now)
+            if not ids:
+                return None
+            if tree.total() <= 0:
+                # 本阶段今天全部出现过：重新开放
+                ids, tree = self._build(phase, state, now, ignore_today=True)
+            index = tree.find(self._rng.random() * tree.total())
+            if tree.values[index] <= 0:  # 浮点误差兜底
+                index = max(range(len(ids)), key=tree.values.__getitem__)
+            qid = ids[index]
+            self._record(state, qid, "shown", now)
+            state["shown_today"].append(qid)
+            tree.update(index, 0.0)
+            self.store.save(state)
+        return get_question_by_id(qid)
+
+    def mark_answered(self, question_id, when=None):
+        """记录一次回答（影响该问题之后的权重）。"""
+        when = when or self._now()
+        with self._lock:
+            state = self._state(when)
+            entry = self._record(state, question_id, "answered", when)
+            entry["answers"] = entry.get("answers", 0) + 1
+            self.store.save(state)
+            for phase, (ids, tree) in self._trees.items():
+                if question_id in ids and question_id not in state["shown_today"]:
+                    tree.update(ids.index(question_id), self._weight(entry, when))
+
+    def shown_today(self):
+        with self._lock:
+            return list(self._state(self._now())["shown_today"])
+
+    def _state(self, now):
+        state = self.store.load() if self._day is None else self._cached
+        today = now.date().isoformat()
+        if state.get("day") != today:
+            state["day"] = today
+            state["shown_today"] = []
+            state.setdefault("questions", {})
+            self._trees.clear()
+        self._cached, self._day = state, today
+        return state
+
+    def _tree(self, phase, state, now):
+        version = question_bank_version()
+        if version != self._bank_version:
+            # 题库热更新后 ID 列表可能变化，全部重建
+            self._trees.clear()
+            self._bank_version = version
+        if phase not in self._trees:
+            self._build(phase, state, now)
+        return self._trees[phase]
+
+    def _build(self, phase, state, now, ignore_today=False):
+        ids = list(get_question_ids_for_phase(phase))
+        today = set() if ignore_today else set(state["shown_today"])
+        questions = state["questions"]
+        weights = [
+            0.0 if qid in today else self._weight(questions.get(qid), now)
+            for qid in ids
+        ]
+        self._trees[phase] = (ids, _Fenwick(weights))
+        return self._trees[phase]
+
+    @staticmethod
+    def _weight(entry, now):
+        if not entry or not entry.get("shown"):
+            return NEW_QUESTION_WEIGHT
+        gap = _days_between(entry["shown"], now)
+        weight = min(1.0 + gap, MAX_GAP_WEIGHT)
+        if entry.get("answered"):
+            interval = 2 ** min(entry.get("answers", 1), MAX_INTERVAL_EXP)
+            if _days_between(entry["answered"], now) < interval:
+                weight *= RECENTLY_ANSWERED_FACTOR
+        return weight
+
+    @staticmethod
+    def _record(state, qid, field, when):
+        entry = state["questions"].setdefault(qid, {})
+        entry[field] = when.isoformat(timespec="seconds")
+        return entry
+
+
+def _days_between(iso_stamp, now):
+    try:
+        return max(0, (now.date() - datetime.fromisoformat(iso_stamp).date()).days)
+    except (TypeError, ValueError):
+        return 0
+
+
+QUESTION_STATE_NAME = "question_state.json"
+
+_schedulers: dict = {}
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(state_path=None):
+    """进程内共享的抽题器，每个状态文件一个实例。
+
+    *state_path* 缺省为数据目录（``config_manager.BASE_DIR``）下的
+    ``question_state.json``，在首次调用时才解析。
+    """
+    from config_manager import BASE_DIR, BackupPolicy, JsonStore, register_store
+    path = os.path.abspath(state_path or os.path.join(BASE_DIR, QUESTION_STATE_NAME))
+    with _scheduler_lock:
+        scheduler = _schedulers.get(path)
+        if scheduler is None:
+            store = register_store(JsonStore(
+                path,
+                lambda: {"day": None, "shown_today": [], "questions": {}},
+                codec="json-compact", backup_policy=BackupPolicy(max_count=1),
+            ))
+            scheduler = _schedulers[path] = QuestionScheduler(store)
+        return scheduler
 
 
 if __name__ == "__main__":
@@ -459,7 +488,9 @@ if __name__ == "__main__":
     logging.info(f"\n随机问题 [{q['id']}]:")
     logging.info(f"  EN: {q['en']}")
     logging.info(f"  ZH: {q['zh']}")
-    logging.info(f"\n总计问题数: {len(ALL_QUESTIONS)}")
-    logging.info(f"  早晨: {len(MORNING_QUESTIONS)}")
-    logging.info(f"  全天: {len(DAYTIME_QUESTIONS)}")
-    logging.info(f"  晚间: {len(EVENING_QUESTIONS)}")
+    bank = _bank()
+    logging.info(f"\n总计问题数: {sum(len(bank.phases[p]) for p in PHASES)}（题库文件 {len(bank.signature)} 个）")
+    logging.info(f"  早晨: {len(bank.phases['morning'])}")
+    logging.info(f"  全天: {len(bank.phases['daytime'])}")
+    logging.info(f"  晚间: {len(bank.phases['evening'])}")
+    logging.info(f"  综述: {len(bank.synthesis)}，金句: {len(bank.quotes)}")
@@ -0,0 +1,235 @@
+"""Pomodoro profiles compiled into per-day interval tables.
+
+``config["pomodoro"]`` describes which profile (work / rest minutes) is in
+force at any moment::
+
+    "pomodoro": {
+        "default": {"work_duration": 25, "rest_duration": 5},
+        "morning_routine": {"enabled": true, "start_time": "05:00", "end_time": "10:00",
+                            "work_duration": 10, "rest_duration": 5},
+        "profiles": {
+            "deep_work": {"work_duration": 50, "rest_duration": 10,
+                          "windows": [{"start": "14:00", "end": "17:30", "days": "weekdays"}]},
+            "night": {"work_duration": 20, "rest_duration": 5,
+                      "windows": [{"start": "22:00", "end": "02:00"}]}
+        },
+        "holidays": ["2026-10-01", "2026-10-02"]
+    }
+
+``morning_routine`` is the original single-window profile and takes
+priority; ``profiles`` follow in order, and where windows overlap the
+first one listed wins.  Outside every window ``default`` applies.  A
+window's ``days`` is one token or a list of ``mon`` … ``sun``,
+``weekdays``, ``weekends``, ``holidays`` and ``daily`` (the default,
+which includes holidays).  Dates listed in ``holidays`` are their own
+kind of day: only windows that name ``holidays`` (or ``daily``) apply on
+them.  A window whose end is not after its start runs past midnight into
+the following day; ``"24:00"`` is accepted as an end time.
+
+:func:`compile_schedule` parses all of this once per configuration
+object (call :func:`invalidate_schedule` after editing one in place).
+The day's table is built lazily per (day kind, previous
+day kind) pair, so :meth:`Schedule.lookup` is a ``bisect`` plus a dict
+hit and also returns when the active profile next changes.
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+DAY_SECONDS = 24 * 3600
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+HOLIDAY = 7  # day kind of a date listed in ``holidays``; 0-6 are weekdays
+DAY_SETS = {
+    **{name: frozenset([i]) for i, name in enumerate(DAY_NAMES)},
+    "weekdays": frozenset(range(5)),
+    "weekends": frozenset([5, 6]),
+    "holidays": frozenset([HOLIDAY]),
+    "daily": frozenset(range(8)),
+}
+_WEEK = 8  # days to scan ahead before only holidays can still change the profile
+
+
+class Profile(NamedTuple):
+    """A named pair of work / rest durations in minutes."""
+
+    name: str
+    work_duration: float
+    rest_duration: float
+
+
+class _Window(NamedTuple):
+    start: int  # seconds after midnight
+    end: int
+    days: frozenset
+    profile: Profile
+
+
+def parse_hhmm(text) -> int:
+    """``"HH:MM"`` → seconds after midnight (``"24:00"`` allowed)."""
+    h, m = map(int, str(text).split(":"))
+    if not (0 <= h <= 24 and 0 <= m < 60) or (h == 24 and m):
+        raise ValueError(f"invalid time of day {text!r}")
+    return h * 3600 + m * 60
+
+
+def parse_days(spec) -> frozenset:
+    tokens = [spec] if isinstance(spec, str) else list(spec)
+    days = set()
+    for token in tokens:
+        key = str(token).lower()
+        if key not in DAY_SETS:
+            raise ValueError(f"unknown day {token!r}; expected one of {sorted(DAY_SETS)}")
+        days |= DAY_SETS[key]
+    return frozenset(days)
+
+
+class Schedule:
+    """Compiled profile schedule; see the module docstring for the format."""
+
+    def __init__(self, default: Profile, windows=(), holidays=()):
+        self.default = default
+        self.windows = tuple(windows)  # priority order
+        self._holidays = sorted({d.toordinal() for d in holidays})
+        self._holiday_set = frozenset(self._holidays)
+        self._tables = {}
+        self.constant = not self.windows
+
+    def lookup(self, when: datetime) -> Tuple[Profile, Optional[datetime]]:
+        """Profile active at *when* and the time it next changes (``None``: never)."""
+        day = when.date()
+        midnight = datetime.combine(day, datetime.min.time())
+        starts, profiles = self._table(day)
+        offset = (when - midnight).total_seconds()
+        i = bisect_right(starts, offset) - 1
+        profile = profiles[i]
+        if i + 1 < len(starts):
+            return profile, midnight + timedelta(seconds=starts[i + 1])
+        return profile, self._next_change(day, profile)
+
+    def profile_at(self, when: datetime) -> Profile:
+        return self.lookup(when)[0]
+
+    def _kind(self, day: date) -> int:
+        return HOLIDAY if day.toordinal() in self._holiday_set else day.weekday()
+
+    def _table(self, day: date):
+        key = (self._kind(day), self._kind(day - timedelta(days=1)))
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = self._build(*key)
+        return table
+
+    def _build(self, kind, prev_kind):
+        """Partition one day into ``(starts, profiles)``; adjacent equal profiles are merged."""
+        pieces = []
+        for rank, w in enumerate(self.windows):
+            if w.start < w.end:
+                if kind in w.days:
+                    pieces.append((w.start, w.end, rank))
+            else:  # runs past midnight: evening part today, morning part from yesterday's window
+                if kind in w.days:
+                    pieces.append((w.start, DAY_SECONDS, rank))
+                if prev_kind in w.days and w.end:
+                    pieces.append((0, w.end, rank))
+
+        points = sorted({0, DAY_SECONDS}.union(*((s, e) for s, e, _ in pieces)))
+        starts, profiles = [], []
+        for a in points[:-1]:
+            ranks = [rank for s, e, rank in pieces if s <= a < e]
+            profile = self.windows[min(ranks)].profile if ranks else self.default
+            if not profiles or profiles[-1] != profile:
+                starts.append(a)
+                profiles.append(profile)
+        return starts, profiles
+
+    def _following_days(self, day: date):
+        """Days after *day* on which the profile can change at or after midnight."""
+        for n in range(1, _WEEK + 1):
+            yield day + timedelta(days=n)
+        # Past a full week only holidays (and the day after one) differ from what was scanned.
+        horizon = (day + timedelta(days=_WEEK)).toordinal()
+        for ordinal in self._holidays[bisect_left(self._holidays, horizon):]:
+            yield date.fromordinal(ordinal)
+            yield date.fromordinal(ordinal + 1)
+
+    def _next_change(self, day: date, profile: Profile) -> Optional[datetime]:
+        if self.constant:
+            return None
+        for following in self._following_days(day):
+            starts, profiles = self._table(following)
+            midnight = datetime.combine(following, datetime.min.time())
+            if profiles[0] != profile:
+                return midnight
+            if len(starts) > 1:
+                return midnight + timedelta(seconds=starts[1])
+        return None
+
+
+def _profile(name, cfg, fallback: Profile) -> Profile:
+    return Profile(
+        name,
+        cfg.get("work_duration", fallback.work_duration),
+        cfg.get("rest_duration", fallback.rest_duration),
+    )
+
+
+def build_schedule(pomodoro_cfg: dict) -> Schedule:
+    """Parse ``config["pomodoro"]``; malformed windows are logged and skipped."""
+    default = _profile("default", pomodoro_cfg.get("default", {}), Profile("default", 25, 5))
+
+    entries = []
+    morning = pomodoro_cfg.get("morning_routine", {})
+    if morning.get("enabled", False):
+        window = {"start": morning.get("start_time"), "end": morning.get("end_time"),
+                  "days": morning.get("days", "daily")}
+        entries.append(("morning_routine", morning, [window]))
+    for name, cfg in (pomodoro_cfg.get("profiles") or {}).items():
+        if cfg.get("enabled", True):
+            entries.append((name, cfg, cfg.get("windows", [])))
+
+    windows = []
+    for name, cfg, specs in entries:
+        profile = _profile(name, cfg, default)
+        for spec in specs:
+            try:
+                start, end = parse_hhmm(spec["start"]), parse_hhmm(spec["end"])
+                days = parse_days(spec.get("days", "daily"))
+            except Exception as e:
+                logging.error(f"Error parsing profile time for {name!r}: {e}")
+                continue
+            if start != end:
+                windows.append(_Window(start, end, days, profile))
+
+    holidays = []
+    for text in pomodoro_cfg.get("holidays", []):
+        try:
+            holidays.append(date.fromisoformat(text))
+        except (TypeError, ValueError) as e:
+            logging.error(f"Error parsing holiday {text!r}: {e}")
+    return Schedule(default, windows, holidays)
+
+
+_compiled = (None, None)  # (config object, Schedule)
+
+
+def compile_schedule(pomodoro_cfg: dict) -> Schedule:
+    """:func:`build_schedule`, cached per configuration object.
+
+    The hot path (every :meth:`Monitor._refresh_durations`) is an identity
+    check: a reloaded config is a new object and recompiles by itself, while
+    code that edits the live dict in place calls :func:`invalidate_schedule`.
+    """
+    global _compiled
+    cached_cfg, schedule = _compiled
+    if pomodoro_cfg is not cached_cfg:
+        schedule = build_schedule(pomodoro_cfg)
+        _compiled = (pomodoro_cfg, schedule)
+    return schedule
+
+
+def invalidate_schedule() -> None:
+    """Forget the compiled schedule; the next :func:`compile_schedule` rebuilds it."""
+    global _compiled
+    _compiled = (None, None)
@@ -0,0 +1,210 @@
+"""Accelerated simulation of the Monitor state machine on a virtual clock.
+
+Run from ``src``::
+
+    python -m simulation --days 5 --responses rest rest snooze --trace trace.jsonl
+
+:class:`Simulation` builds a :class:`monitor.Monitor` on a
+:class:`clock.SimulatedClock` with scripted collaborators: the user's
+activity (``away`` / ``back`` / ``lock`` / ``unlock`` / ``suspend``
+events at given times), a reminder stand-in that answers every break
+with the next scripted response (``rest`` / ``snooze`` / ``close`` /
+``ignore``), and silent audio.  ``Monitor.run()`` itself drives the
+simulation, but nothing sleeps, so a working week replays in well under a
+second.  Every state change is recorded as a trace row
+``{"time", "event", "state"}`` for assertions and benchmarks.
+"""
+
+import itertools
+import json
+import logging
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from activity import ScriptedActivity
+from clock import SimulatedClock
+from monitor import Monitor
+
+ACTIONS = ("away", "back", "lock", "unlock", "suspend")
+RESPONSES = ("rest", "snooze", "close", "ignore")
+REACTION_SECONDS = 5  # time from the reminder appearing to the user's click
+ANSWER_SECONDS = 30  # time spent answering after the break countdown ends
+
+
+class NullAudio:
+    """Records playback instead of touching the mixer."""
+
+    def __init__(self):
+        self.played = []
+        self.volume = None
+
+    def play(self, path=None, loops=0, force=False):
+        self.played.append(path)
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+
+class ScriptedReminder:
+    """Stand-in for ``view.show_reminder_process``.
+
+    *responses* is cycled, one response per reminder.  ``rest`` clicks
+    "start rest", waits out the break countdown and closes after answering;
+    ``snooze`` snoozes; ``close`` dismisses the window; ``ignore`` leaves it
+    open until the Monitor's reminder timeout.
+    """
+
+    def __init__(self, clock, responses=("rest",), reaction=REACTION_SECONDS, answer=ANSWER_SECONDS):
+        unknown = set(responses) - set(RESPONSES)
+        if not responses or unknown:
+            raise ValueError(f"Unknown reminder responses {sorted(unknown)}; expected {RESPONSES}")
+        self._clock = clock
+        self._responses = itertools.cycle(responses)
+        self.reaction = reaction
+        self.answer = answer
+        self.shown = 0
+
+    def __call__(self, message, duration, on_rest, on_snooze, on_close=None, **kwargs):
+        self.shown += 1
+        response = next(self._responses)
+        clock = self._clock
+        if response == "rest":
+            clock.call_later(self.reaction, on_rest)
+            clock.call_later(self.reaction + duration + self.answer, on_close)
+        elif response == "snooze":
+            def snooze():
+                on_snooze()
+                on_close()
+            clock.call_later(self.reaction, snooze)
+        elif response == "close":
+            clock.call_later(self.reaction, on_close)
+
+
+class Simulation:
+    """One Monitor replayed from *start* with scripted *events* and *responses*.
+
+    *events* are ``(datetime, action, *args)`` tuples; ``suspend`` takes the
+    number of seconds the machine sleeps (the monotonic clock keeps
+    counting, as on Windows).  *push* makes the scripted activity source
+    push-style (lock/unlock/return events wake the Monitor) instead of
+    polled.
+    """
+
+    def __init__(self, config, start: datetime, events=(), responses=("rest",), locked=False, push=False):
+        self.clock = SimulatedClock(start)
+        self.activity = ScriptedActivity(self.clock, push=push)
+        self.activity.locked = locked
+        self.reminder = ScriptedReminder(self.clock, tuple(responses))
+        self.audio = NullAudio()
+        self.trace = []
+        self.monitor = Monitor(
+            "assets",
+            config,
+            clock=self.clock,
+            audio=self.audio,
+            activity=self.activity,
+            show_reminder=self.reminder,
+            pick_question=lambda: None,
+            pause_media=lambda: None,
+            on_transition=self._record,
+        )
+        for when, action, *args in events:
+            self.schedule(when, action, *args)
+
+    def schedule(self, when: datetime, action: str, *args) -> None:
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action {action!r}; expected one of {ACTIONS}")
+        if action == "suspend":
+            callback = lambda: self.clock.advance(*args)  # noqa: E731
+        else:
+            callback = getattr(self.activity, action)
+        self.clock.call_at(self._offset(when), callback)
+
+    def run(self, until: datetime) -> list:
+        """Run the Monitor until *until*; returns the trace."""
+        self.clock.call_at(self._offset(until), self.monitor.stop)
+        self.monitor.run()
+        return self.trace
+
+    def summary(self) -> dict:
+        counts = {}
+        for row in self.trace:
+            counts[row["event"]] = counts.get(row["event"], 0) + 1
+        return {
+            "completed_rounds": self.monitor.completed_rounds,
+            "reminders": self.reminder.shown,
+            "events": counts,
+        }
+
+    def _offset(self, when: datetime) -> float:
+        return (when - self.clock.now()).total_seconds() + self.clock.monotonic()
+
+    def _record(self, when, event, state):
+        self.trace.append({"time": when.isoformat(timespec="seconds"), "event": event, "state": state})
+
+
+def office_events(first_day: date, days: int, arrive="09:00", lunch=("12:00", "13:00"), leave="18:00"):
+    """Weekday script: unlock on arrival, away over lunch, lock on leaving.
+
+    The workstation is expected to start locked (``Simulation(locked=True)``);
+    weekends stay locked.
+    """
+    def at(day, hhmm):
+        h, m = map(int, hhmm.split(":"))
+        return datetime.combine(day, datetime.min.time()).replace(hour=h, minute=m)
+
+    events = []
+    for i in range(days):
+        day = first_day + timedelta(days=i)
+        if day.weekday() >= 5:
+            continue
+        events += [
+            (at(day, arrive), "unlock"),
+            (at(day, lunch[0]), "away"),
+            (at(day, lunch[1]), "back"),
+            (at(day, leave), "lock"),
+        ]
+    return events
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    from config_manager import load_config
+
+    parser = argparse.ArgumentParser(prog="python -m simulation",
+                                     description="Replay the Monitor state machine on a virtual clock")
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--start", type=date.fromisoformat, help="first day (default: last Monday)")
+    parser.add_argument("--responses", nargs="+", choices=RESPONSES, default=["rest"],
+                        help="reminder responses, cycled")
+    parser.add_argument("--push", action="store_true", help="push-style activity events instead of polling")
+    parser.add_argument("--trace", help="write the transition trace as JSONL")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show Monitor logging")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(message)s", stream=sys.stderr)
+    first_day = args.start or date.today() - timedelta(days=date.today().weekday())
+    start = datetime.combine(first_day, datetime.min.time())
+    sim = Simulation(load_config(), start, office_events(first_day, args.days),
+                     responses=args.responses, locked=True, push=args.push)
+    began = time.perf_counter()
+    trace = sim.run(start + timedelta(days=args.days))
+    elapsed = time.perf_counter() - began
+
+    if args.trace:
+        with open(args.trace, "w", encoding="utf-8") as fh:
+            for row in trace:
+                fh.write(json.dumps(row) + "\n")
+    print(json.dumps(sim.summary(), indent=2))
+    print(f"Simulated {args.days} day(s), {len(trace)} transitions in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import io
+import os
+import sys
+from datetime import date, datetime
+
+import pytest
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import activity
+import activity
+from activity import LogindEvents, PushActivity, ScriptedActivity, create_source
+from clock import SimulatedClock
+from simulation import Simulation, office_events
+
+CONFIG = {"pomodoro": {"default": {"work_duration": 25, "rest_duration": 1}, "morning_routine": {"enabled": False}}}
+
+
+def test_push_source_tracks_state_and_notifies():
+    clock = SimulatedClock(datetime(2026, 1, 1))
+    source = PushActivity(clock)
+    events = []
+    source.subscribe(events.append)
+
+    source.emit("lock")
+    source.emit("idle", idle_for=300)
+    clock.advance(60)
+    assert source.is_locked() and source.idle_seconds() == 360
+    source.emit("unlock")
+    source.emit("active")
+    assert not source.is_locked() and source.idle_seconds() == 0
+    assert events == ["lock", "idle", "unlock", "active"]
+    with pytest.raises(ValueError):
+        source.emit("sleep")
+
+
+def test_scripted_source_polls_silently_unless_push():
+    clock = SimulatedClock(datetime(2026, 1, 1))
+    polled, pushed = ScriptedActivity(clock), ScriptedActivity(clock, push=True)
+    events = []
+    polled.subscribe(events.append)
+    pushed.subscribe(events.append)
+    for source in (polled, pushed):
+        source.lock()
+        source.away()
+    clock.advance(10)
+    assert polled.is_locked() and pushed.is_locked() and pushed.idle_seconds() == 10
+    assert events == ["lock"]  # away() is the absence of input: no event
+
+
+def test_monitor_consumes_push_events_without_sampling():
+    day = date(2026, 10, 12)
+    runs = {}
+    for push in (False, True):
+        sim = Simulation(CONFIG, datetime(2026, 10, 12), office_events(day, 1), locked=True, push=push)
+        waits = []
+        wait = sim.clock.wait
+        sim.clock.wait = lambda cond, timeout=None: waits.append(timeout) or wait(cond, timeout)
+        runs[push] = (sim.run(datetime(2026, 10, 13)), len(waits))
+
+    trace, waits = runs[True]
+    events = [(row["time"][11:], row["event"]) for row in trace]
+    assert events[:3] == [("00:00:00", "lock"), ("09:00:00", "resume"), ("09:25:00", "prompt")]
+    assert ("12:20:00", "idle") in events and ("13:00:00", "resume") in events
+    assert ("18:00:00", "lock") in events
+    assert waits * 5 < runs[False][1]
+
+
+def test_create_source(monkeypatch, caplog):
+    assert create_source("none").idle_seconds() == 0.0
+    monkeypatch.setattr(activity, "_auto_candidates", lambda: ["none"])
+    assert type(create_source("beos")) is activity.ActivitySource  # typo -> auto, not a crash
+    assert "Unknown activity backend 'beos'" in caplog.text
+
+
+def test_auto_prefers_x11_polling_over_logind_idle_hint(monkeypatch):
+    monkeypatch.setattr(activity.sys, "platform", "linux")
+    monkeypatch.setattr(activity.shutil, "which", lambda name: "/usr/bin/" + name)
+    monkeypatch.setenv("DISPLAY", ":0")
+    assert activity._auto_candidates() == ["linux", "none"]
+    monkeypatch.delenv("DISPLAY")
+    assert activity._auto_candidates() == ["logind", "linux", "none"]
+
+
+def test_logind_events_parse_gdbus_monitor_lines():
+    source = LogindEvents.__new__(LogindEvents)
+    PushActivity.__init__(source)
+    events = []
+    source.subscribe(events.append)
+    lines = [
+        "/org/freedesktop/login1/session/_32: org.freedesktop.DBus.Properties.PropertiesChanged "
+        "('org.freedesktop.login1.Session', {'LockedHint': <true>}, @as [])\n",
+        "/org/freedesktop/login1/session/_32: org.freedesktop.login1.Session.Unlock ()\n",
+        "/org/freedesktop/login1/session/_32: org.freedesktop.DBus.Properties.PropertiesChanged "
+        "('org.freedesktop.login1.Session', {'IdleHint': <false>, 'LockedHint': <false>}, @as [])\n",
+    ]
+
+    class _Proc:
+        stdout = io.StringIO("".join(lines))
+
+        def poll(self):
+            return 0
+
+    source._proc = _Proc()
+    source._read()
+    assert events == ["lock", "active", "unlock"] and not source.is_locked()
+    assert activity._bus_path_escape("2") == "_32" and activity._bus_path_escape("c1") == "c1"
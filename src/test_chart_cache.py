@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("PIL")
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chart_cache import ChartCache, chart_key
+
+POINTS = [(float(i), 70.0 + (i % 5)) for i in range(200)]
+
+
+def test_render_is_cached_by_data_hash(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    path = cache.render_async("weight", POINTS, width=120, height=40).result(timeout=10)
+    with open(path, "rb") as fh:
+        assert fh.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    calls = []
+    assert cache.render_async("weight", POINTS, calls.append, width=120, height=40).result() == path
+    assert calls == [path]  # hit: no render, callback runs immediately
+
+    fresh = cache.render_async("weight", POINTS + [(200.0, 60.0)], width=120, height=40).result(timeout=10)
+    assert fresh != path
+    assert cache.latest("weight") == fresh
+    assert ChartCache(str(tmp_path)).latest("weight") == fresh  # order survives a restart
+
+
+def test_eviction_is_lru_by_total_bytes(tmp_path):
+    cache = ChartCache(str(tmp_path), max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.store(name, chart_key([], {"n": name}), b"x" * 100)
+    assert cache.latest("a") is None  # oldest evicted
+    assert cache.total_bytes == 200
+
+    assert cache.lookup("b", chart_key([], {"n": "b"}))  # touch b
+    cache.store("d", chart_key([], {"n": "d"}), b"x" * 100)
+    assert cache.latest("b") and cache.latest("c") is None
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        f"{n}-{chart_key([], {'n': n})}.png" for n in ("b", "d")
+    )
@@ -0,0 +1,28 @@
+import os
+import sys
+import time
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from components import _lttb
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    points = [(float(i), 70.0) for i in range(1000)]
+    points[500] = (500.0, 90.0)
+    sampled = _lttb(points, 50)
+
+    assert len(sampled) == 50
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (500.0, 90.0) in sampled
+    assert [p[0] for p in sampled] == sorted(p[0] for p in sampled)
+    assert _lttb(points[:10], 50) == points[:10]
+
+
+def test_lttb_years_of_readings_is_fast():
+    points = [(i * 3600.0, 70 + (i % 97) / 10) for i in range(3 * 365 * 4)]
+    start = time.perf_counter()
+    sampled = _lttb(points, 175)
+    assert len(sampled) == 175
+    assert time.perf_counter() - start < 0.5
@@ -0,0 +1,357 @@
+import json
+import os
+import sys
+from collections.abc import Sequence
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config_manager
+from config_manager import (
+    SCHEMA_VERSION,
+    BackupPolicy,
+    JournalLogStore,
+    JsonStore,
+    migrate_health_data,
+)
+
+
+def _answer(qid, at, text="a"):
+    return {"question_id": qid, "answered_at": at, "answer": text}
+
+
+def test_journal_append_goes_to_log(tmp_path):
+    """Appending an answer writes one log line and leaves the snapshot untouched."""
+    path = str(tmp_path / "journal_data.json")
+    store = JournalLogStore(path, dict)
+
+    data = store.load()
+    data["2026-10-17"] = {"answers": [_answer("m1", "09:00:00")], "created_at": "09:00:00"}
+    store.save(data)
+    data["2026-10-17"]["answers"].append(_answer("m2", "10:00:00"))
+    store.save(data)
+    assert store.flush(timeout=5)
+
+    assert not os.path.exists(path)
+    with open(store.log_path, encoding="utf-8") as fh:
+        assert len(fh.readlines()) == 2
+    assert JournalLogStore(path, dict).load() == data
+
+
+def test_journal_edit_rewrites_snapshot(tmp_path):
+    """Editing an existing answer falls back to a full snapshot rewrite."""
+    path = str(tmp_path / "journal_data.json")
+    store = JournalLogStore(path, dict)
+    data = {"2026-10-17": {"answers": [_answer("m1", "09:00:00")], "created_at": "09:00:00"}}
+    store.save(data)
+
+    data["2026-10-17"]["answers"][0]["answer"] = "edited"
+    store.save(data)
+    assert store.flush(timeout=5)
+
+    assert not os.path.exists(store.log_path)
+    with open(path, encoding="utf-8") as fh:
+        assert json.load(fh) == {**data, JournalLogStore.EPOCH_KEY: 1}
+
+
+def _crash_before_log_removal(tmp_path, change):
+    """Apply *change* as a snapshot, then put the pre-snapshot log back as if
+    the process died before removing it; returns what a fresh store loads."""
+    path = str(tmp_path / "journal_data.json")
+    store = JournalLogStore(path, dict)
+    store.save({"2026-10-17": {"answers": [_answer("m1", "09:00:00")], "created_at": "09:00:00"}})
+    data = store.load()
+    data["2026-10-17"]["answers"].append(_answer("m2", "10:00:00", "second"))
+    store.save(data)
+    assert store.flush(timeout=5)
+    with open(store.log_path, encoding="utf-8") as fh:
+        old_log = fh.read()
+
+    data = store.load()
+    change(data["2026-10-17"]["answers"])
+    store.save(data)
+    assert store.flush(timeout=5) and not os.path.exists(store.log_path)
+    with open(store.log_path, "w", encoding="utf-8") as fh:
+        fh.write(old_log)
+    return JournalLogStore(path, dict).load()["2026-10-17"]["answers"]
+
+
+def test_journal_crash_after_snapshot_does_not_resurrect_deleted_answer(tmp_path):
+    answers = _crash_before_log_removal(tmp_path, lambda answers: answers.pop())
+    assert answers == [_answer("m1", "09:00:00")]
+
+
+def test_journal_crash_after_snapshot_does_not_duplicate_edited_answer(tmp_path):
+    def edit(answers):
+        answers[1]["answer"] = "edited"
+
+    answers = _crash_before_log_removal(tmp_path, edit)
+    assert [a["answer"] for a in answers] == ["a", "edited"]
+
+
+def test_journal_append_does_not_mutate_published_views(tmp_path):
+    """Appends replace the cached document; views taken earlier stay unchanged."""
+    store = JournalLogStore(str(tmp_path / "journal_data.json"), dict)
+    store.save({"2026-10-17": {"answers": [_answer("m1", "09:00:00")], "created_at": "09:00:00"}})
+    before = store.view()
+    day_before = before["2026-10-17"]
+
+    store.append("2026-10-17", _answer("m2", "10:00:00"))
+    store.append("2026-10-18", _answer("m1", "09:00:00"), created_at="09:00:00")
+    assert store.flush(timeout=5)
+
+    assert list(before) == ["2026-10-17"] and len(day_before["answers"]) == 1
+    after = store.view()
+    assert len(after["2026-10-17"]["answers"]) == 2 and "2026-10-18" in after
+    with open(store.log_path, encoding="utf-8") as fh:
+        assert len(fh.readlines()) == 3  # the first save was an append too
+
+
+def test_journal_replay_is_idempotent(tmp_path):
+    """A log left behind after compaction does not duplicate answers."""
+    path = str(tmp_path / "journal_data.json")
+    store = JournalLogStore(path, dict)
+    data = {"2026-10-17": {"answers": [_answer("m1", "09:00:00")], "created_at": "09:00:00"}}
+    store.save(data)
+    store.flush()
+    with open(store.log_path, encoding="utf-8") as fh:
+        log_text = fh.read()
+
+    store.compact()
+    store.flush()
+    # Simulate a crash between the snapshot replace and the log removal.
+    with open(store.log_path, "w", encoding="utf-8") as fh:
+        fh.write(log_text + '{"date": "2026-10-17", "entry": {"ques')
+
+    assert JournalLogStore(path, dict).load() == data
+
+
+def test_store_cache_hits_until_file_changes(tmp_path):
+    """Repeated loads hit the cache; an external edit forces a re-parse."""
+    path = str(tmp_path / "health_data.json")
+    store = JsonStore(path, dict)
+    store.save({"2026-10-17": [{"weight": 70.0}]})
+    store.flush()
+
+    assert store.load() == {"2026-10-17": [{"weight": 70.0}]}
+    assert store.view()["2026-10-17"][0]["weight"] == 70.0
+    assert store.misses == 0 and store.hits == 2
+
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"2026-10-18": []}, fh)
+    os.utime(path, ns=(0, 0))
+    assert "2026-10-18" in store.view()
+    assert store.misses == 1
+
+
+def test_store_load_returns_private_copy(tmp_path):
+    """Mutating a loaded document does not leak into the cache."""
+    store = JsonStore(str(tmp_path / "journal_data.json"), dict)
+    store.save({"2026-10-17": {"answers": []}})
+
+    data = store.load()
+    data["2026-10-17"]["answers"].append("x")
+
+    assert store.load() == {"2026-10-17": {"answers": []}}
+    assert isinstance(store.view()["2026-10-17"]["answers"], Sequence)
+
+
+def test_write_behind_coalesces_saves(tmp_path):
+    """Saves queued while the writer is busy collapse into one write."""
+    path = str(tmp_path / "config.json")
+    writes = []
+
+    class CountingStore(JsonStore):
+        def _execute(self, op):
+            writes.append(op)
+            super()._execute(op)
+
+    store = CountingStore(path, dict)
+    with config_manager._io_lock:
+        for i in range(5):
+            store.save({"n": i})
+        assert store.load() == {"n": 4}
+    assert store.flush(timeout=5)
+
+    assert len(writes) <= 2
+    with open(path, encoding="utf-8") as fh:
+        assert json.load(fh) == {"n": 4}
+
+
+def test_write_errors_reach_handler(tmp_path):
+    """A failed background write is reported and the cache keeps the data."""
+    errors = []
+    config_manager.set_persistence_error_handler(lambda p, exc: errors.append(p))
+    try:
+        path = str(tmp_path / "missing_dir" / "config.json")
+        store = JsonStore(path, dict)
+        store.save({"a": 1})
+        assert store.flush(timeout=5)
+    finally:
+        config_manager.set_persistence_error_handler(None)
+
+    assert errors == [path]
+    assert store.load() == {"a": 1}
+
+
+def test_legacy_file_is_upgraded_once(tmp_path):
+    """A v1 file is migrated on first load and rewritten in the envelope."""
+    path = str(tmp_path / "health_data.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"2026-04-01": {"weight": "70"}, "version": 1}, fh)
+    calls = []
+
+    def migrate(data):
+        calls.append(1)
+        return migrate_health_data(data)
+
+    store = JsonStore(path, dict, schema_version=SCHEMA_VERSION, migrate=migrate)
+    assert store.load() == {"2026-04-01": [{"weight": 70.0}]}
+    assert store.flush(timeout=5)
+    with open(path, encoding="utf-8") as fh:
+        assert json.load(fh) == {"version": SCHEMA_VERSION, "data": {"2026-04-01": [{"weight": 70.0}]}}
+
+    fresh = JsonStore(path, dict, schema_version=SCHEMA_VERSION, migrate=migrate)
+    assert "version" not in fresh.load()
+    assert calls == [1]
+
+
+def test_backups_rotate_prune_and_restore(tmp_path):
+    """Each rewrite keeps the previous file as a generation, capped by policy."""
+    path = str(tmp_path / "config.json")
+    store = JsonStore(path, dict, write_behind=False, backup_policy=BackupPolicy(max_count=2))
+    for i in range(4):
+        store.save({"n": i})
+
+    generations = store.backups.generations()
+    assert len(generations) == 2
+    with open(generations[0][0], encoding="utf-8") as fh:
+        assert json.load(fh) == {"n": 2}
+
+    store.restore(generations[1][0])
+    assert store.load() == {"n": 1}
+
+
+def test_corrupt_file_falls_back_to_backup(tmp_path):
+    """A truncated primary file is read from the newest valid generation."""
+    path = str(tmp_path / "health_data.json")
+    store = JsonStore(path, dict, write_behind=False, schema_version=SCHEMA_VERSION)
+    store.save({"2026-10-16": [{"weight": 70.0}]})
+    store.save({"2026-10-17": [{"weight": 69.5}]})
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("")
+
+    fresh = JsonStore(path, dict, schema_version=SCHEMA_VERSION)
+    assert fresh.load() == {"2026-10-16": [{"weight": 70.0}]}
+
+
+def test_group_commit_batches_fsync(tmp_path, monkeypatch):
+    """Saves inside one group-commit window share a single fsync pass."""
+    synced = []
+    monkeypatch.setattr(config_manager, "_fsync_file", synced.append)
+    path = str(tmp_path / "health_data.json")
+    store = JsonStore(path, dict, durability="group-commit", group_commit_ms=60_000)
+    for i in range(3):
+        store.save({"n": i})
+    assert store.flush(timeout=5)
+    assert synced == [path]
+
+    store.save({"n": 3})
+    assert store.flush(timeout=5)
+    assert synced == [path, path]
+
+
+def test_every_write_syncs_before_replace(tmp_path, monkeypatch):
+    """``every-write`` fsyncs the data before it is renamed into place."""
+    calls = []
+    real_fsync, real_replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: (calls.append("fsync"), real_fsync(fd)))
+    monkeypatch.setattr(os, "replace", lambda a, b: (calls.append("replace"), real_replace(a, b)))
+    store = JsonStore(str(tmp_path / "config.json"), dict, write_behind=False, durability="every-write")
+    store.save({"a": 1})
+    assert calls[:2] == ["fsync", "replace"]
+
+
+def test_codecs_roundtrip_and_autodetect(tmp_path):
+    """Every codec round-trips; reads detect the format from the header."""
+    path = str(tmp_path / "health_data.json")
+    doc = {"2026-10-17": [{"time": "08:00:00", "weight": 70.0, "note": "早"}]}
+    for name in config_manager.CODECS:
+        JsonStore(path, dict, write_behind=False, schema_version=SCHEMA_VERSION, codec=name).save(doc)
+        assert JsonStore(path, dict, schema_version=SCHEMA_VERSION).load() == doc
+
+    with open(path, "rb") as fh:
+        assert fh.read().startswith(config_manager.BinaryRecordCodec.magic)
+    config_manager.convert_file(path, "json-compact")
+    with open(path, encoding="utf-8") as fh:
+        assert json.load(fh) == {"version": SCHEMA_VERSION, "data": doc}
+
+
+def test_binary_codec_is_opt_in():
+    """Files named .json are written as JSON unless the config asks for binary."""
+    try:
+        applied = config_manager.configure_codecs({})
+        assert applied["health"] == applied["journal"] == "json-compact"
+        applied = config_manager.configure_codecs({"storage": {"codecs": {"health": "binary"}}})
+        assert applied["health"] == "binary" and applied["journal"] == "json-compact"
+    finally:
+        config_manager.configure_codecs({})
+
+
+def test_truncated_binary_file_falls_back(tmp_path):
+    """A torn binary file is treated as corrupt, not as an empty document."""
+    path = str(tmp_path / "journal_data.json")
+    store = JsonStore(path, dict, write_behind=False, codec="binary")
+    store.save({"2026-10-16": {"answers": []}})
+    store.save({"2026-10-17": {"answers": []}})
+    with open(path, "rb+") as fh:
+        fh.truncate(os.path.getsize(path) - 3)
+
+    assert JsonStore(path, dict).load() == {"2026-10-16": {"answers": []}}
+
+
+def test_latest_answer_index_tracks_writes_and_staleness(tmp_path):
+    """Appends update the index; a changed journal fingerprint forces a rebuild."""
+    journal = JournalLogStore(str(tmp_path / "journal_data.json"), dict)
+    engine = config_manager.JsonStorageEngine(JsonStore(str(tmp_path / "health_data.json"), dict), journal)
+    index = config_manager.LatestAnswerIndex(
+        JsonStore(str(tmp_path / "latest_answers.json"), lambda: {"source": None, "answers": {}})
+    )
+    engine.append_journal_answer("2026-10-16", _answer("s1", "09:00:00", "old"))
+    assert index.ensure(engine)  # missing -> rebuilt
+
+    engine.append_journal_answer("2026-10-17", _answer("s1", "10:00:00", "new"))
+    index.record("2026-10-17", _answer("s1", "10:00:00", "new"))
+    index.record("2026-10-15", _answer("s1", "08:00:00", "older"))
+    assert index.answers(["s1", "s2"]) == {"s1": "new"}
+    assert index.get("s1") == {"answer": "new", "date": "2026-10-17", "answered_at": "10:00:00"}
+
+    assert index.seal(engine, timeout=5)
+    assert not index.ensure(engine)  # fingerprint matches -> trusted as is
+
+    journal.save({"2026-10-17": {"answers": [_answer("s2", "11:00:00", "edited")], "created_at": ""}})
+    assert index.ensure(engine)
+    assert index.answers(["s1", "s2"]) == {"s2": "edited"}
+
+
+def test_latest_answer_index_rebuilds_lazily_after_whole_saves(tmp_path):
+    """Whole-document saves only mark the index stale; one lookup rebuilds it."""
+    journal = JournalLogStore(str(tmp_path / "journal_data.json"), dict)
+    engine = config_manager.JsonStorageEngine(JsonStore(str(tmp_path / "health_data.json"), dict), journal)
+    index = config_manager.LatestAnswerIndex(
+        JsonStore(str(tmp_path / "latest_answers.json"), lambda: {"source": None, "answers": {}})
+    )
+    index.ensure(engine)
+    sealed = index.store.view()["source"]
+    rebuilds = []
+    real_rebuild = index.rebuild
+    index.rebuild = lambda *args: rebuilds.append(1) or real_rebuild(*args)
+
+    for text in ("a", "b", "c"):
+        engine.save_journal({"2026-10-17": {"answers": [_answer("s1", "09:00:00", text)], "created_at": ""}})
+        index.mark_stale()
+    assert rebuilds == [] and index.seal(engine, timeout=5) and engine.flush(timeout=5)
+    assert index.store.view()["source"] == sealed != engine.journal_fingerprint()  # stale: not sealed
+
+    assert index.usable(engine) and index.answers(["s1"]) == {"s1": "c"}
+    assert index.usable(engine) and rebuilds == [1]
@@ -0,0 +1,75 @@
+import io
+import os
+import sys
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import data_transfer
+
+
+def _answer(qid, at, text="a"):
+    return {"question_id": qid, "answered_at": at, "answer": text}
+
+
+def test_export_streams_filtered_rows(monkeypatch):
+    health = {
+        "2026-10-15": [{"time": "08:00:00", "weight": 70.0}],
+        "2026-10-16": [{"time": "08:00:00", "weight": 69.5, "bp_high": 120.0}],
+    }
+    monkeypatch.setattr(data_transfer, "view_health_data", lambda: health)
+    out = io.StringIO()
+    rows = data_transfer.iter_rows("health", date_from="2026-10-16")
+    assert data_transfer.write_rows(rows, out, "csv", "health") == 1
+    assert out.getvalue() == "date,time,weight,bp_high,bp_low,heart_rate\n2026-10-16,08:00:00,69.5,120.0,,\n"
+
+
+def test_import_dedups_and_saves_once(monkeypatch):
+    journal = {"2026-10-16": {"answers": [_answer("m1", "09:00:00")], "created_at": "09:00:00"}}
+    saves = []
+    monkeypatch.setattr(data_transfer, "view_journal_data", lambda: journal)
+    monkeypatch.setattr(data_transfer, "load_journal_data",
+                        lambda: {d: {**day, "answers": list(day["answers"])} for d, day in journal.items()})
+    monkeypatch.setattr(data_transfer, "save_journal_data", saves.append)
+
+    lines = [
+        '{"date": "2026-10-16", "question_id": "m1", "answered_at": "09:00:00", "answer": "a"}',
+        '{"date": "2026-10-16", "question_id": "m2", "answered_at": "10:00:00", "answer": "b"}',
+        '{"date": "2026-10-17", "question_id": "m2", "answered_at": "08:00:00", "answer": "c"}',
+        '{"date": "2026-10-17", "question_id": "m2", "answered_at": "08:00:00", "answer": "c"}',
+        '{"date": "oops", "question_id": "m3", "answer": "d"}',
+    ]
+    stats = data_transfer.import_rows("journal", data_transfer.read_rows(io.StringIO("\n".join(lines)), "jsonl"))
+
+    assert stats == {"added": 2, "duplicates": 2, "invalid": 1}
+    assert len(saves) == 1
+    assert [e["question_id"] for e in saves[0]["2026-10-16"]["answers"]] == ["m1", "m2"]
+    assert saves[0]["2026-10-17"]["answers"] == [_answer("m2", "08:00:00", "c")]
+
+
+def test_json_documents_are_parsed_whole():
+    assert data_transfer._detect_format("backup.json", None) == "json"
+    array = '[{"date": "2026-10-16", "weight": 70.0}]'
+    dataset = '{"version": 2, "data": {"2026-10-16": [{"weight": 70.0}], "2026-10-17": {"answers": [{"question_id": "m1"}]}}}'
+    assert list(data_transfer.read_rows(io.StringIO(array), "json")) == [{"date": "2026-10-16", "weight": 70.0}]
+    assert list(data_transfer.read_rows(io.StringIO(dataset), "json")) == [
+        {"date": "2026-10-16", "weight": 70.0}, {"date": "2026-10-17", "question_id": "m1"}]
+
+
+def test_health_records_without_time_are_deduped_by_content(monkeypatch):
+    health = {"2026-10-16": [{"weight": 70.0}]}
+    saves = []
+    monkeypatch.setattr(data_transfer, "view_health_data", lambda: health)
+    monkeypatch.setattr(data_transfer, "load_health_data", lambda: {d: list(r) for d, r in health.items()})
+    monkeypatch.setattr(data_transfer, "save_health_data", saves.append)
+
+    lines = [
+        '{"date": "2026-10-16", "weight": 70.0}',
+        '{"date": "2026-10-16", "heart_rate": 64}',
+        '{"date": "2026-10-16", "bp_high": 118, "bp_low": 76}',
+        '{"date": "2026-10-16", "heart_rate": 64}',
+    ]
+    stats = data_transfer.import_rows("health", data_transfer.read_rows(io.StringIO("\n".join(lines)), "jsonl"))
+
+    assert stats == {"added": 2, "duplicates": 2, "invalid": 0}
+    assert len(saves[0]["2026-10-16"]) == 3
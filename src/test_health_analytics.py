@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import health_analytics
+
+HEALTH = {
+    "2026-10-05": [{"time": "08:00:00", "weight": 71.0, "heart_rate": 60.0}],  # Monday
+    "2026-10-06": [
+        {"time": "20:00:00", "weight": 70.0},
+        {"time": "07:00:00", "weight": 72.0, "bp_high": 120.0, "bp_low": 80.0},
+    ],
+    "2026-10-12": [{"weight": 69.0, "heart_rate": "bad"}],  # next Monday, no time
+}
+
+
+@pytest.fixture
+def health(monkeypatch):
+    state = {"version": 1, "data": HEALTH}
+    monkeypatch.setattr(health_analytics, "view_health_data", lambda: state["data"])
+    monkeypatch.setattr(health_analytics, "get_health_version", lambda: state["version"])
+    health_analytics.clear_cache()
+    return state
+
+
+def test_series_is_sorted_with_nan_for_missing(health):
+    series = health_analytics.load_series()
+    assert series.timestamps[1] == np.datetime64("2026-10-06T07:00:00")
+    assert series["weight"].tolist() == [71.0, 72.0, 70.0, 69.0]
+    assert np.isnan(series["heart_rate"][1:]).all()
+    with pytest.raises(ValueError):
+        series["weight"][0] = 0.0  # cached arrays are shared read-only
+
+
+def test_resample_weeks_start_on_monday(health):
+    weeks, means = health_analytics.resample("W", "mean", ["weight", "bp_high"])
+    assert weeks.tolist() == [np.datetime64("2026-10-05", "D").item(), np.datetime64("2026-10-12", "D").item()]
+    assert means["weight"].tolist() == [71.0, 69.0]
+    assert means["bp_high"][0] == 120.0 and np.isnan(means["bp_high"][1])
+    _, last = health_analytics.resample("D", "last", ["weight"])
+    assert last["weight"].tolist() == [71.0, 70.0, 69.0]
+
+
+def test_rolling_spans_calendar_days(health):
+    days, out = health_analytics.rolling(windows=(2, 7), stats=("mean", "max", "std"), metrics=["weight"])
+    assert len(days) == 8  # 10-05 .. 10-12 inclusive
+    assert out[("weight", 2, "mean")][1] == pytest.approx(71.0)  # (71 + 71) / 2
+    assert np.isnan(out[("weight", 2, "mean")][3])  # 10-07, 10-08: no data
+    assert out[("weight", 7, "max")][-1] == 71.0
+    assert out[("weight", 7, "std")][-1] == pytest.approx(np.std([71.0, 69.0]))
+
+
+def test_cache_follows_health_version(health):
+    first = health_analytics.percentiles((50,), ["weight"])
+    assert health_analytics.percentiles((50,), ["weight"]) is first
+
+    health["data"] = {"2026-10-20": [{"weight": 60.0}]}
+    assert health_analytics.percentiles((50,), ["weight"]) is first  # same version
+    health["version"] = 2
+    assert health_analytics.percentiles((50,), ["weight"])["weight"].tolist() == [60.0]
+
+    _, delta = health_analytics.week_over_week(["weight"])
+    assert np.isnan(delta["weight"]).all()
@@ -0,0 +1,56 @@
+import io
+import os
+import sys
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import health_import
+
+APPLE_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<HealthData locale="en_US">
+ <Me HKCharacteristicTypeIdentifierDateOfBirth=""/>
+ <Record type="HKQuantityTypeIdentifierBodyMass" unit="lb" value="154.3" startDate="2026-10-16 07:30:00 +0800"/>
+ <Record type="HKQuantityTypeIdentifierStepCount" unit="count" value="120" startDate="2026-10-16 07:31:00 +0800"/>
+ <Correlation type="HKCorrelationTypeIdentifierBloodPressure" startDate="2026-10-16 08:00:00 +0800">
+  <Record type="HKQuantityTypeIdentifierBloodPressureSystolic" unit="mmHg" value="121" startDate="2026-10-16 08:00:00 +0800"/>
+  <Record type="HKQuantityTypeIdentifierBloodPressureDiastolic" unit="mmHg" value="79" startDate="2026-10-16 08:00:00 +0800"/>
+ </Correlation>
+</HealthData>
+"""
+
+
+def test_apple_xml_streams_mapped_readings():
+    readings = list(health_import.parse_apple_health(io.BytesIO(APPLE_XML)))
+    assert readings == [
+        ("2026-10-16", "07:30:00", "weight", 69.99),
+        ("2026-10-16", "08:00:00", "bp_high", 121.0),
+        ("2026-10-16", "08:00:00", "bp_low", 79.0),
+    ]
+
+
+def test_csv_import_merges_by_timestamp_across_batches(monkeypatch):
+    store = {"data": {"2026-10-15": [{"time": "08:00:00", "weight": 70.0}]}}
+    saves = []
+    monkeypatch.setattr(health_import, "view_health_data", lambda: store["data"])
+
+    def save(days):
+        saves.append(sorted(days))
+        store["data"] = {**store["data"], **days}
+
+    monkeypatch.setattr(health_import, "save_health_days", save)
+    text = (
+        "Measurement Date,Systolic (mmHg),Diastolic (mmHg),Pulse (bpm)\n"
+        "2026/10/15 08:00,120,80,61\n"
+        "2026/10/16 21:10,118,77,\n"
+        "not a date,1,2,3\n"
+    )
+    readings = health_import.parse_csv(io.StringIO(text))
+    stats = health_import.import_readings(readings, batch_size=1)
+
+    assert stats == {"readings": 5, "added": 1, "merged": 1, "unchanged": 0}
+    assert saves == [["2026-10-15"], ["2026-10-16"]]  # each batch writes only its own dates
+    assert store["data"]["2026-10-15"] == [
+        {"time": "08:00:00", "weight": 70.0, "bp_high": 120.0, "bp_low": 80.0, "heart_rate": 61.0}
+    ]
+    assert store["data"]["2026-10-16"] == [{"time": "21:10:00", "bp_high": 118.0, "bp_low": 77.0}]
@@ -0,0 +1,89 @@
+import os
+import sys
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import journal_search
+from journal_search import SearchIndex, tokenize
+
+
+def _answer(qid, at, text):
+    return {"question_id": qid, "answered_at": at, "answer": text}
+
+
+def test_tokenize_mixes_bigrams_and_words():
+    assert tokenize("今天很累, Python 3!") == ["今天", "天很", "很累", "python", "3"]
+
+
+def test_search_ranks_and_filters_by_date(tmp_path):
+    """AND semantics, BM25 ranking, inclusive date bounds, persisted log replay."""
+    index = SearchIndex(str(tmp_path / "journal_index.json"))
+    index.add("2026-10-01", _answer("d1", "09:00:00", "工作很累，想早点休息"))
+    index.add("2026-10-02", _answer("d2", "10:00:00", "refactor python code, 工作顺利"))
+    index.add("2026-10-03", _answer("d1", "11:00:00", "工作 工作 工作 python"))
+    assert not index.add("2026-10-03", _answer("d1", "11:00:00", "工作 工作 工作 python"))
+
+    assert [hit[1] for hit in index.search("工作")] == ["2026-10-03", "2026-10-02", "2026-10-01"]
+    assert [hit[1] for hit in index.search("python 工作", date_to="2026-10-02")] == ["2026-10-02"]
+    assert [hit[1] for hit in index.search("累")] == ["2026-10-01"]
+    assert index.search("休假") == []
+
+    index.flush(timeout=5)
+    reopened = SearchIndex(index.path)
+    assert not reopened.load()  # no snapshot yet, only the log
+
+    index.rebuild({"2026-10-01": {"answers": [_answer("d1", "09:00:00", "工作很累")]}})
+    index.add("2026-10-04", _answer("d3", "08:00:00", "python again"))
+    index.flush(timeout=5)
+    reopened = SearchIndex(index.path)
+    assert reopened.load()
+    assert len(reopened) == 2
+    assert reopened.search("python")[0][1:] == ("2026-10-04", "08:00:00", "d3")
+    assert [hit[1] for hit in reopened.search("累")] == ["2026-10-01"]  # char map rebuilt on load
+
+
+def test_ensure_index_ignores_unindexable_answers(monkeypatch):
+    """Non-text and duplicate answers are not indexed, so they do not make the index look stale."""
+    journal = {"2026-10-01": {"answers": [
+        _answer("d1", "09:00:00", "工作很累"), _answer("m1", "10:00:00", 7), _answer("d1", "09:00:00", "工作很累"),
+    ]}}
+    index = SearchIndex()
+    index.rebuild(journal)
+    rebuilt = []
+    monkeypatch.setattr(journal_search, "_index", index)
+    monkeypatch.setattr(journal_search, "view_journal_data", lambda: journal)
+    monkeypatch.setattr(index, "rebuild", rebuilt.append)
+
+    journal_search.ensure_index()
+    assert rebuilt == [] and len(index) == 1
+
+
+def test_edit_plus_add_is_detected_and_rebuilt(tmp_path, monkeypatch):
+    """Same answer count, different content: the digest differs, so the index is rebuilt."""
+    journal = {"2026-10-01": {"answers": [_answer("d1", "09:00:00", "工作很累"), _answer("d2", "10:00:00", "休息")]}}
+    index = SearchIndex(str(tmp_path / "journal_index.json"))
+    index.rebuild(journal)
+    index.flush(timeout=5)
+    monkeypatch.setattr(journal_search, "_index", index)
+    monkeypatch.setattr(journal_search, "view_journal_data", lambda: journal)
+
+    # Delete one answer, edit the other, add a new one: the count is unchanged.
+    journal["2026-10-01"]["answers"] = [_answer("d1", "09:00:00", "心情很好"), _answer("d3", "11:00:00", "散步")]
+    journal_search.ensure_index()
+
+    assert [hit["answer"] for hit in journal_search.search_journal("很好")] == ["心情很好"]
+    assert journal_search.search_journal("很累") == [] and journal_search.search_journal("休息") == []
+    index.flush(timeout=5)
+    reopened = SearchIndex(index.path)
+    assert reopened.load() and reopened.digest == journal_search.journal_digest(journal)
+
+
+def test_search_skips_hits_whose_answer_was_deleted(monkeypatch):
+    journal = {"2026-10-01": {"answers": [_answer("d1", "09:00:00", "工作很累")]}}
+    index = SearchIndex()
+    index.rebuild(journal)
+    monkeypatch.setattr(journal_search, "_index", index)
+    monkeypatch.setattr(journal_search, "view_journal_data", lambda: {})
+
+    assert journal_search.search_journal("工作") == []
@@ -0,0 +1,53 @@
+import os
+import sys
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import obsidian_export
+from config_manager import JsonStore
+from obsidian_export import VaultExporter
+
+
+def _exporter(tmp_path, monkeypatch, journal, health):
+    monkeypatch.setattr(obsidian_export, "view_journal_data", lambda: journal)
+    monkeypatch.setattr(obsidian_export, "view_health_data", lambda: health)
+    state = JsonStore(str(tmp_path / "state.json"), lambda: {"target": None, "days": {}}, write_behind=False)
+    return VaultExporter(str(tmp_path / "vault"), "WH", state_store=state)
+
+
+def test_only_changed_days_are_rewritten(tmp_path, monkeypatch):
+    journal = {"2026-10-16": {"answers": [{"question_id": "m1", "question_zh": "今天最重要的事？",
+                                            "answered_at": "09:00:00", "answer": "写代码"}]}}
+    health = {"2026-10-16": [{"time": "08:00:00", "weight": 70.5}], "2026-10-17": [{"weight": 70.0}]}
+    exporter = _exporter(tmp_path, monkeypatch, journal, health)
+
+    assert exporter.export() == {"written": 2, "unchanged": 0, "removed": 0}
+    with open(exporter.note_path("2026-10-16"), encoding="utf-8") as fh:
+        note = fh.read()
+    assert "### 09:00:00 · 今天最重要的事？" in note and "| 08:00:00 | 70.5 | — | — | — |" in note
+
+    health["2026-10-17"].append({"weight": 69.8})
+    assert exporter.export() == {"written": 1, "unchanged": 1, "removed": 0}
+    assert exporter.export(["2026-10-16"]) == {"written": 0, "unchanged": 1, "removed": 0}
+
+    del health["2026-10-17"]
+    assert exporter.export() == {"written": 0, "unchanged": 1, "removed": 1}
+    assert not os.path.exists(exporter.note_path("2026-10-17"))
+
+
+def test_full_rewrite_removes_notes_it_did_not_write(tmp_path, monkeypatch):
+    health = {"2026-10-16": [{"weight": 70.5}], "2026-10-17": [{"weight": 70.0}]}
+    exporter = _exporter(tmp_path, monkeypatch, {}, health)
+    exporter.export()
+    del health["2026-10-17"]
+    exporter.state_store.save({"target": None, "days": {}})  # watermark lost
+    other = os.path.join(exporter.target, "2026", "notes.md")
+    own_daily = os.path.join(exporter.target, "2026", "2026-10-15.md")  # user's note, same name pattern
+    for path in (other, own_daily):
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("---\ntags: [daily]\n---\n\nmine\n")
+
+    assert exporter.export(rewrite=True) == {"written": 1, "unchanged": 0, "removed": 1}
+    assert not os.path.exists(exporter.note_path("2026-10-17"))
+    assert os.path.exists(other) and os.path.exists(own_daily)
@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import questions
+from config_manager import JsonStore
+from questions import QuestionScheduler, _Fenwick, get_question_by_id, get_questions_for_phase
+
+
+def _scheduler(tmp_path, clock, seed=42):
+    store = JsonStore(str(tmp_path / "question_state.json"),
+                      lambda: {"day": None, "shown_today": [], "questions": {}})
+    return QuestionScheduler(store, seed=seed, now=lambda: clock[0])
+
+
+def test_fenwick_find_follows_weights():
+    tree = _Fenwick([1.0, 0.0, 3.0])
+    assert tree.total() == 4.0
+    assert [tree.find(r) for r in (0.0, 0.99, 1.0, 3.99)] == [0, 0, 2, 2]
+    tree.update(1, 2.0)
+    assert tree.find(1.5) == 1 and tree.total() == 6.0
+
+
+def test_no_repeats_within_a_day_and_seeded(tmp_path):
+    clock = [datetime(2026, 10, 17, 9, 0)]
+    n = len(get_questions_for_phase("morning"))
+    first = [_scheduler(tmp_path / "a", clock).pick()["id"] for _ in range(1)]
+    sched = _scheduler(tmp_path / "b", clock)
+    picks = [sched.pick()["id"] for _ in range(n)]
+
+    assert len(set(picks)) == n  # every question once before any repeat
+    assert picks[0] == first[0]  # same seed, same sequence
+    assert sched.pick()["id"] in picks  # exhausted -> reopened
+
+
+def test_state_survives_restart_and_rolls_over(tmp_path):
+    clock = [datetime(2026, 10, 17, 9, 0)]
+    sched = _scheduler(tmp_path, clock)
+    shown = sched.pick()["id"]
+    sched.mark_answered(shown)
+    assert sched.store.flush(timeout=5)
+
+    restarted = _scheduler(tmp_path, clock, seed=1)
+    assert restarted.shown_today() == [shown]
+    entry = restarted.store.view()["questions"][shown]
+    assert entry["answers"] == 1 and entry["shown"] == "2026-10-17T09:00:00"
+
+    clock[0] = datetime(2026, 10, 18, 9, 0)
+    assert restarted.shown_today() == []
+    # answered yesterday: still inside its 2-day interval, so down-weighted
+    assert QuestionScheduler._weight(entry, clock[0]) == 2.0 * 0.25
+
+
+def _bank_dir(tmp_path, monkeypatch):
+    bank_dir = tmp_path / "bank"
+    bank_dir.mkdir()
+    shutil.copy(os.path.join(questions.QUESTION_BANK_DIR, questions.DEFAULT_BANK), bank_dir)
+    monkeypatch.setattr(questions, "QUESTION_BANK_DIR", str(bank_dir))
+    monkeypatch.setattr(questions, "RELOAD_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(questions, "_bank_state", None)
+    return bank_dir
+
+
+def _write_pack(path, pack):
+    path.write_text(json.dumps(pack, ensure_ascii=False), encoding="utf-8")
+
+
+def test_records_keep_dict_style_access():
+    q = get_question_by_id("s1")
+    assert q["id"] == "s1" and q["icon"] and q["game_role"] and q.phase == "synthesis"
+    assert q.get("en", "") == "" and "en" not in q
+    assert get_question_by_id("d1")["time"] == "11:00"
+    assert get_question_by_id("nope") is None
+    assert len(questions.ALL_QUESTIONS) == sum(len(get_questions_for_phase(p)) for p in questions.PHASES)
+    assert [q["id"] for q in questions.SYNTHESIS_QUESTIONS] == [f"s{i}" for i in range(1, 7)]
+
+
+def test_user_pack_adds_and_overrides(tmp_path, monkeypatch):
+    bank_dir = _bank_dir(tmp_path, monkeypatch)
+    morning = len(get_questions_for_phase("morning"))
+    _write_pack(bank_dir / "mine.json", {
+        "morning": [{"id": "u1", "zh": "今天最想逃避什么？"}, {"id": "m1", "zh": "改写的问题"}],
+        "evening": [{"id": "bad"}],  # no text: skipped
+    })
+    (bank_dir / "broken.json").write_text("{", encoding="utf-8")
+
+    ids = questions.get_question_ids_for_phase("morning")
+    assert len(ids) == morning + 1 and ids[-1] == "u1"
+    assert get_question_by_id("m1")["zh"] == "改写的问题"
+    assert get_question_by_id("bad") is None
+
+
+def test_hot_reload_rebuilds_scheduler(tmp_path, monkeypatch):
+    bank_dir = _bank_dir(tmp_path, monkeypatch)
+    _write_pack(bank_dir / "default.json", {"morning": [{"id": "a", "zh": "甲"}]})
+    clock = [datetime(2026, 10, 17, 9, 0)]
+    sched = _scheduler(tmp_path, clock)
+    assert sched.pick()["id"] == "a"
+    version = questions.question_bank_version()
+
+    _write_pack(bank_dir / "default.json", {"morning": [{"id": "a", "zh": "甲"}, {"id": "b", "zh": "乙乙"}]})
+    assert questions.question_bank_version() == version + 1
+    assert sched.pick()["id"] == "b"  # "a" already shown today
+
+
+def test_get_scheduler_uses_the_given_state_file(tmp_path):
+    path = str(tmp_path / "state" / "question_state.json")
+    os.makedirs(os.path.dirname(path))
+    sched = questions.get_scheduler(path)
+    assert questions.get_scheduler(path) is sched
+    assert sched.pick() is not None
+    assert sched.store.flush(timeout=5) and os.path.exists(path)
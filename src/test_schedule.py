@@ -0,0 +1,104 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import schedule
+from schedule import Profile, build_schedule, compile_schedule, invalidate_schedule, parse_days, parse_hhmm
+from simulation import Simulation
+
+POMODORO = {
+    "default": {"work_duration": 25, "rest_duration": 5},
+    "morning_routine": {"enabled": True, "start_time": "05:00", "end_time": "10:00",
+                        "work_duration": 10, "rest_duration": 5},
+    "profiles": {
+        "deep_work": {"work_duration": 50, "rest_duration": 10,
+                      "windows": [{"start": "09:00", "end": "12:00", "days": "weekdays"},
+                                  {"start": "14:00", "end": "17:30", "days": ["mon", "wed"]}]},
+        "night": {"work_duration": 20, "windows": [{"start": "22:00", "end": "02:00", "days": "weekends"}]},
+        "lazy": {"work_duration": 15, "rest_duration": 15, "windows": [{"start": "00:00", "end": "24:00", "days": "holidays"}]},
+    },
+    "holidays": ["2026-10-14"],
+}
+
+
+def _at(text):
+    return datetime.fromisoformat(text)
+
+
+def test_lookup_returns_profile_and_next_boundary():
+    sched = build_schedule(POMODORO)
+    # Monday 2026-10-12: morning routine wins the 09:00-10:00 overlap (listed first)
+    assert sched.lookup(_at("2026-10-12T04:00")) == (Profile("default", 25, 5), _at("2026-10-12T05:00"))
+    assert sched.lookup(_at("2026-10-12T09:30"))[0].name == "morning_routine"
+    assert sched.lookup(_at("2026-10-12T10:00")) == (Profile("deep_work", 50, 10), _at("2026-10-12T12:00"))
+    assert sched.lookup(_at("2026-10-12T15:00"))[1] == _at("2026-10-12T17:30")
+    # Tuesday afternoon is not a deep-work window
+    assert sched.lookup(_at("2026-10-13T15:00")) == (Profile("default", 25, 5), _at("2026-10-14T00:00"))
+    # Wednesday is a holiday: weekday windows are off, daily ones (morning routine) still apply
+    assert sched.lookup(_at("2026-10-14T09:30")) == (Profile("morning_routine", 10, 5), _at("2026-10-14T10:00"))
+    assert sched.lookup(_at("2026-10-14T11:00")) == (Profile("lazy", 15, 15), _at("2026-10-15T00:00"))
+
+
+def test_overnight_window_spills_into_the_next_day():
+    sched = build_schedule(POMODORO)
+    assert sched.lookup(_at("2026-10-17T23:00")) == (Profile("night", 20, 5), _at("2026-10-18T02:00"))
+    assert sched.profile_at(_at("2026-10-18T01:59")).name == "night"  # Sunday, from Saturday's window
+    assert sched.profile_at(_at("2026-10-19T01:00")).name == "night"  # Monday, from Sunday's window
+    assert sched.profile_at(_at("2026-10-19T02:00")).name == "default"
+    assert sched.profile_at(_at("2026-10-17T01:00")).name == "default"  # Friday's 22:00 is not a weekend
+    assert sched.lookup(_at("2026-10-18T23:30"))[1] == _at("2026-10-19T02:00")
+
+
+def test_constant_and_distant_holiday_boundaries():
+    assert build_schedule({"default": {"work_duration": 30}}).lookup(_at("2026-10-12T12:00")) == (
+        Profile("default", 30, 5), None)
+    holiday_only = {"profiles": POMODORO["profiles"] | {"deep_work": {"windows": []}, "night": {"enabled": False}},
+                    "holidays": ["2027-01-01"]}
+    assert build_schedule(holiday_only).lookup(_at("2026-10-12T12:00"))[1] == _at("2027-01-01T00:00")
+
+
+def test_invalid_windows_are_skipped(caplog):
+    sched = build_schedule({
+        "profiles": {"bad": {"windows": [{"start": "25:00", "end": "26:00"}, {"start": "09:00", "end": "10:00", "days": "someday"}]}},
+        "holidays": ["not-a-date"],
+    })
+    assert sched.windows == () and sched.lookup(_at("2026-10-12T09:30"))[1] is None
+    assert caplog.text.count("Error parsing") == 3
+    assert parse_hhmm("24:00") == 86400 and parse_days(["weekends", "mon"]) == {0, 5, 6}
+    with pytest.raises(ValueError):
+        parse_hhmm("24:30")
+
+
+def test_compile_schedule_recompiles_on_change():
+    cfg = {"default": {"work_duration": 25}, "morning_routine": {"enabled": False}}
+    first = compile_schedule(cfg)
+    assert compile_schedule(cfg) is first
+    assert compile_schedule(dict(cfg)) is not first  # a reloaded config is a new object
+    cfg["morning_routine"] = {"enabled": True, "start_time": "05:00", "end_time": "10:00", "work_duration": 10}
+    invalidate_schedule()
+    assert compile_schedule(cfg) is not first
+    assert compile_schedule(cfg).profile_at(_at("2026-10-12T06:00")).name == "morning_routine"
+    assert schedule._compiled[1] is compile_schedule(cfg)
+
+
+def test_monitor_switches_mode_exactly_at_the_boundary():
+    config = {"pomodoro": {"default": {"work_duration": 25, "rest_duration": 1},
+                           "morning_routine": {"enabled": True, "start_time": "05:00", "end_time": "10:00",
+                                               "work_duration": 10, "rest_duration": 1}}}
+    sim = Simulation(config, _at("2026-10-12T04:50"))
+    trace = sim.run(_at("2026-10-12T10:30"))
+    events = [(row["time"][11:], row["event"]) for row in trace]
+
+    # 25-minute round started at 04:50 is cut to the 10-minute morning length at 05:00
+    assert events[:2] == [("05:00:00", "mode"), ("05:10:00", "prompt")]
+    prompts = [t for t, e in events if e == "prompt"]
+    assert prompts[1] == "05:21:35"  # 5 s reaction + 1 min rest + 30 s answer, then 10 min work
+    # 10:00 falls inside a break: the mode switches on time, the next round gets the full 25 minutes
+    i = events.index(("10:00:00", "mode"))
+    assert events[i - 1:i + 3] == [("09:59:40", "rest"), ("10:00:00", "mode"), ("10:01:10", "work"), ("10:26:10", "prompt")]
+    assert sim.monitor.mode_name == "default"
@@ -0,0 +1,105 @@
+import os
+import sys
+from datetime import date, datetime
+
+import pytest
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from clock import SimulatedClock
+from simulation import Simulation, office_events
+
+CONFIG = {
+    "audio": {"volume": 0.3},
+    "pomodoro": {
+        "default": {"work_duration": 25, "rest_duration": 1},
+        "morning_routine": {"enabled": False},
+    },
+}
+
+
+def _times(trace, event):
+    return [row["time"][11:] for row in trace if row["event"] == event]
+
+
+def test_office_day_rest_cycle():
+    day = date(2026, 10, 12)  # a Monday
+    sim = Simulation(CONFIG, datetime(2026, 10, 12), office_events(day, 1), locked=True)
+    trace = sim.run(datetime(2026, 10, 13))
+
+    prompts = _times(trace, "prompt")
+    assert "09:25:00" <= prompts[0] <= "09:25:30"  # unlock noticed by the backed-off probe
+    assert not [t for t in prompts if "12:20:00" <= t < "13:00:00" or t >= "18:00:30"]
+    assert _times(trace, "idle") == ["12:20:00"]  # idle threshold reached exactly
+    assert [row["event"] for row in trace[2:6]] == ["prompt", "rest", "work", "prompt"]
+    assert not _times(trace, "timeout") and sim.monitor.completed_rounds == len(prompts)
+
+
+def test_snooze_and_ignore_follow_the_script():
+    sim = Simulation(CONFIG, datetime(2026, 10, 12, 9), responses=("snooze", "ignore", "close"))
+    trace = sim.run(datetime(2026, 10, 12, 10, 30))
+
+    assert [(row["time"][11:], row["event"]) for row in trace[:8]] == [
+        ("09:25:00", "prompt"),
+        ("09:25:05", "snooze"),
+        ("09:30:05", "prompt"),  # snooze = 5 minutes
+        ("09:35:05", "timeout"),  # ignored window force-reset after 300 s
+        ("09:35:05", "work"),
+        ("10:00:05", "prompt"),
+        ("10:00:10", "work"),  # closed without resting: no completed round
+        ("10:25:10", "prompt"),
+    ]
+    assert sim.monitor.completed_rounds == 0
+
+
+def test_suspend_does_not_fire_an_instant_break():
+    start = datetime(2026, 10, 12, 9)
+    sim = Simulation(CONFIG, start, [(datetime(2026, 10, 12, 9, 10), "suspend", 2 * 3600)])
+    trace = sim.run(datetime(2026, 10, 12, 12))
+
+    assert _times(trace, "suspend") == ["11:10:00"]
+    assert _times(trace, "prompt")[0] == "11:25:00"  # the 15 minutes left before suspending
+
+
+def test_simulated_clock_wait_fires_due_callbacks():
+    import threading
+
+    clock = SimulatedClock(datetime(2026, 1, 1))
+    fired = []
+    clock.call_later(5, lambda: fired.append(clock.monotonic()))
+    cond = threading.Condition()
+    with cond:
+        assert clock.wait(cond, 10) is True and fired == [5.0]
+        assert clock.wait(cond, 10) is False and clock.monotonic() == 15.0
+    assert clock.now() == datetime(2026, 1, 1, 0, 0, 15)
+    with pytest.raises(RuntimeError):
+        clock.wait_event(threading.Event())
+
+
+def test_monitor_keeps_running_while_the_reminder_is_open():
+    config = dict(CONFIG, reminder={"timeouts": {"prompt": 60, "break": 600}})
+    sim = Simulation(config, datetime(2026, 10, 12, 9), [(datetime(2026, 10, 12, 9, 25, 30), "lock")],
+                     responses=("ignore",))
+    trace = sim.run(datetime(2026, 10, 12, 9, 40))
+
+    assert [(row["time"][11:], row["event"]) for row in trace[:4]] == [
+        ("09:25:00", "prompt"),
+        ("09:25:30", "lock"),  # probed while PROMPT is open, not after the window closes
+        ("09:26:00", "timeout"),  # configured prompt timeout
+        ("09:26:00", "work"),
+    ]
+
+
+def test_break_timeout_spares_an_active_reflection():
+    sim = Simulation(CONFIG, datetime(2026, 10, 12, 9))
+    sim.reminder.answer = 1800  # half an hour of writing after a 1-minute rest
+    trace = sim.run(datetime(2026, 10, 12, 10))
+    assert not _times(trace, "timeout") and _times(trace, "work") == ["09:56:05"]
+
+    # the user rests, then walks away with the window open: reset 600 s after the countdown
+    away = Simulation(CONFIG, datetime(2026, 10, 12, 9), [(datetime(2026, 10, 12, 9, 25, 5), "away")])
+    away.reminder.answer = 1800
+    trace = away.run(datetime(2026, 10, 12, 10))
+    assert _times(away.trace, "timeout") == ["09:36:05"] and _times(trace, "work") == ["09:36:05"]
+    assert away.monitor.state == "WORK"  # the window's late close (09:56:05) is ignored
@@ -0,0 +1,325 @@
+import json
+import os
+import sys
+from datetime import date
+
+import pytest
+
+# Ensure we can import modules from src
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config_manager import (
+    SCHEMA_VERSION,
+    JournalArchive,
+    JournalLogStore,
+    JsonStorageEngine,
+    JsonStore,
+    ShardedJsonStorageEngine,
+    SqliteStorageEngine,
+    migrate_json_to_sqlite,
+    migrate_health_data,
+    split_into_shards,
+)
+
+
+def _json_engine(tmp_path):
+    return JsonStorageEngine(
+        JsonStore(str(tmp_path / "health_data.json"), dict,
+                  schema_version=SCHEMA_VERSION, migrate=migrate_health_data),
+        JournalLogStore(str(tmp_path / "journal_data.json"), dict, schema_version=SCHEMA_VERSION),
+    )
+
+HEALTH = {
+    "2026-10-15": [{"weight": 71.0, "bp_high": 120.0, "bp_low": 80.0, "heart_rate": 70.0, "time": "08:00:00"}],
+    "2026-10-16": [
+        {"weight": 70.5, "bp_high": 118.0, "bp_low": 79.0, "heart_rate": 68.0, "time": "08:00:00"},
+        {"weight": 70.2, "bp_high": "", "bp_low": None, "heart_rate": 66.0, "time": "21:00:00"},
+    ],
+}
+
+JOURNAL = {
+    "2026-10-15": {
+        "created_at": "09:00:00",
+        "answers": [
+            {"question_id": "s1", "answer": "old anti-vision", "answered_at": "09:00:00"},
+            {"question_id": "m1", "answer": "pain", "answered_at": "10:00:00"},
+        ],
+    },
+    "2026-10-16": {
+        "created_at": "09:30:00",
+        "answers": [
+            {"question_id": "s1", "answer": "new anti-vision", "answered_at": "09:30:00"},
+            {"question_id": "s2", "answer": "vision", "answered_at": "11:00:00"},
+        ],
+    },
+}
+
+
+@pytest.fixture(params=["json", "sharded", "sqlite"])
+def engine(request, tmp_path):
+    if request.param == "json":
+        eng = _json_engine(tmp_path)
+    elif request.param == "sharded":
+        eng = ShardedJsonStorageEngine(str(tmp_path / "health"), str(tmp_path / "journal"))
+    else:
+        eng = SqliteStorageEngine(str(tmp_path / "work_health.db"))
+    yield eng
+    eng.flush()
+    eng.close()
+
+
+def test_roundtrip(engine):
+    """Saved documents load back unchanged."""
+    engine.save_health(HEALTH)
+    engine.save_journal(JOURNAL)
+
+    assert engine.load_health() == HEALTH
+    assert engine.load_journal() == JOURNAL
+
+
+def test_load_returns_private_copy(engine):
+    """Mutating a loaded document does not change stored data."""
+    engine.save_health(HEALTH)
+    data = engine.load_health()
+    data["2026-10-16"].append({"weight": 1.0})
+
+    assert len(engine.view_health()["2026-10-16"]) == 2
+
+
+def test_health_queries(engine):
+    """has_health_on / last_health_record answer without a caller-side scan."""
+    engine.save_health(HEALTH)
+
+    assert engine.has_health_on("2026-10-16")
+    assert not engine.has_health_on("2026-10-17")
+    assert engine.last_health_record("2026-10-17")["time"] == "21:00:00"
+    assert engine.last_health_record("2026-10-15")["weight"] == 71.0
+    assert engine.last_health_record("2026-10-01") is None
+
+
+def test_save_normalises_only_changed_days(engine, monkeypatch):
+    """Stored days are not re-coerced; new or edited days are."""
+    import config_manager
+
+    engine.save_health(HEALTH)
+    coerced = []
+    real = config_manager._coerce_record
+    monkeypatch.setattr(config_manager, "_coerce_record", lambda rec: coerced.append(rec) or real(rec))
+
+    data = engine.load_health()
+    data["2026-10-17"] = [{"weight": "69.5", "time": "08:00:00"}]
+    engine.save_health(data)
+
+    assert coerced == [{"weight": "69.5", "time": "08:00:00"}]
+    assert engine.view_health()["2026-10-17"][0]["weight"] == 69.5
+    assert engine.load_health()["2026-10-16"] == HEALTH["2026-10-16"]
+
+
+def test_save_health_days_touches_only_given_dates(engine):
+    """Per-date saves replace the given days and leave the rest alone."""
+    engine.save_health(HEALTH)
+    engine.save_health_days({
+        "2026-10-16": [{"weight": "70.0", "time": "07:00:00"}],
+        "2026-11-01": [{"weight": 69.0, "time": "08:00:00"}],
+    })
+
+    assert engine.load_health() == {
+        "2026-10-15": HEALTH["2026-10-15"],
+        "2026-10-16": [{"weight": 70.0, "time": "07:00:00"}],
+        "2026-11-01": [{"weight": 69.0, "time": "08:00:00"}],
+    }
+    assert engine.has_health_on("2026-11-01")
+
+
+def test_latest_answers(engine):
+    """The newest answer per question wins; unknown IDs are omitted."""
+    engine.save_journal(JOURNAL)
+
+    assert engine.latest_answers(["s1", "s2", "s3"]) == {
+        "s1": "new anti-vision",
+        "s2": "vision",
+    }
+
+
+def test_incremental_save(engine):
+    """Appending one record and removing a date are both persisted."""
+    engine.save_health(HEALTH)
+    data = engine.load_health()
+    data.setdefault("2026-10-17", []).append({"weight": 69.9, "time": "07:00:00"})
+    del data["2026-10-15"]
+    engine.save_health(data)
+
+    health = engine.load_health()
+    assert "2026-10-15" not in health
+    assert health["2026-10-17"] == [{"weight": 69.9, "time": "07:00:00"}]
+
+
+def test_append(engine):
+    """Targeted appends extend the right day, creating it if needed."""
+    engine.save_health(HEALTH)
+    engine.save_journal(JOURNAL)
+    engine.append_health_record("2026-10-16", {"weight": "70.1", "time": "22:00:00"})
+    engine.append_health_record("2026-11-01", {"weight": 69.0, "time": "07:00:00"})
+    engine.append_journal_answer("2026-10-16", {"question_id": "s3", "answer": "goal"})
+    engine.append_journal_answer("2026-11-01", {"question_id": "s1", "answer": "newest"}, "07:00:00")
+
+    assert engine.load_health()["2026-10-16"][-1] == {"weight": 70.1, "time": "22:00:00"}
+    assert engine.last_health_record("2026-11-30")["weight"] == 69.0
+    assert engine.load_journal()["2026-11-01"]["created_at"] == "07:00:00"
+    assert engine.latest_answers(["s1", "s3"]) == {"s1": "newest", "s3": "goal"}
+
+
+def test_json_health_append_copies_only_the_touched_day(tmp_path, monkeypatch):
+    """The JSON engine appends without a whole-document load; earlier views stay unchanged."""
+    engine = _json_engine(tmp_path)
+    engine.save_health(HEALTH)
+    before = engine.view_health()
+    monkeypatch.setattr(engine, "load_health", lambda: pytest.fail("append must not load the whole document"))
+
+    engine.append_health_record("2026-10-16", {"weight": "70.1", "time": "22:00:00"})
+    assert len(before["2026-10-16"]) == 2
+    assert engine.view_health()["2026-10-16"][-1] == {"weight": 70.1, "time": "22:00:00"}
+    assert engine.view_health()["2026-10-15"] == HEALTH["2026-10-15"]
+    assert engine.flush(timeout=5)
+    assert len(_json_engine(tmp_path).load_health()["2026-10-16"]) == 3
+
+
+def test_migrate_json_to_sqlite(tmp_path):
+    """The one-shot migrator imports both JSON datasets."""
+    health_file = str(tmp_path / "health_data.json")
+    journal_file = str(tmp_path / "journal_data.json")
+    source = _json_engine(tmp_path)
+    source.save_health(HEALTH)
+    source.save_journal(JOURNAL)
+    source.flush()
+
+    target = migrate_json_to_sqlite(str(tmp_path / "work_health.db"), health_file, journal_file)
+    try:
+        assert target.load_health() == HEALTH
+        assert target.load_journal() == JOURNAL
+    finally:
+        target.close()
+
+
+def test_split_into_shards(tmp_path):
+    """The converter writes one shard per month plus a manifest of dates."""
+    health_file = str(tmp_path / "health_data.json")
+    journal_file = str(tmp_path / "journal_data.json")
+    source = _json_engine(tmp_path)
+    source.save_health(dict(HEALTH, **{"2026-09-30": [{"weight": 72.0}]}))
+    source.save_journal(JOURNAL)
+    source.flush()
+
+    target = split_into_shards(
+        str(tmp_path / "health"), str(tmp_path / "journal"), health_file, journal_file
+    )
+
+    assert sorted(os.listdir(tmp_path / "health")) == ["2026-09.json", "2026-10.json", "manifest.json"]
+    assert list(target.view_health()) == ["2026-09-30", "2026-10-15", "2026-10-16"]
+    assert target.load_journal() == JOURNAL
+
+
+def test_sharded_manifest_out_of_sync_after_crash(tmp_path):
+    """The shard is the source of truth when the manifest and a shard disagree."""
+    health_dir = tmp_path / "health"
+    engine = ShardedJsonStorageEngine(str(health_dir), str(tmp_path / "journal"))
+    engine.save_health(HEALTH)
+    engine.flush()
+    manifest = json.loads((health_dir / "manifest.json").read_text(encoding="utf-8"))
+    # Crash 1: the manifest lists a date whose shard write never landed.
+    manifest["months"]["2026-10"].append("2026-10-20")
+    (health_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    reopened = ShardedJsonStorageEngine(str(health_dir), str(tmp_path / "journal"))
+    view = reopened.view_health()
+    assert "2026-10-20" not in view and not reopened.has_health_on("2026-10-20")
+    assert list(view) == sorted(HEALTH) and dict(view) == reopened.load_health()
+
+    # Crash 2: a new date reached its shard but not the manifest.
+    reopened.append_health_record("2026-10-21", {"weight": 69.0})
+    reopened.flush()
+    (health_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    os.utime(health_dir / "manifest.json", ns=(0, 0))
+    again = ShardedJsonStorageEngine(str(health_dir), str(tmp_path / "journal"))
+    assert again.has_health_on("2026-10-21") and "2026-10-20" not in list(again.view_health())
+    assert again.last_health_record("2026-10-31") == {"weight": 69.0}
+
+
+def _answer(qid, at, text="a"):
+    return {"question_id": qid, "answered_at": at, "answer": text}
+
+
+def test_journal_archive_moves_closed_years(tmp_path):
+    """Past years move into compressed archives; reads still see everything."""
+    this_year = date.today().year
+    old, older, new = f"{this_year - 1}-06-01", f"{this_year - 2}-06-01", f"{this_year}-01-02"
+    journal = JournalLogStore(str(tmp_path / "journal_data.json"), dict, schema_version=SCHEMA_VERSION)
+    archive = JournalArchive(journal, compression="lzma")
+    engine = JsonStorageEngine(JsonStore(str(tmp_path / "health_data.json"), dict), journal, archive)
+    data = {
+        older: {"answers": [_answer("s1", "09:00:00", "oldest")], "created_at": "09:00:00"},
+        old: {"answers": [_answer("s2", "09:00:00", "old")], "created_at": "09:00:00"},
+        new: {"answers": [_answer("s1", "09:00:00", "new")], "created_at": "09:00:00"},
+    }
+    journal.save(data)
+
+    assert archive.archive_closed() == [str(this_year - 2), str(this_year - 1)]
+    assert set(journal.load()) == {new}
+    assert archive.years() == [str(this_year - 1), str(this_year - 2)]
+    assert engine.load_journal() == data
+    assert engine.view_journal()[older] == data[older]
+    assert engine.latest_answers(["s1", "s2"]) == {"s1": "new", "s2": "old"}
+
+    # Saving the full document back does not copy archived days into the live file.
+    engine.save_journal(engine.load_journal())
+    assert engine.flush(timeout=5)
+    assert set(journal.load()) == {new}
+
+
+def test_journal_archive_survives_crash_before_prune(tmp_path):
+    """An archive written without the live prune neither loses nor duplicates days."""
+    last_year = f"{date.today().year - 1}-12-31"
+    journal = JournalLogStore(str(tmp_path / "journal_data.json"), dict, write_behind=False)
+    archive = JournalArchive(journal)
+    day = {"answers": [_answer("m1", "21:00:00")], "created_at": "21:00:00"}
+    journal.save({last_year: day})
+    archive._write(last_year[:4], {last_year: day})
+
+    engine = JsonStorageEngine(JsonStore(str(tmp_path / "health_data.json"), dict), journal, archive)
+    assert engine.load_journal() == {last_year: day}
+    archive.archive_closed()
+    assert journal.load() == {}
+    assert engine.load_journal() == {last_year: day}
+
+
+def test_journal_archive_caches_listing_and_daily_check(tmp_path, monkeypatch):
+    """Reads reuse the archive listing; start() scans the live store once a day."""
+    last_year = f"{date.today().year - 1}-12-31"
+    journal = JournalLogStore(str(tmp_path / "journal_data.json"), dict, write_behind=False)
+    archive = JournalArchive(journal)
+    archive._write(last_year[:4], {last_year: {"answers": []}})
+
+    listings = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: listings.append(path) or real_listdir(path))
+    for _ in range(3):
+        assert last_year[:4] in archive.years()
+        archive.live_part({last_year: {"answers": []}})
+    assert len(listings) == 1
+
+    checks = []
+    monkeypatch.setattr(archive, "due", lambda: checks.append(1) or False)
+    for _ in range(3):
+        archive.start()
+    assert checks == [1]
+
+
+def test_journal_fingerprint_with_a_plain_json_store(tmp_path):
+    """The JSON engine's fingerprint works for any journal store, not only JournalLogStore."""
+    engine = JsonStorageEngine(JsonStore(str(tmp_path / "health_data.json"), dict),
+                               JsonStore(str(tmp_path / "journal_data.json"), dict))
+    assert engine.journal_fingerprint() is None
+    engine.save_journal(JOURNAL)
+    assert engine.flush(timeout=5)
+    first = engine.journal_fingerprint()
+    assert first is not None and json.loads(json.dumps(first)) == first
@@ -1,7 +1,7 @@
 import tkinter as tk
 from theme import _C, _F
 from components import _separator, _accent_bar
-from questions import SYNTHESIS_QUESTIONS, get_latest_synthesis_answers, pick_random_quote
+from questions import get_latest_synthesis_answers, get_synthesis_questions, pick_random_quote
 
 class LeftTipPanel:
     """人生游戏面板 (左侧栏)"""
@@ -64,7 +64,7 @@ class LeftTipPanel:
         
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        for q in SYNTHESIS_QUESTIONS:
+        for q in get_synthesis_questions():
             ans = answers.get(q["id"], "尚未填写使命内容...")
             
             q_frame = tk.Frame(scroll_frame, bg=_C.BG_SURFACE, pady=12)
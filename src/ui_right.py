@@ -1,9 +1,19 @@
 import tkinter as tk
-import time
-from datetime import date
+import logging
+import threading
+from datetime import date, datetime
 from theme import _C, _F
-from components import _accent_bar
-from config_manager import load_health_data
+from components import _accent_bar, _post_to_gui, _TrendChart
+from config_manager import get_last_health_record
+
+# 指标键、标签、单位、趋势线颜色
+_METRICS = [
+    ("weight", "体重数据 (kg)", "kg", _C.GREEN),
+    ("bp_high", "收缩压 High (mmHg)", "", _C.AMBER),
+    ("bp_low", "舒张压 Low (mmHg)", "", _C.BLUE),
+    ("heart_rate", "实时心率检测 (BPM)", "", _C.PURPLE),
+]
+_EPOCH = datetime(1970, 1, 1)
 
 class RightHealthPanel:
     """生理指标录入面板 (右侧栏)"""
@@ -29,12 +39,15 @@ class RightHealthPanel:
         ).pack(anchor=tk.W, pady=(0, 28))
 
         self.entries = {}
-        self.entries["weight"] = self._create_row("体重数据 (kg)")
-        self.entries["bp_high"] = self._create_row("收缩压 High (mmHg)")
-        self.entries["bp_low"] = self._create_row("舒张压 Low (mmHg)")
-        self.entries["heart_rate"] = self._create_row("实时心率检测 (BPM)")
+        self.charts = {}
+        for key, label, unit, color in _METRICS:
+            self.entries[key] = self._create_row(label)
+            self.charts[key] = _TrendChart(self.container, width=356, height=48, color=color, unit=unit)
+            self.charts[key].pack(fill=tk.X)
 
         self._load_placeholders()
+        self._show_cached_charts()
+        self._load_trends()
 
         tk.Label(
             self.container,
@@ -48,7 +61,7 @@ class RightHealthPanel:
 
     def _create_row(self, label):
         row = tk.Frame(self.container, bg=_C.BG_SURFACE)
-        row.pack(fill=tk.X, pady=14) # 增加行间距
+        row.pack(fill=tk.X, pady=(14, 6)) # 增加行间距，下方紧贴趋势图
         tk.Label(
             row, text=label, font=_F.BODY_LG, # 提升到 BODY_LG
             fg=_C.FG, bg=_C.BG_SURFACE,
@@ -95,19 +108,8 @@ class RightHealthPanel:
         return ent
 
     def _load_placeholders(self):
-        all_health = load_health_data()
-        today_str = str(date.today())
-        today_data = all_health.get(today_str, [])
-        if isinstance(today_data, dict): today_data = [today_data]
-        last_record = today_records = today_data[-1] if today_data else {}
-
-        if not last_record:
-            for d in reversed(sorted(all_health.keys())):
-                if d < today_str:
-                    d_data = all_health[d]
-                    if isinstance(d_data, dict): d_data = [d_data]
-                    last_record = d_data[-1] if d_data else {}
-                    break
+        # 今天有记录则取今天最后一条，否则取今天之前最近一天的最后一条
+        last_record = get_last_health_record(str(date.today())) or {}
 
         mappings = [
             ("weight", ""),
@@ -134,3 +136,74 @@ class RightHealthPanel:
             else:
                 res[key] = ent.get().strip()
         return res, self._health_dirty
+
+    def _show_cached_charts(self):
+        # 先显示上次渲染的图片，数据读取与重新渲染完成前面板不空白
+        try:
+            from chart_cache import latest_chart
+            for key, chart in self.charts.items():
+                path = latest_chart(key)
+                if path:
+                    chart.show_image(path)
+        except Exception as e:
+            logging.error(f"Failed to show cached charts: {e}")
+
+    def _load_trends(self):
+        # 历史数据可能很多，放到子线程读取，结果经 gui_queue 回到 Tk 线程绘制
+        def worker():
+            try:
+                from health_analytics import load_series
+                series = load_series()
+                secs = series.timestamps.astype("int64").tolist()
+                points = {
+                    key: [(x, y) for x, y in zip(secs, series[key].tolist()) if y == y]  # 跳过 NaN
+                    for key in self.charts
+                }
+            except Exception as e:
+                logging.error(f"Failed to load health trends: {e}", exc_info=True)
+                return
+            _post_to_gui(lambda: self._show_trends(points))
+
+        threading.Thread(target=worker, name="health-trends", daemon=True).start()
+
+    def _show_trends(self, points):
+        if not self.container.winfo_exists():
+            return
+        for key, chart in self.charts.items():
+            chart.set_points(points[key])
+            self._request_render(key, chart)
+
+    def _request_render(self, key, chart):
+        """后台渲染当前数据的 PNG（命中缓存则立即完成），完成后替换折线。"""
+        try:
+            from chart_cache import render_chart_async
+        except ImportError as e:
+            logging.error(f"Chart rendering unavailable: {e}")
+            return
+        if not chart.points:
+            return
+        revision = chart.revision
+        render_chart_async(
+            key, chart.points,
+            # 回调在 chart_cache 的渲染线程执行，经 gui_queue 回到 Tk 线程
+            lambda path: _post_to_gui(lambda: self._show_chart(chart, path, revision)),
+            width=chart.width, height=chart.height, color=chart.color,
+            bg=chart.bg, top=chart.top,
+        )
+
+    def _show_chart(self, chart, path, revision):
+        if self.container.winfo_exists():
+            chart.show_image(path, revision)
+
+    def add_record(self, record, date_str=None):
+        """新记录保存后增量追加到各趋势图。"""
+        stamp = f"{date_str or date.today()} {record.get('time') or '00:00:00'}"
+        try:
+            x = (datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S") - _EPOCH).total_seconds()
+        except ValueError:
+            return
+        for key, chart in self.charts.items():
+            try:
+                chart.append(x, float(record.get(key)))
+            except (TypeError, ValueError):
+                continue  # 该项未填写
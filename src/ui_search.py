@@ -0,0 +1,100 @@
+import tkinter as tk
+import logging
+import threading
+
+from theme import _C, _F
+from components import _make_button, _accent_bar, _separator, _post_to_gui
+from questions import get_question_by_id
+
+
+class SearchWindow:
+    """搜索反思窗口：关键词 + 可选日期范围，按相关度列出历史回答。"""
+
+    def __init__(self, parent=None):
+        self.root = tk.Toplevel(parent)
+        self.root.title("搜索反思")
+        self.root.geometry("900x680")
+        self.root.configure(bg=_C.BG_VOID)
+        self._query_seq = 0
+
+        _accent_bar(self.root, _C.AMBER, height=3)
+
+        bar = tk.Frame(self.root, bg=_C.BG_VOID, padx=24, pady=18)
+        bar.pack(fill=tk.X)
+        self.ent_query = self._entry(bar, width=28)
+        self.ent_query.pack(side=tk.LEFT, ipady=6)
+        tk.Label(bar, text="从", font=_F.SMALL, fg=_C.FG_DIM, bg=_C.BG_VOID).pack(side=tk.LEFT, padx=(16, 4))
+        self.ent_from = self._entry(bar, width=11)
+        self.ent_from.pack(side=tk.LEFT, ipady=6)
+        tk.Label(bar, text="到", font=_F.SMALL, fg=_C.FG_DIM, bg=_C.BG_VOID).pack(side=tk.LEFT, padx=4)
+        self.ent_to = self._entry(bar, width=11)
+        self.ent_to.pack(side=tk.LEFT, ipady=6)
+        _make_button(bar, "🔍 搜索", self._run_search, bg=_C.BLUE, hover_bg=_C.BLUE_LIGHT,
+                     font=_F.BTN_SM, padx=18, pady=6).pack(side=tk.LEFT, padx=(16, 0))
+
+        self.lbl_status = tk.Label(self.root, text="日期格式 YYYY-MM-DD，可留空", font=_F.TINY,
+                                   fg=_C.FG_MUTED, bg=_C.BG_VOID, anchor=tk.W, padx=24)
+        self.lbl_status.pack(fill=tk.X)
+        _separator(self.root, pady=(8, 0))
+
+        body = tk.Frame(self.root, bg=_C.BG_VOID)
+        body.pack(fill=tk.BOTH, expand=True)
+        scrollbar = tk.Scrollbar(body, orient="vertical")
+        self.txt_results = tk.Text(
+            body, font=_F.BODY, bg=_C.BG_BASE, fg=_C.FG, relief="flat", wrap=tk.WORD,
+            padx=24, pady=16, yscrollcommand=scrollbar.set, highlightthickness=0,
+        )
+        scrollbar.config(command=self.txt_results.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.txt_results.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.txt_results.tag_configure("meta", font=_F.TINY, foreground=_C.CYAN)
+        self.txt_results.tag_configure("question", font=_F.SMALL, foreground=_C.FG_DIM)
+        self.txt_results.config(state=tk.DISABLED)
+
+        self.ent_query.bind("<Return>", lambda e: self._run_search())
+        self.root.bind("<Escape>", lambda e: self.root.destroy())
+        self.root.lift()
+        self.ent_query.focus_force()
+
+    def _entry(self, parent, width):
+        return tk.Entry(parent, font=_F.BODY, width=width, bg=_C.BG_OVERLAY, fg=_C.FG,
+                        insertbackground=_C.FG, relief="flat", bd=0)
+
+    def _run_search(self):
+        query = self.ent_query.get().strip()
+        if not query:
+            return
+        date_from = self.ent_from.get().strip() or None
+        date_to = self.ent_to.get().strip() or None
+        self._query_seq += 1
+        seq = self._query_seq
+        self.lbl_status.config(text="搜索中...")
+
+        # 首次搜索可能需要从磁盘加载索引，放到子线程，结果回到 Tk 线程渲染
+        def worker():
+            from journal_search import search_journal
+            try:
+                results = search_journal(query, date_from, date_to)
+            except Exception as e:
+                logging.error(f"Journal search failed: {e}", exc_info=True)
+                results = None
+            _post_to_gui(lambda: self._show_results(seq, results))
+
+        threading.Thread(target=worker, name="journal-search", daemon=True).start()
+
+    def _show_results(self, seq, results):
+        if seq != self._query_seq or not self.root.winfo_exists():
+            return  # 已有更新的查询
+        self.txt_results.config(state=tk.NORMAL)
+        self.txt_results.delete("1.0", tk.END)
+        if results is None:
+            self.lbl_status.config(text="搜索失败，详见日志")
+        else:
+            self.lbl_status.config(text=f"找到 {len(results)} 条结果")
+            for r in results:
+                q = get_question_by_id(r["question_id"])
+                self.txt_results.insert(tk.END, f"{r['date']} {r['answered_at']}  ·  相关度 {r['score']}\n", "meta")
+                if q:
+                    self.txt_results.insert(tk.END, q["zh"] + "\n", "question")
+                self.txt_results.insert(tk.END, r["answer"] + "\n\n")
+        self.txt_results.config(state=tk.DISABLED)
@@ -4,7 +4,8 @@ from window import ReminderWindow
 _active_window = None
 
 def show_reminder_process(message, duration, on_rest, on_snooze, on_close=None,
-                          question=None, on_answer=None, on_reflection_start=None, mode_name="default"):
+                          question=None, on_answer=None, on_reflection_start=None, mode_name="default",
+                          clock=None):
     """实例化并在主线程显示提醒窗口的辅助函数。"""
     global _active_window
     if _active_window:
@@ -12,7 +13,8 @@ def show_reminder_process(message, duration, on_rest, on_snooze, on_close=None,
 
     _active_window = ReminderWindow(
         message, duration, on_rest, on_snooze, on_close,
-        question=question, on_answer=on_answer, on_reflection_start=on_reflection_start, mode_name=mode_name
+        question=question, on_answer=on_answer, on_reflection_start=on_reflection_start, mode_name=mode_name,
+        clock=clock,
     )
     _active_window.show()
 
@@ -40,6 +42,18 @@ def show_manual_record(on_answer=None, on_reflection_start=None):
     _active_window._handle_start_rest()
 
 
+def show_search_window():
+    """托盘「搜索反思」入口：打开搜索窗口（非全屏，可与提醒窗口并存）。"""
+    from ui_search import SearchWindow
+
+    try:
+        import main as _main
+        parent = _main.tk_root
+    except Exception:
+        parent = None
+    SearchWindow(parent)
+
+
 def close_active_window():
     """显式关闭当前活跃的提醒窗口。"""
     global _active_window
@@ -1,18 +1,20 @@
 import tkinter as tk
 from tkinter import messagebox
 import logging
-import time
-from datetime import date
+import math
 
 from theme import _C, _F
+from clock import SYSTEM_CLOCK
 from components import _make_button, _accent_bar, _CircleTimer
-from config_manager import load_health_data, save_health_data
+from config_manager import append_health_record, get_last_answer
+from obsidian_export import schedule_export
 from ui_left import LeftTipPanel
 from ui_right import RightHealthPanel
 
 class ReminderWindow:
     def __init__(self, message, duration_seconds, on_start_rest, on_snooze, on_close,
-                 question=None, on_answer=None, on_reflection_start=None, mode_name="default"):
+                 question=None, on_answer=None, on_reflection_start=None, mode_name="default",
+                 clock=None):
         self.message = message
         self.duration_seconds = duration_seconds
         self.on_start_rest = on_start_rest
@@ -22,9 +24,11 @@ class ReminderWindow:
         self.on_answer = on_answer
         self.on_reflection_start = on_reflection_start
         self.mode_name = mode_name
+        self.clock = clock or SYSTEM_CLOCK
 
         self.root = None
         self.timer_id = None
+        self._countdown_end = None
         self.hide_timer_id = None
         self.is_closed = False
         self._circle_timer = None
@@ -122,6 +126,12 @@ class ReminderWindow:
             
             tk.Label(q_card, text=self.question["zh"], font=_F.H2, fg=_C.FG_DIM, bg=_C.BG_SURFACE, wraplength=700, justify=tk.LEFT, anchor=tk.W).pack(fill=tk.X, pady=(10, 5))
 
+            # 上次回答同一问题的时间与内容摘要（来自最新回答索引，不扫描日记）
+            last = get_last_answer(self.question["id"])
+            if last and last.get("answer"):
+                snippet = last["answer"] if len(last["answer"]) <= 60 else last["answer"][:60] + "…"
+                tk.Label(q_card, text=f"🕘 上次回答 {last['date']} {last['answered_at']}：{snippet}", font=_F.SMALL, fg=_C.FG_MUTED, bg=_C.BG_SURFACE, wraplength=700, justify=tk.LEFT, anchor=tk.W).pack(fill=tk.X, pady=(12, 0))
+
         if self.duration_seconds > 0:
             self._circle_timer = _CircleTimer(self.center_frame, size=200, line_w=5, bg=_C.BG_VOID)
             self._circle_timer.pack(pady=20)
@@ -162,20 +172,17 @@ class ReminderWindow:
             if dirty and data.get("weight"):
                 try:
                     weight = float(data["weight"])
-                    all_health = load_health_data()
-                    today_str = str(date.today())
-                    today_records = all_health.get(today_str, [])
-                    if isinstance(today_records, dict): today_records = [today_records]
-                    
+                    now = self.clock.now()  # 与倒计时同一时钟，模拟/回放时记录时间一致
+                    date_str = now.strftime("%Y-%m-%d")
                     new_record = {
                         "weight": weight, "bp_high": data.get("bp_high"),
                         "bp_low": data.get("bp_low"), "heart_rate": data.get("heart_rate"),
-                        "time": time.strftime("%H:%M:%S")
+                        "time": now.strftime("%H:%M:%S")
                     }
-                    today_records.append(new_record)
-                    all_health[today_str] = today_records
-                    save_health_data(all_health)
-                    logging.info(f"Health data saved. Total: {len(today_records)}")
+                    append_health_record(new_record, date_str)
+                    self.health_panel.add_record(new_record, date_str)
+                    schedule_export(date_str)
+                    logging.info(f"Health data saved at {new_record['time']}.")
                 except ValueError:
                     messagebox.showerror("错误", "请输入有效的数字", parent=self.root)
                     return
@@ -204,13 +211,21 @@ class ReminderWindow:
         self.hide_timer_id = self.root.after(15000, restore)
 
     def _start_countdown(self, remaining):
+        # 以时钟截止时间计算剩余秒数，Tk 定时器延迟不会累积漂移
+        self._countdown_end = self.clock.monotonic() + remaining
+        self._tick_countdown()
+
+    def _tick_countdown(self):
         if self.is_closed: return
+        remaining = self._countdown_end - self.clock.monotonic()
         if remaining <= 0:
             self._show_answer_input()
             return
-        if self._circle_timer: self._circle_timer.update(remaining, self._total_duration)
+        if self._circle_timer: self._circle_timer.update(math.ceil(remaining), self._total_duration)
         self._cancel_timer("timer_id")
-        self.timer_id = self.root.after(1000, lambda: self._start_countdown(remaining - 1))
+        # 对齐到下一个整秒
+        delay_ms = int((remaining - math.floor(remaining) or 1.0) * 1000) + 1
+        self.timer_id = self.root.after(delay_ms, self._tick_countdown)
 
     def _cancel_timer(self, attr_name):
         timer_id = getattr(self, attr_name, None)